@@ -0,0 +1,65 @@
+"""Compress JSON responses for clients that accept it.
+
+Only JSON is handled here: HTML pages carry CSRF tokens next to user
+input, and compressing them opens the door to BREACH-style attacks.
+Brotli is used when the client accepts it and the ``brotli`` package is
+installed, gzip otherwise. Bodies below ``JSON_COMPRESSION_MIN_BYTES``
+are sent as they are, since the headers would cost more than the saving.
+"""
+import re
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is used instead
+    brotli = None
+
+ACCEPTS_BR = re.compile(r'\bbr\b')
+ACCEPTS_GZIP = re.compile(r'\bgzip\b')
+
+
+class JSONCompressionMiddleware(MiddlewareMixin):
+    def process_response(self, request, response):
+        if (
+            response.streaming
+            or response.status_code != 200
+            or response.has_header('Content-Encoding')
+            or not response.get('Content-Type', '').startswith(
+                'application/json'
+            )
+        ):
+            return response
+
+        # Vary even when this response stays uncompressed, so a shared
+        # cache doesn't hand a compressed copy to a client without support.
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if len(response.content) < settings.JSON_COMPRESSION_MIN_BYTES:
+            return response
+
+        accept = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if brotli is not None and ACCEPTS_BR.search(accept):
+            encoding = 'br'
+            compressed = brotli.compress(
+                response.content, mode=brotli.MODE_TEXT, quality=5
+            )
+        elif ACCEPTS_GZIP.search(accept):
+            encoding = 'gzip'
+            compressed = compress_string(response.content)
+        else:
+            return response
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        # The encoded body is a different byte sequence; as in Django's
+        # GZipMiddleware, a strong ETag has to become weak.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
@@ -0,0 +1,144 @@
+"""Conditional GET for per-user JSON endpoints and pages.
+
+``conditional_response(validators)`` wraps a view (sync or async) and
+``ConditionalGetMixin`` does the same for DRF views. ``validators`` is
+called with the view's arguments before the view runs and returns
+``(etag_parts, last_modified)``: a tuple hashed into a weak ETag and an
+optional datetime, or ``None`` when no cheap validator is available. If
+the request's ``If-None-Match``/``If-Modified-Since`` still match, a 304
+is sent without running the view, so nothing is queried or serialized.
+
+Validators come either from ``updated_at`` maxima in the database or
+from a per-user data version kept in the Django cache, which the
+``signals`` modules bump whenever a user's routines, products or profile
+change. The version is only trustworthy when every process shares the
+cache (Redis), so ``user_version()`` returns ``None`` unless
+``HTTP_CACHE_USER_VERSIONS`` is on.
+"""
+import hashlib
+import uuid
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+USER_VERSION_KEY = 'http:version:{}'
+
+
+def user_version(user_id):
+    """Return the user's data version, or ``None`` if versions are off."""
+    if not settings.HTTP_CACHE_USER_VERSIONS:
+        return None
+    key = USER_VERSION_KEY.format(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        # add() so two processes starting at once agree on one version.
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_user_version(user_id):
+    """Invalidate every ETag derived from the user's data version."""
+    if user_id is not None:
+        cache.set(USER_VERSION_KEY.format(user_id), uuid.uuid4().hex, None)
+
+
+def make_etag(parts):
+    digest = hashlib.sha256(repr(tuple(parts)).encode('utf-8')).hexdigest()
+    # Weak: the same data may be sent gzip- or brotli-encoded.
+    return 'W/"{}"'.format(digest[:32])
+
+
+def evaluate(request, validated):
+    """Return ``(not_modified, etag, last_modified)`` for ``request``.
+
+    ``validated`` is what a validators callable returned; ``not_modified``
+    is a 304 response or ``None``.
+    """
+    if request.method not in ('GET', 'HEAD') or validated is None:
+        return None, None, None
+    etag_parts, last_modified = validated
+    etag = make_etag(etag_parts)
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(
+        request, etag=etag, last_modified=timestamp
+    )
+    return response, etag, timestamp
+
+
+def add_headers(response, etag, last_modified):
+    """Set the validators and make clients revalidate before reusing."""
+    if etag is None:
+        return response
+    response.headers.setdefault('ETag', etag)
+    if last_modified:
+        response.headers.setdefault('Last-Modified', http_date(last_modified))
+    response['Cache-Control'] = 'private, no-cache'
+    patch_vary_headers(response, ('Cookie', 'Authorization'))
+    return response
+
+
+def conditional_response(validators):
+    """Answer GET/HEAD with 304 when ``validators`` says nothing changed.
+
+    ``validators(request, *args, **kwargs)`` runs before the view (in a
+    thread for async views, since it may query the database).
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def wrapper(request, *args, **kwargs):
+                validated = None
+                if request.method in ('GET', 'HEAD'):
+                    validated = await sync_to_async(validators)(
+                        request, *args, **kwargs
+                    )
+                not_modified, etag, last_modified = evaluate(
+                    request, validated
+                )
+                response = not_modified or await view(
+                    request, *args, **kwargs
+                )
+                if response.status_code in (200, 304):
+                    add_headers(response, etag, last_modified)
+                return response
+        else:
+            @wraps(view)
+            def wrapper(request, *args, **kwargs):
+                validated = None
+                if request.method in ('GET', 'HEAD'):
+                    validated = validators(request, *args, **kwargs)
+                not_modified, etag, last_modified = evaluate(
+                    request, validated
+                )
+                response = not_modified or view(request, *args, **kwargs)
+                if response.status_code in (200, 304):
+                    add_headers(response, etag, last_modified)
+                return response
+        return wrapper
+    return decorator
+
+
+class ConditionalGetMixin:
+    """Conditional GET for DRF views; override ``get_validators()``.
+
+    Runs after authentication and permission checks, so validators can
+    rely on ``request.user``.
+    """
+
+    def get_validators(self, request, *args, **kwargs):
+        return None
+
+    def get(self, request, *args, **kwargs):
+        not_modified, etag, last_modified = evaluate(
+            request, self.get_validators(request, *args, **kwargs)
+        )
+        response = not_modified or super().get(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            add_headers(response, etag, last_modified)
+        return response
@@ -0,0 +1,36 @@
+"""Import views on first use instead of at URLconf load.
+
+Loading the URLconf (first request, system checks in ``migrate`` and
+other commands) imports every view module it references. ``lazy_view``
+defers that for views with heavy dependencies, such as the Django REST
+framework API.
+"""
+from django.utils.module_loading import import_string
+
+
+def lazy_view(dotted_path, csrf_exempt=False, **initkwargs):
+    """Return a view that imports ``dotted_path`` when first called.
+
+    ``dotted_path`` names a view function or a class-based view (which
+    is turned into a view with ``as_view(**initkwargs)``). CSRF exemption
+    is checked on the URL's view before it runs, so views that are exempt
+    (DRF's ``APIView`` is; it enforces CSRF itself for session auth) need
+    ``csrf_exempt=True``.
+    """
+    view = None
+
+    def wrapper(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            target = import_string(dotted_path)
+            view = (
+                target.as_view(**initkwargs) if isinstance(target, type)
+                else target
+            )
+        return view(request, *args, **kwargs)
+
+    wrapper.csrf_exempt = csrf_exempt
+    wrapper.__name__ = dotted_path.rsplit('.', 1)[-1]
+    wrapper.__qualname__ = wrapper.__name__
+    wrapper.__module__ = dotted_path.rsplit('.', 1)[0]
+    return wrapper
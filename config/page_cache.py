@@ -0,0 +1,54 @@
+"""Whole-page caching for pages that look the same to every visitor.
+
+``cache_anonymous_page`` stores the rendered response for anonymous GET
+requests and serves it from the cache afterwards, skipping the view and
+template rendering. Signed-in users, requests with a query string and
+requests with pending flash messages (e.g. "You have been logged out")
+always get a freshly rendered page.
+"""
+from functools import wraps
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.http import HttpResponse
+
+PAGE_KEY = 'page:{}:{}'
+
+
+def _cacheable(request):
+    return (
+        request.method in ('GET', 'HEAD')
+        and not request.GET
+        and not request.user.is_authenticated
+        and not len(messages.get_messages(request))
+    )
+
+
+def cache_anonymous_page(name, timeout=None):
+    """Cache a view's output for anonymous visitors under ``name``.
+
+    ``timeout`` defaults to ``settings.PAGE_CACHE_TIMEOUT``.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not _cacheable(request):
+                return view(request, *args, **kwargs)
+
+            key = PAGE_KEY.format(name, settings.USE_LOCAL_VENDOR)
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type = cached
+                return HttpResponse(content, content_type=content_type)
+
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming:
+                cache.set(
+                    key,
+                    (response.content, response['Content-Type']),
+                    settings.PAGE_CACHE_TIMEOUT if timeout is None else timeout,
+                )
+            return response
+        return wrapper
+    return decorator
@@ -11,23 +11,21 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
+import importlib.util
 import os
 import sys
 from django.contrib.messages import constants as messages
-import dj_database_url
-
-if os.path.isfile('env.py'):
-    # Local env.py support (development only). Keep this file out of VCS.
-    import env
-
-# Import env.py if it exists in parent dir (older projects)
-if os.path.exists(os.path.join(os.path.dirname(__file__), '..', 'env.py')):
-    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-    import env
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Local env.py support (development only). Keep this file out of VCS.
+if (BASE_DIR / 'env.py').is_file():
+    if str(BASE_DIR) not in sys.path:
+        sys.path.append(str(BASE_DIR))
+    import env  # noqa: F401
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
@@ -68,14 +66,22 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
-    'cloudinary',
-    'cloudinary_storage',
     'rest_framework',
+    'rest_framework.authtoken',
     'users',
     'routines',
     'products',
+    'jobs',
 ]
 
+# Cloudinary media storage is only loaded when it's configured; importing
+# it costs every process start (web boots, workers, release migrate).
+USE_CLOUDINARY = bool(
+    os.environ.get('CLOUDINARY_URL') or os.environ.get('CLOUDINARY_CLOUD_NAME')
+)
+if USE_CLOUDINARY:
+    INSTALLED_APPS[6:6] = ['cloudinary', 'cloudinary_storage']
+
 SITE_ID = 1
 LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/'
@@ -86,6 +92,7 @@ CRISPY_TEMPLATE_PACK = "bootstrap5"
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'config.compression.JSONCompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -132,6 +139,8 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # }
 # Use DATABASE_URL if provided; otherwise default to local SQLite for development
 if os.environ.get("DATABASE_URL"):
+    import dj_database_url
+
     DATABASES = {
         'default': dj_database_url.config()
     }
@@ -150,6 +159,49 @@ if 'test' in sys.argv:
         'NAME': str(BASE_DIR / 'test_db.sqlite3'),
     }
 
+# dj-database-url 0.5 names the postgresql_psycopg2 backend, which Django
+# no longer ships under that name
+if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql_psycopg2':
+    DATABASES['default']['ENGINE'] = 'django.db.backends.postgresql'
+
+# Connection management. By default each process keeps its connection open
+# for DB_CONN_MAX_AGE seconds (0 closes it after every request) and checks
+# it still works before reusing it, instead of reconnecting (TCP + TLS +
+# auth) on every request.
+DATABASES['default']['CONN_MAX_AGE'] = int(
+    os.environ.get('DB_CONN_MAX_AGE', 600)
+)
+DATABASES['default']['CONN_HEALTH_CHECKS'] = str_to_bool(
+    os.environ.get('DB_CONN_HEALTH_CHECKS', 'true')
+)
+# Web server interface (see gunicorn.conf.py): 'wsgi' or 'asgi'
+SERVER_MODE = os.environ.get('SERVER_MODE', 'wsgi').lower()
+if SERVER_MODE == 'asgi':
+    # Async views run their queries on changing threads, so persistent
+    # connections wouldn't be reused (Django recommends a pool instead).
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    # PgBouncer in transaction mode can't keep server-side cursors (used by
+    # QuerySet.iterator()) open across transactions.
+    if str_to_bool(os.environ.get('DB_PGBOUNCER')):
+        DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+    # Native psycopg 3 connection pool. Connections go back to the pool
+    # after each request, so it replaces persistent connections.
+    if str_to_bool(os.environ.get('DB_POOL')):
+        # Checked here rather than on the first query, which would fail
+        # every request (an old psycopg2-only install can't pool).
+        if importlib.util.find_spec('psycopg_pool') is None:
+            raise ImproperlyConfigured(
+                'DB_POOL needs psycopg 3 with its pool: '
+                'pip install "psycopg[binary,pool]"'
+            )
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 4)),
+            'timeout': int(os.environ.get('DB_POOL_TIMEOUT', 10)),
+        }
+
 # CSRF trusted origins
 # Prefer environment override; fall back to sane defaults for local + Heroku
 raw_csrf_trusted = os.environ.get('CSRF_TRUSTED_ORIGINS')
@@ -211,6 +263,14 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
+# Per-page JS/CSS bundles built by `manage.py build_assets` (see
+# products/asset_bundles.py). Set USE_ASSET_BUNDLES=0 while editing the
+# sources under static/js/src to load them unbuilt.
+USE_ASSET_BUNDLES = str_to_bool(os.environ.get('USE_ASSET_BUNDLES', 'true'))
+# Bundles carry a content hash in their name, so browsers may cache them
+# for good; WhiteNoise serves their .br/.gz copies to clients that accept them.
+WHITENOISE_IMMUTABLE_FILE_TEST = r'/dist/.+\.[0-9a-f]{12}\.(?:js|css)$'
+
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
@@ -232,10 +292,99 @@ CLOUDINARY_STORAGE = {
     }
 }
 
-DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
+if USE_CLOUDINARY:
+    DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
 
 # Note: WhiteNoise and advanced static optimizations are disabled for simplicity in dev
 
+# Cache shared by every process when REDIS_URL is set (Heroku Data for
+# Redis); otherwise each process keeps its own in-memory cache. Keys are
+# prefixed with the release so cached pages never point at old static files.
+REDIS_URL = os.environ.get('REDIS_URL')
+CACHE_KEY_PREFIX = os.environ.get(
+    'CACHE_KEY_PREFIX', os.environ.get('HEROKU_RELEASE_VERSION', 'skyn')
+)
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': CACHE_KEY_PREFIX,
+            # Heroku Redis uses self-signed certificates
+            'OPTIONS': (
+                {'ssl_cert_reqs': None} if REDIS_URL.startswith('rediss://')
+                else {}
+            ),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'skyn',
+            'KEY_PREFIX': CACHE_KEY_PREFIX,
+        }
+    }
+
+# Conditional GET: JSON endpoints and the dashboard send ETags and answer
+# 304 when nothing changed. Product endpoints validate against updated_at
+# in the database; routine data and the dashboard use a per-user version
+# kept in the cache, which is only reliable when every process shares it,
+# so that is on by default only with Redis (config/http_cache.py).
+HTTP_CACHE_USER_VERSIONS = str_to_bool(
+    os.environ.get('HTTP_CACHE_USER_VERSIONS', bool(REDIS_URL))
+)
+# JSON responses at least this long are gzip/brotli-compressed
+JSON_COMPRESSION_MIN_BYTES = int(
+    os.environ.get('JSON_COMPRESSION_MIN_BYTES', 1024)
+)
+
+# Where sessions live. 'cached_db' (default) reads them from the cache and
+# only falls back to the django_session table on a miss; 'signed_cookies'
+# keeps them in the browser and never touches the database; 'db' is
+# Django's default table-per-request behaviour. Sessions are only saved
+# when they change (SESSION_SAVE_EVERY_REQUEST stays off), and flash
+# messages use cookie storage first, so most requests write nothing.
+SESSION_BACKEND = os.environ.get('SESSION_BACKEND', 'cached_db').lower()
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+if SESSION_BACKEND not in SESSION_ENGINES:
+    raise RuntimeError(
+        'SESSION_BACKEND must be one of: ' + ', '.join(SESSION_ENGINES)
+    )
+SESSION_ENGINE = SESSION_ENGINES[SESSION_BACKEND]
+SESSION_SAVE_EVERY_REQUEST = False
+
+# Seconds to cache shared template fragments (navigation, footer, asset
+# tags) and whole pages served to anonymous visitors (home)
+FRAGMENT_CACHE_TIMEOUT = int(os.environ.get('FRAGMENT_CACHE_TIMEOUT', 3600))
+PAGE_CACHE_TIMEOUT = int(os.environ.get('PAGE_CACHE_TIMEOUT', 600))
+
+# Serve Bootstrap/Font Awesome from static/ instead of the CDNs. Read once
+# here rather than on every render.
+USE_LOCAL_VENDOR = str_to_bool(os.environ.get('USE_LOCAL_VENDOR'))
+
+# Public browse-by-category API: seconds to cache each category's list
+BROWSE_CATALOG_TIMEOUT = int(os.environ.get('BROWSE_CATALOG_TIMEOUT', 600))
+
+# Open Beauty Facts search endpoint (point at a stub server for testing)
+OPENBEAUTYFACTS_SEARCH_URL = os.environ.get(
+    'OPENBEAUTYFACTS_SEARCH_URL',
+    'https://world.openbeautyfacts.org/cgi/search.pl',
+)
+# On-disk cache of Open Beauty Facts responses and how long (seconds) an
+# entry is used before it's revalidated with the server
+OPENBEAUTYFACTS_CACHE_PATH = os.environ.get(
+    'OPENBEAUTYFACTS_CACHE_PATH',
+    str(BASE_DIR / '.cache' / 'openbeautyfacts.sqlite3'),
+)
+OPENBEAUTYFACTS_CACHE_TTL = int(
+    os.environ.get('OPENBEAUTYFACTS_CACHE_TTL', 24 * 60 * 60)
+)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -261,6 +410,11 @@ LOGGING = {
             'handlers': ['console'],
             'level': 'INFO',
         },
+        # Open Beauty Facts import progress and timings
+        'products': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
     },
 }
 
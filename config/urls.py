@@ -14,4 +14,5 @@ urlpatterns = [
     path('routines/', include('routines.urls')),               # Routine functionality
     path('products/', include('products.urls')),               # Product management
     path('api/products/', include('products.api_urls')),       # API endpoints (separate module)
+    path('api/jobs/', include('jobs.urls')),                   # Background job status
 ]
\ No newline at end of file
@@ -0,0 +1,16 @@
+"""Gunicorn settings, read automatically when `gunicorn` starts here.
+
+SERVER_MODE=asgi serves Django's ASGI application from uvicorn workers, so
+the async JSON views run on the event loop; the default (wsgi) uses
+gunicorn's sync workers. The worker count comes from WEB_CONCURRENCY and
+the port from PORT, both set by Heroku.
+"""
+import os
+
+SERVER_MODE = os.environ.get('SERVER_MODE', 'wsgi').lower()
+
+if SERVER_MODE == 'asgi':
+    wsgi_app = 'config.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+else:
+    wsgi_app = 'config.wsgi:application'
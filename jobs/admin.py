@@ -0,0 +1,11 @@
+from django.contrib import admin
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'kind', 'user', 'status', 'progress', 'attempts', 'created_at', 'finished_at']
+    list_filter = ['kind', 'status', 'created_at']
+    search_fields = ['kind', 'user__username', 'worker']
+    raw_id_fields = ['user']
+    readonly_fields = ['created_at', 'started_at', 'heartbeat_at', 'finished_at', 'worker']
@@ -0,0 +1,129 @@
+import os
+import signal
+import socket
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.queue import claim_job, requeue_stale, run_job
+from jobs.registry import registered_kinds
+
+HEARTBEAT_INTERVAL = 30  # seconds
+# How often a running worker looks for jobs orphaned by a dead worker.
+REQUEUE_INTERVAL = 60  # seconds
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs (imports, maintenance) until stopped'
+    # The release phase has already run the checks; skipping them here
+    # means a worker boot doesn't import the URLconf and every view.
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=int(os.environ.get('WORKER_CONCURRENCY', 2)),
+            help='Jobs run at the same time, one thread each (default: 2)'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds to wait when the queue is empty (default: 2)'
+        )
+        parser.add_argument(
+            '--burst',
+            action='store_true',
+            help='Exit once the queue is empty instead of waiting for more jobs'
+        )
+
+    def handle(self, *args, **options):
+        self.worker = f'{socket.gethostname()}:{os.getpid()}'
+        self.poll_interval = options['poll_interval']
+        self.burst = options['burst']
+        self.stop = threading.Event()
+        self.running = set()
+        self.lock = threading.Lock()
+
+        # Heroku sends SIGTERM on restarts; finish the current jobs.
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, self.request_stop)
+
+        self.requeue_stale()
+        self.stdout.write(
+            f"Worker {self.worker} running {', '.join(registered_kinds())} "
+            f"jobs with concurrency {options['concurrency']}"
+        )
+
+        threads = [
+            threading.Thread(target=self.work, name=f'job-worker-{i}')
+            for i in range(max(1, options['concurrency']))
+        ]
+        for thread in threads:
+            thread.start()
+
+        # Keep heartbeats fresh so other workers don't requeue our jobs,
+        # and pick up jobs left behind by workers that died.
+        last_beat = last_requeue = time.monotonic()
+        while any(thread.is_alive() for thread in threads):
+            time.sleep(0.5)
+            now = time.monotonic()
+            if now - last_beat >= HEARTBEAT_INTERVAL:
+                last_beat = now
+                self.heartbeat()
+            if now - last_requeue >= REQUEUE_INTERVAL:
+                last_requeue = now
+                self.requeue_stale()
+        connection.close()
+        self.stdout.write('Worker stopped')
+
+    def heartbeat(self):
+        with self.lock:
+            running = list(self.running)
+        if running:
+            # Only jobs still ours: one requeued meanwhile has a new owner.
+            Job.objects.filter(pk__in=running, worker=self.worker).update(
+                heartbeat_at=timezone.now()
+            )
+
+    def requeue_stale(self):
+        close_old_connections()
+        requeued, failed = requeue_stale()
+        if requeued:
+            self.stdout.write(f'Requeued {requeued} stale jobs')
+        if failed:
+            self.stdout.write(
+                f'Failed {failed} stale jobs that ran out of attempts'
+            )
+
+    def request_stop(self, signum, frame):
+        self.stdout.write('Stopping after the current jobs...')
+        self.stop.set()
+
+    def work(self):
+        try:
+            while not self.stop.is_set():
+                close_old_connections()
+                job = claim_job(self.worker)
+                if job is None:
+                    if self.burst:
+                        return
+                    self.stop.wait(self.poll_interval)
+                    continue
+
+                with self.lock:
+                    self.running.add(job.pk)
+                self.stdout.write(f'Running {job}')
+                try:
+                    job = run_job(job)
+                finally:
+                    with self.lock:
+                        self.running.discard(job.pk)
+                self.stdout.write(f'Finished {job}')
+        finally:
+            connection.close()
@@ -0,0 +1,92 @@
+from django.contrib.auth.models import User
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """A unit of background work, run by ``manage.py run_worker``.
+
+    ``kind`` names a handler registered with ``jobs.registry.register``;
+    ``payload`` holds its arguments and ``result`` what it returned.
+    Handlers report progress (0-100) with ``set_progress()``.
+    """
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (SUCCEEDED, 'Succeeded'),
+        (FAILED, 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=50)
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='jobs',
+        blank=True,
+        null=True,
+    )
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=QUEUED
+    )
+    payload = models.JSONField(default=dict, blank=True)
+    progress = models.PositiveSmallIntegerField(default=0)
+    progress_message = models.CharField(max_length=200, blank=True)
+    result = models.JSONField(blank=True, null=True)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    worker = models.CharField(max_length=100, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    heartbeat_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # The worker's claim query
+            models.Index(fields=['status', 'run_after']),
+            models.Index(fields=['user', 'kind', 'status']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.SUCCEEDED, self.FAILED)
+
+    def set_progress(self, progress, message=''):
+        """Record progress from inside a running handler."""
+        self.progress = max(0, min(int(progress), 100))
+        self.progress_message = message[:200]
+        self.heartbeat_at = timezone.now()
+        Job.objects.filter(pk=self.pk).update(
+            progress=self.progress,
+            progress_message=self.progress_message,
+            heartbeat_at=self.heartbeat_at,
+        )
+
+    def as_dict(self):
+        return {
+            'id': self.pk,
+            'kind': self.kind,
+            'status': self.status,
+            'progress': self.progress,
+            'progress_message': self.progress_message,
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at.isoformat(),
+            'started_at': (
+                self.started_at.isoformat() if self.started_at else None
+            ),
+            'finished_at': (
+                self.finished_at.isoformat() if self.finished_at else None
+            ),
+        }
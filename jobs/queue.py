@@ -0,0 +1,134 @@
+"""Enqueueing, claiming and running jobs.
+
+There is no broker: the ``Job`` table is the queue. On Postgres a worker
+claims the oldest due job with ``SELECT ... FOR UPDATE SKIP LOCKED``, so
+concurrent workers never block on or double-claim the same row. Databases
+without ``SKIP LOCKED`` (SQLite) use a conditional ``UPDATE ... WHERE
+status = 'queued'``; whichever worker's update hits the row wins.
+"""
+import logging
+import traceback
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+from .registry import get_handler
+
+logger = logging.getLogger(__name__)
+
+RETRY_DELAY = timedelta(seconds=30)
+STALE_AFTER = timedelta(minutes=15)
+CLAIM_ATTEMPTS = 5
+
+
+def enqueue(kind, payload=None, user=None, **kwargs):
+    """Queue a job and return it."""
+    if get_handler(kind) is None:
+        raise ValueError(f'No job handler registered for "{kind}"')
+    return Job.objects.create(
+        kind=kind, payload=payload or {}, user=user, **kwargs
+    )
+
+
+def _due_jobs(now):
+    return Job.objects.filter(
+        status=Job.QUEUED, run_after__lte=now
+    ).order_by('run_after', 'pk')
+
+
+def claim_job(worker):
+    """Mark the oldest due job as running for ``worker`` and return it.
+
+    Returns ``None`` when there's nothing to do.
+    """
+    now = timezone.now()
+    claimed = {
+        'status': Job.RUNNING,
+        'worker': worker,
+        'started_at': now,
+        'heartbeat_at': now,
+    }
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            job = _due_jobs(now).select_for_update(skip_locked=True).first()
+            if job is None:
+                return None
+            Job.objects.filter(pk=job.pk).update(**claimed)
+    else:
+        for _ in range(CLAIM_ATTEMPTS):
+            pk = _due_jobs(now).values_list('pk', flat=True).first()
+            if pk is None:
+                return None
+            if Job.objects.filter(pk=pk, status=Job.QUEUED).update(**claimed):
+                break
+        else:
+            return None
+        job = Job(pk=pk)
+
+    job.refresh_from_db()
+    return job
+
+
+def run_job(job):
+    """Run a claimed job's handler and record the outcome.
+
+    Failed jobs are retried after ``RETRY_DELAY`` until ``max_attempts``.
+    """
+    handler = get_handler(job.kind)
+    job.attempts += 1
+    try:
+        if handler is None:
+            raise LookupError(f'No job handler registered for "{job.kind}"')
+        result = handler(job)
+    except Exception:
+        logger.exception('Job %s failed', job)
+        job.error = traceback.format_exc()[-5000:]
+        if job.attempts < job.max_attempts and handler is not None:
+            job.status = Job.QUEUED
+            job.run_after = timezone.now() + RETRY_DELAY * job.attempts
+        else:
+            job.status = Job.FAILED
+            job.finished_at = timezone.now()
+    else:
+        job.status = Job.SUCCEEDED
+        job.result = result
+        job.progress = 100
+        job.error = ''
+        job.finished_at = timezone.now()
+    job.save(update_fields=[
+        'status', 'result', 'progress', 'error', 'attempts', 'run_after',
+        'finished_at',
+    ])
+    return job
+
+
+def requeue_stale(stale_after=STALE_AFTER):
+    """Requeue running jobs whose worker stopped sending heartbeats.
+
+    The lost run counts as an attempt, so a job that keeps killing its
+    worker (out of memory, say) is marked failed once it reaches
+    ``max_attempts`` instead of being requeued forever. Returns
+    ``(requeued, failed)`` counts.
+    """
+    now = timezone.now()
+    stale = Job.objects.filter(
+        status=Job.RUNNING, heartbeat_at__lt=now - stale_after
+    )
+    failed = stale.filter(attempts__gte=F('max_attempts') - 1).update(
+        status=Job.FAILED,
+        attempts=F('attempts') + 1,
+        worker='',
+        error='The worker running this job stopped responding.',
+        finished_at=now,
+    )
+    requeued = stale.update(
+        status=Job.QUEUED,
+        attempts=F('attempts') + 1,
+        worker='',
+        run_after=now,
+    )
+    return requeued, failed
@@ -0,0 +1,28 @@
+"""Job handlers by kind.
+
+Apps register handlers in their ``tasks.py`` (loaded by
+``JobsConfig.ready``)::
+
+    @register('obf_import')
+    def import_obf(job):
+        ...
+        return {'created': 3}
+
+A handler receives the ``Job`` and returns a JSON-serialisable result.
+"""
+_handlers = {}
+
+
+def register(kind):
+    def decorator(func):
+        _handlers[kind] = func
+        return func
+    return decorator
+
+
+def get_handler(kind):
+    return _handlers.get(kind)
+
+
+def registered_kinds():
+    return sorted(_handlers)
@@ -0,0 +1,201 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from jobs import registry
+from jobs.management.commands import run_worker
+from jobs.models import Job
+from jobs.queue import (
+    RETRY_DELAY,
+    STALE_AFTER,
+    claim_job,
+    enqueue,
+    requeue_stale,
+    run_job,
+)
+
+
+def succeed(job):
+    return {'ok': job.payload['n']}
+
+
+def fail(job):
+    raise RuntimeError('boom')
+
+
+class ClaimAndRunTests(TestCase):
+    def setUp(self):
+        handlers = mock.patch.dict(
+            registry._handlers, {'succeed': succeed, 'fail': fail}
+        )
+        handlers.start()
+        self.addCleanup(handlers.stop)
+
+    def test_enqueue_rejects_unknown_kind(self):
+        with self.assertRaises(ValueError):
+            enqueue('missing')
+        self.assertFalse(Job.objects.exists())
+
+    def test_claims_oldest_due_job_once(self):
+        now = timezone.now()
+        later = enqueue('succeed', {'n': 1}, run_after=now + timedelta(1))
+        second = enqueue('succeed', {'n': 2}, run_after=now - timedelta(1))
+        first = enqueue('succeed', {'n': 3}, run_after=now - timedelta(2))
+
+        claimed = [claim_job('host:1') for _ in range(3)]
+
+        self.assertEqual(
+            [job and job.pk for job in claimed], [first.pk, second.pk, None]
+        )
+        self.assertEqual(claimed[0].status, Job.RUNNING)
+        self.assertEqual(claimed[0].worker, 'host:1')
+        later.refresh_from_db()
+        self.assertEqual(later.status, Job.QUEUED)
+
+    def test_successful_job_records_result(self):
+        enqueue('succeed', {'n': 7})
+
+        job = run_job(claim_job('host:1'))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.SUCCEEDED)
+        self.assertEqual(job.result, {'ok': 7})
+        self.assertEqual(job.progress, 100)
+        self.assertEqual(job.attempts, 1)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_failed_job_is_retried_until_max_attempts(self):
+        job = enqueue('fail')
+
+        with self.assertLogs('jobs.queue', 'ERROR'):
+            for attempt in range(1, job.max_attempts + 1):
+                before = timezone.now()
+                run_job(claim_job('host:1'))
+                job.refresh_from_db()
+                self.assertEqual(job.attempts, attempt)
+                self.assertIn('RuntimeError: boom', job.error)
+                if attempt < job.max_attempts:
+                    self.assertEqual(job.status, Job.QUEUED)
+                    self.assertGreaterEqual(
+                        job.run_after, before + RETRY_DELAY * attempt
+                    )
+                    # Not due again until the retry delay has passed.
+                    self.assertIsNone(claim_job('host:1'))
+                    Job.objects.filter(pk=job.pk).update(
+                        run_after=timezone.now()
+                    )
+
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_job_without_handler_fails_without_retry(self):
+        job = Job.objects.create(kind='unregistered')
+
+        with self.assertLogs('jobs.queue', 'ERROR'):
+            run_job(claim_job('host:1'))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.attempts, 1)
+
+
+class RequeueStaleTests(TestCase):
+    def running_job(self, attempts=0, heartbeat_age=STALE_AFTER * 2):
+        now = timezone.now()
+        return Job.objects.create(
+            kind='test',
+            status=Job.RUNNING,
+            worker='dead-host:1',
+            attempts=attempts,
+            started_at=now - heartbeat_age,
+            heartbeat_at=now - heartbeat_age,
+        )
+
+    def test_stale_job_is_requeued_and_counts_an_attempt(self):
+        job = self.running_job(attempts=1)
+
+        self.assertEqual(requeue_stale(), (1, 0))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertEqual(job.attempts, 2)
+        self.assertEqual(job.worker, '')
+        self.assertLessEqual(job.run_after, timezone.now())
+
+    def test_stale_job_out_of_attempts_is_failed(self):
+        job = self.running_job(attempts=2)  # max_attempts is 3
+
+        self.assertEqual(requeue_stale(), (0, 1))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.attempts, 3)
+        self.assertIsNotNone(job.finished_at)
+        self.assertIn('stopped responding', job.error)
+
+    def test_job_with_recent_heartbeat_is_left_alone(self):
+        job = self.running_job(heartbeat_age=timedelta(seconds=30))
+
+        self.assertEqual(requeue_stale(), (0, 0))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.RUNNING)
+        self.assertEqual(job.attempts, 0)
+
+    def test_repeatedly_orphaned_job_stops_being_requeued(self):
+        job = self.running_job()
+        for _ in range(job.max_attempts):
+            requeue_stale()
+            Job.objects.filter(pk=job.pk, status=Job.QUEUED).update(
+                status=Job.RUNNING,
+                heartbeat_at=timezone.now() - STALE_AFTER * 2,
+            )
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.attempts, job.max_attempts)
+
+
+class WorkerMaintenanceTests(TestCase):
+    def test_requeues_stale_jobs_while_running(self):
+        command = run_worker.Command(stdout=StringIO())
+        clock = iter([0, 10, run_worker.REQUEUE_INTERVAL + 1])
+        with mock.patch.object(
+            run_worker, 'requeue_stale', return_value=(0, 0)
+        ) as requeue, mock.patch.object(
+            run_worker.time, 'monotonic', side_effect=lambda: next(clock)
+        ), mock.patch.object(run_worker.time, 'sleep'), mock.patch.object(
+            run_worker.threading, 'Thread'
+        ) as thread, mock.patch.object(
+            run_worker.signal, 'signal'
+        ), mock.patch.object(run_worker, 'connection'):
+            # The job threads are alive for two turns of the main loop.
+            thread.return_value.is_alive.side_effect = [True, True, False]
+            command.handle(concurrency=1, poll_interval=0, burst=True)
+
+        # Once at startup, once when the interval had passed.
+        self.assertEqual(requeue.call_count, 2)
+
+    def test_heartbeat_skips_jobs_requeued_to_another_worker(self):
+        command = run_worker.Command(stdout=StringIO())
+        command.worker = 'host:1'
+        command.lock = mock.MagicMock()
+        old = timezone.now() - timedelta(minutes=5)
+        mine, taken = [
+            Job.objects.create(
+                kind='test', status=Job.RUNNING, worker=worker,
+                heartbeat_at=old,
+            )
+            for worker in ('host:1', 'host:2')
+        ]
+        command.running = {mine.pk, taken.pk}
+
+        command.heartbeat()
+
+        mine.refresh_from_db()
+        taken.refresh_from_db()
+        self.assertGreater(mine.heartbeat_at, old)
+        self.assertEqual(taken.heartbeat_at, old)
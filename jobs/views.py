@@ -0,0 +1,21 @@
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+
+from .models import Job
+
+
+@login_required
+def job_status(request, pk):
+    """AJAX endpoint: poll a background job's status and progress."""
+    job = get_object_or_404(Job, pk=pk, user=request.user)
+    return JsonResponse({'success': True, 'job': job.as_dict()})
+
+
+@login_required
+def job_list(request):
+    """AJAX endpoint: the user's most recent background jobs."""
+    jobs = Job.objects.filter(user=request.user)[:20]
+    return JsonResponse(
+        {'success': True, 'jobs': [job.as_dict() for job in jobs]}
+    )
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Product
+from .models import CatalogProduct, ExpiryAlert, Product
 
 
 @admin.register(Product)
@@ -8,6 +8,7 @@ class ProductAdmin(admin.ModelAdmin):
     list_filter = ['product_type', 'brand', 'created_at']
     search_fields = ['name', 'brand', 'notes']
     readonly_fields = ['created_at', 'updated_at']
+    raw_id_fields = ['catalog_product']
 
     fieldsets = (
         ('Product Information', {
@@ -23,6 +24,7 @@ class ProductAdmin(admin.ModelAdmin):
                 'is_favorite',
                 'skin_type',
                 'external_id',
+                'catalog_product',
             ),
         }),
         ('Metadata', {
@@ -36,3 +38,19 @@ class ProductAdmin(admin.ModelAdmin):
         if request.user.is_superuser:
             return qs
         return qs.filter(user=request.user)
+
+
+@admin.register(CatalogProduct)
+class CatalogProductAdmin(admin.ModelAdmin):
+    list_display = ['name', 'brand', 'product_type', 'external_id', 'updated_at']
+    list_filter = ['product_type']
+    search_fields = ['name', 'brand', 'external_id', 'normalized_key']
+    readonly_fields = ['normalized_key', 'created_at', 'updated_at']
+
+
+@admin.register(ExpiryAlert)
+class ExpiryAlertAdmin(admin.ModelAdmin):
+    list_display = ['product', 'user', 'days_before', 'expiry_date', 'created_at', 'read_at']
+    list_filter = ['days_before', 'created_at']
+    search_fields = ['product__name', 'product__brand', 'user__username']
+    raw_id_fields = ['product', 'user']
@@ -6,6 +6,8 @@ namespace warning). Add API-specific view routes here (or wire a DRF
 router) instead of reusing the app's HTML view urlpatterns.
 """
 from django.urls import path
+
+from config.lazy import lazy_view
 from . import views
 
 # API endpoints for products
@@ -13,24 +15,81 @@ urlpatterns = [
     # List and create products
     path(
         '',
-        views.ProductListCreateAPIView.as_view(),
+        lazy_view(
+            'products.api_views.ProductListCreateAPIView',
+            csrf_exempt=True,
+        ),
         name='product-list-create'
     ),
 
     # Retrieve, update, delete specific product
     path(
         '<int:pk>/',
-        views.ProductRetrieveUpdateDestroyAPIView.as_view(),
+        lazy_view(
+            'products.api_views.ProductRetrieveUpdateDestroyAPIView',
+            csrf_exempt=True,
+        ),
         name='product-detail'
     ),
 
+    # Exchange a username and password for an API token
+    path(
+        'token/',
+        lazy_view(
+            'rest_framework.authtoken.views.obtain_auth_token',
+            csrf_exempt=True,
+        ),
+        name='api-token'
+    ),
+
     # Browse products by category (for suggestions)
     path(
         'browse/<str:category>/',
-        views.ProductBrowseByCategoryAPIView.as_view(),
+        lazy_view(
+            'products.api_views.ProductBrowseByCategoryAPIView',
+            csrf_exempt=True,
+        ),
         name='product-browse-category'
     ),
 
+    # Product/brand suggestions while typing
+    path(
+        'autocomplete/',
+        views.product_autocomplete,
+        name='product-autocomplete'
+    ),
+
+    # Possible duplicate products and merging them
+    path(
+        'duplicates/',
+        views.product_duplicates,
+        name='product-duplicates'
+    ),
+    path(
+        'duplicates/merge/',
+        views.merge_products,
+        name='product-merge'
+    ),
+
+    # Expiry alert inbox
+    path(
+        'alerts/',
+        views.expiry_alerts,
+        name='expiry-alerts'
+    ),
+    path(
+        'alerts/read/',
+        views.mark_alerts_read,
+        name='expiry-alerts-read'
+    ),
+
+    # Background Open Beauty Facts import
+    path(
+        'openbeautyfacts/import/',
+        views.enqueue_openbeautyfacts_import,
+        name='openbeautyfacts-import'
+    ),
+
     # Quick add product (AJAX endpoint for routine creation)
     path(
         'quick-add/',
@@ -0,0 +1,154 @@
+"""Django REST framework views for the products API.
+
+These live apart from ``products.views`` so that DRF is only imported
+when an API URL is first requested (``api_urls`` routes to them through
+``config.lazy.lazy_view``), not on every process start.
+"""
+from django.db.models import Count, Max
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from rest_framework import generics, permissions
+from rest_framework.authentication import (
+    SessionAuthentication,
+    TokenAuthentication,
+)
+from rest_framework.response import Response
+
+from config.http_cache import ConditionalGetMixin
+
+from . import browse_catalog
+from .models import Product
+from .serializers import (
+    ProductSerializer,
+    ProductCreateSerializer,
+    dumps_json,
+    product_rows,
+    resolve_fields,
+)
+
+
+# Clients sending ``Authorization: Token <key>`` (see ``api/products/token/``)
+# are authenticated without loading a session and without CSRF checks;
+# the browser keeps using its session cookie.
+API_AUTHENTICATION_CLASSES = [TokenAuthentication, SessionAuthentication]
+
+
+class ProductListCreateAPIView(
+    ConditionalGetMixin, generics.ListCreateAPIView
+):
+    """API endpoint for listing and creating products."""
+    authentication_classes = API_AUTHENTICATION_CLASSES
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return Product.objects.filter(user=self.request.user)
+
+    def get_validators(self, request, *args, **kwargs):
+        """One aggregate query; the count catches deletions."""
+        stats = self.get_queryset().aggregate(
+            count=Count('pk'),
+            updated=Max('updated_at'),
+            catalog_updated=Max('catalog_product__updated_at'),
+        )
+        last_modified = max(
+            filter(None, (stats['updated'], stats['catalog_updated'])),
+            default=None,
+        )
+        return (
+            request.user.pk,
+            str(request.user),
+            stats['count'],
+            stats['updated'],
+            stats['catalog_updated'],
+            request.GET.get('fields'),
+        ), last_modified
+
+    def get_serializer_class(self):
+        if self.request.method == 'POST':
+            return ProductCreateSerializer
+        return ProductSerializer
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+    def list(self, request, *args, **kwargs):
+        """Return user's products; fallback to suggestions on error.
+
+        Reads rows with ``.values()`` rather than going through
+        ``ProductSerializer`` (same output, much cheaper for long lists).
+        ``?fields=name,brand`` limits the response to the given fields.
+        """
+        try:
+            fields = resolve_fields(request.GET.get('fields'))
+            rows = list(
+                product_rows(
+                    self.get_queryset(), fields, str(request.user)
+                )
+            )
+            return HttpResponse(
+                dumps_json(rows), content_type='application/json'
+            )
+        except Exception:
+            category = request.GET.get('category', 'moisturizer')
+            suggestions = (
+                ProductBrowseByCategoryAPIView()
+                .create_default_suggestions(category)
+            )
+            serializer = ProductSerializer(
+                suggestions, many=True, context={'request': request}
+            )
+            return Response(serializer.data)
+
+
+class ProductRetrieveUpdateDestroyAPIView(
+    ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView
+):
+    """API endpoint for single product retrieve/update/delete."""
+    serializer_class = ProductSerializer
+    authentication_classes = API_AUTHENTICATION_CLASSES
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return Product.objects.filter(
+            user=self.request.user
+        ).select_related('catalog_product')
+
+    def get_validators(self, request, *args, **kwargs):
+        row = (
+            self.get_queryset()
+            .filter(pk=kwargs['pk'])
+            .values_list('updated_at', 'catalog_product__updated_at')
+            .first()
+        )
+        if row is None:
+            return None
+        last_modified = max(filter(None, row))
+        return (request.user.pk, kwargs['pk'], *row), last_modified
+
+
+class ProductBrowseByCategoryAPIView(generics.ListAPIView):
+    """API endpoint for browsing products by category.
+
+    Responses come from ``browse_catalog``'s cache; no authentication is
+    needed, so a warm cache serves anonymous requests without the DB.
+    """
+    serializer_class = ProductSerializer
+    permission_classes = []  # Public browsing allowed
+    authentication_classes = []
+
+    def list(self, request, *args, **kwargs):
+        category = self.kwargs.get('category', 'moisturizer')
+        body, etag = browse_catalog.get_category(category)
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(body, content_type='application/json')
+        response['ETag'] = etag
+        response['Cache-Control'] = 'public, max-age={}'.format(
+            browse_catalog.get_timeout()
+        )
+        return response
+
+    def create_default_suggestions(self, category):
+        """Create default product suggestions when DB is empty."""
+        return browse_catalog.default_suggestions(category)
@@ -0,0 +1,153 @@
+"""Per-page JS/CSS bundles.
+
+The site script is split into modules under ``static/js/src``; each page
+loads one bundle holding only the modules it uses. ``build_assets``
+concatenates and minifies every bundle, writes it to ``static/dist`` with
+a content hash in the filename, alongside ``.gz`` and ``.br`` copies that
+WhiteNoise serves to browsers that accept them, and records the files in
+``static/dist/manifest.json``. The ``asset_tags`` template library reads
+that manifest; without it (or with ``USE_ASSET_BUNDLES`` off) the source
+files are linked one by one.
+"""
+import gzip
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+from django.conf import settings
+
+OUTPUT_DIR = 'dist'
+MANIFEST_NAME = 'manifest.json'
+# 12 hex characters, matched by WHITENOISE_IMMUTABLE_FILE_TEST.
+HASH_LENGTH = 12
+
+# Bundle name -> static source files, in load order.
+BUNDLES = {
+    'js': {
+        'base': ['js/src/core.js'],
+        'dashboard': [
+            'js/src/core.js', 'js/src/calendar.js', 'js/src/routines.js',
+        ],
+        'products': ['js/src/core.js', 'js/src/products.js'],
+        'routine_builder': ['js/src/core.js', 'js/src/routine_builder.js'],
+    },
+    'css': {
+        'site': ['css/style.css'],
+        'dashboard': ['css/style.css', 'css/dashboard_style.css'],
+    },
+}
+
+
+def static_root():
+    """Directory the sources (and built bundles) live in."""
+    return str(settings.STATICFILES_DIRS[0])
+
+
+def manifest_path():
+    return os.path.join(static_root(), OUTPUT_DIR, MANIFEST_NAME)
+
+
+@lru_cache(maxsize=1)
+def load_manifest():
+    """Return the bundle manifest, or ``{}`` if it hasn't been built."""
+    try:
+        with open(manifest_path(), encoding='utf-8') as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def get_bundle(kind, name):
+    """Return the static paths to link for a bundle.
+
+    That is the built file when there is one, otherwise the sources.
+    """
+    if kind not in BUNDLES or name not in BUNDLES[kind]:
+        raise KeyError('Unknown {} bundle: {}'.format(kind, name))
+    if getattr(settings, 'USE_ASSET_BUNDLES', True):
+        entry = load_manifest().get(kind, {}).get(name)
+        if entry:
+            return [entry['path']]
+    return list(BUNDLES[kind][name])
+
+
+def minify(kind, source):
+    # Only needed when building, not when rendering templates.
+    if kind == 'js':
+        from rjsmin import jsmin
+        return jsmin(source)
+    from rcssmin import cssmin
+    return cssmin(source)
+
+
+def compress(data):
+    """Return ``(gzip, brotli)`` bytes; both are byte-for-byte repeatable."""
+    import brotli
+
+    return gzip.compress(data, compresslevel=9, mtime=0), brotli.compress(data)
+
+
+def build_bundle(kind, name):
+    """Minify one bundle and write it with its compressed variants.
+
+    Returns the manifest entry. Rebuilding unchanged sources rewrites the
+    same filename, so the URL only changes when the content does.
+    """
+    root = static_root()
+    sources = BUNDLES[kind][name]
+    parts = []
+    for path in sources:
+        with open(os.path.join(root, path), encoding='utf-8') as fh:
+            parts.append(fh.read())
+    # Newline-separated so one file's last line can't run into the next.
+    data = minify(kind, '\n'.join(parts)).encode('utf-8')
+    digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+    path = '{}/{}/{}.{}.{}'.format(OUTPUT_DIR, kind, name, digest, kind)
+    filename = os.path.join(root, path)
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    gzipped, brotlied = compress(data)
+    for suffix, content in (('', data), ('.gz', gzipped), ('.br', brotlied)):
+        with open(filename + suffix, 'wb') as fh:
+            fh.write(content)
+
+    return {
+        'path': path,
+        'sources': list(sources),
+        'source_bytes': sum(len(p.encode('utf-8')) for p in parts),
+        'bytes': len(data),
+        'gzip_bytes': len(gzipped),
+        'br_bytes': len(brotlied),
+    }
+
+
+def remove_stale(manifest):
+    """Delete built files no longer referenced by ``manifest``."""
+    root = static_root()
+    keep = set()
+    for entries in manifest.values():
+        for entry in entries.values():
+            keep.update(
+                entry['path'] + suffix for suffix in ('', '.gz', '.br')
+            )
+    removed = []
+    for kind in BUNDLES:
+        directory = os.path.join(root, OUTPUT_DIR, kind)
+        if not os.path.isdir(directory):
+            continue
+        for filename in sorted(os.listdir(directory)):
+            path = '{}/{}/{}'.format(OUTPUT_DIR, kind, filename)
+            if path not in keep:
+                os.remove(os.path.join(directory, filename))
+                removed.append(path)
+    return removed
+
+
+def write_manifest(manifest):
+    filename = manifest_path()
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    with open(filename, 'w', encoding='utf-8') as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+        fh.write('\n')
+    load_manifest.cache_clear()
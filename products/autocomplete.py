@@ -0,0 +1,239 @@
+"""In-memory prefix index for product and brand autocomplete.
+
+Each process keeps a sorted array of normalized search terms and answers
+prefix queries with ``bisect``, so typing never hits the database. There
+is one index per user (their own products, kept for the most recently
+active users) and one for the shared catalog. Indexes are built lazily
+and rebuilt when the version token stored in the Django cache changes;
+``products.signals`` bumps the token whenever products change.
+
+The catalog can be large (a full Open Beauty Facts dump), so its index
+holds at most ``MAX_CATALOG_ENTRIES`` products, those most used by
+people first. Only the very first build happens inside a request. After
+that a stale index keeps answering while one background thread builds
+its replacement.
+"""
+import logging
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count
+
+from .models import CatalogProduct, Product, normalize_text
+
+logger = logging.getLogger(__name__)
+
+USER_VERSION_KEY = 'autocomplete:user:{}'
+CATALOG_VERSION_KEY = 'autocomplete:catalog'
+MAX_USER_INDEXES = 500
+# Rebuild at least this often even without a version change, in case an
+# update happened in another process with a per-process cache backend.
+MAX_INDEX_AGE = 300
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 25
+MAX_CATALOG_ENTRIES = 100000
+
+
+def search_terms(name, brand):
+    """Terms a product can be found by: brand, name and each name word."""
+    name = normalize_text(name)
+    brand = normalize_text(brand)
+    terms = {brand, '{} {}'.format(brand, name)}
+    words = name.split()
+    # "hydrating foaming cleanser" -> itself, "foaming cleanser", "cleanser"
+    for i in range(len(words)):
+        terms.add(' '.join(words[i:]))
+    terms.discard('')
+    return terms
+
+
+class PrefixIndex:
+    """Sorted ``(term, item)`` pairs searched with ``bisect``."""
+
+    def __init__(self, items, terms_for):
+        entries = sorted(
+            (term, position)
+            for position, item in enumerate(items)
+            for term in terms_for(item)
+        )
+        self.items = items
+        self.terms = [term for term, _ in entries]
+        self.refs = [position for _, position in entries]
+
+    def search(self, prefix, limit=DEFAULT_LIMIT):
+        """Return up to ``limit`` distinct items with a term starting with
+        ``prefix``, in term order."""
+        results = []
+        seen = set()
+        position = bisect_left(self.terms, prefix)
+        while position < len(self.terms) and len(results) < limit:
+            if not self.terms[position].startswith(prefix):
+                break
+            ref = self.refs[position]
+            if ref not in seen:
+                seen.add(ref)
+                results.append(self.items[ref])
+            position += 1
+        return results
+
+
+def _product_terms(item):
+    return search_terms(item['name'], item['brand'])
+
+
+def _brand_terms(brand):
+    return {normalize_text(brand)} - {''}
+
+
+class _IndexEntry:
+    __slots__ = ('version', 'built_at', 'products', 'brands')
+
+    def __init__(self, version, rows):
+        self.version = version
+        self.built_at = time.monotonic()
+        self.products = PrefixIndex(rows, _product_terms)
+        brands = {}
+        for row in rows:
+            brands.setdefault(normalize_text(row['brand']), row['brand'])
+        self.brands = PrefixIndex(sorted(brands.values()), _brand_terms)
+
+    def is_current(self, version):
+        return (
+            self.version == version
+            and time.monotonic() - self.built_at < MAX_INDEX_AGE
+        )
+
+
+_lock = threading.Lock()
+_user_indexes = OrderedDict()
+_catalog_index = None
+# Held by whoever is building the catalog index.
+_catalog_lock = threading.Lock()
+
+
+def _version(key):
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.set(key, version, None)
+    return version
+
+
+def _user_index(user_id):
+    version = _version(USER_VERSION_KEY.format(user_id))
+    with _lock:
+        entry = _user_indexes.get(user_id)
+        if entry is not None and entry.is_current(version):
+            _user_indexes.move_to_end(user_id)
+            return entry
+
+    rows = list(
+        Product.objects.filter(user_id=user_id).values(
+            'id', 'name', 'brand', 'product_type'
+        )
+    )
+    entry = _IndexEntry(version, rows)
+    with _lock:
+        _user_indexes[user_id] = entry
+        _user_indexes.move_to_end(user_id)
+        while len(_user_indexes) > MAX_USER_INDEXES:
+            _user_indexes.popitem(last=False)
+    return entry
+
+
+def _build_catalog(version):
+    global _catalog_index
+    rows = list(
+        CatalogProduct.objects.annotate(users=Count('user_products'))
+        .order_by('-users', 'pk')
+        .values('id', 'name', 'brand', 'product_type')[:MAX_CATALOG_ENTRIES]
+    )
+    _catalog_index = _IndexEntry(version, rows)
+
+
+def _rebuild_catalog(version):
+    try:
+        _build_catalog(version)
+    except Exception:
+        # Keep serving the old index; the next request tries again.
+        logger.exception('Rebuilding the catalog autocomplete index failed')
+    finally:
+        _catalog_lock.release()
+        connection.close()
+
+
+def _catalog():
+    version = _version(CATALOG_VERSION_KEY)
+    entry = _catalog_index
+    if entry is not None and entry.is_current(version):
+        return entry
+
+    if entry is None:
+        # Nothing to serve yet: build it here, once for all the threads
+        # waiting on the lock.
+        with _catalog_lock:
+            if _catalog_index is None:
+                _build_catalog(version)
+        return _catalog_index
+
+    if _catalog_lock.acquire(blocking=False):
+        try:
+            threading.Thread(
+                target=_rebuild_catalog, args=(version,),
+                name='autocomplete-catalog', daemon=True,
+            ).start()
+        except Exception:
+            _catalog_lock.release()
+            raise
+    return entry
+
+
+def suggest(user_id, query, limit=DEFAULT_LIMIT):
+    """Return matching user products, catalog products and brands."""
+    prefix = normalize_text(query)
+    if not prefix:
+        return {'products': [], 'catalog': [], 'brands': []}
+
+    mine = _user_index(user_id)
+    catalog = _catalog()
+
+    products = mine.products.search(prefix, limit)
+    owned = {
+        (normalize_text(p['brand']), normalize_text(p['name']))
+        for p in products
+    }
+    catalog_matches = [
+        item for item in catalog.products.search(prefix, limit + len(owned))
+        if (normalize_text(item['brand']), normalize_text(item['name']))
+        not in owned
+    ][:limit]
+
+    brands = []
+    seen = set()
+    for brand in (
+        mine.brands.search(prefix, limit) + catalog.brands.search(prefix, limit)
+    ):
+        key = normalize_text(brand)
+        if key not in seen:
+            seen.add(key)
+            brands.append(brand)
+
+    return {
+        'products': products,
+        'catalog': catalog_matches,
+        'brands': brands[:limit],
+    }
+
+
+def invalidate_user(user_id):
+    """Mark a user's index stale (in every process sharing the cache)."""
+    cache.set(USER_VERSION_KEY.format(user_id), uuid.uuid4().hex, None)
+
+
+def invalidate_catalog():
+    cache.set(CATALOG_VERSION_KEY, uuid.uuid4().hex, None)
@@ -0,0 +1,213 @@
+"""Precomputed, cached catalog for the public browse-by-category API.
+
+Each category's suggestion list is serialized once and cached as JSON
+bytes with an ETag. Cache entries expire after
+``settings.BROWSE_CATALOG_TIMEOUT`` seconds and are dropped explicitly
+when a product in that category changes (see ``products.signals``), so a
+warm cache serves anonymous browse traffic without touching the database.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Product
+
+CACHE_KEY = 'browse_catalog:{}'
+DEFAULT_TIMEOUT = 600
+MIN_DB_PRODUCTS = 4
+MAX_PRODUCTS = 10
+
+CATEGORIES = [choice for choice, _ in Product.PRODUCT_TYPE_CHOICES]
+
+# Popular products shown when the database doesn't have enough of a
+# category yet. Unknown categories fall back to the moisturizer list.
+DEFAULT_SUGGESTIONS = {
+    'cleanser': [
+        {
+            'name': 'Hydrating Foaming Oil Cleanser',
+            'brand': 'CeraVe',
+            'ingredients': (
+                'Hyaluronic Acid, Ceramides, Niacinamide'
+            ),
+        },
+        {
+            'name': 'Gentle Skin Cleanser',
+            'brand': 'Cetaphil',
+            'ingredients': 'Sodium Cocoyl Glycinate, Glycerin',
+        },
+        {
+            'name': 'Ultra Gentle Daily Cleanser',
+            'brand': 'Neutrogena',
+            'ingredients': 'Glycerin, Polyglyceryl-4 Caprate',
+        },
+        {
+            'name': 'Squalane Cleanser',
+            'brand': 'The Ordinary',
+            'ingredients': 'Squalane, Aqua, Coco-Caprylate',
+        },
+    ],
+    'moisturizer': [
+        {
+            'name': 'Daily Facial Moisturizing Lotion',
+            'brand': 'CeraVe',
+            'ingredients': 'Hyaluronic Acid, Ceramides',
+        },
+        {
+            'name': 'Hydro Boost Water Gel',
+            'brand': 'Neutrogena',
+            'ingredients': 'Hyaluronic Acid, Glycerin',
+        },
+        {
+            'name': 'Daily Facial Moisturizer',
+            'brand': 'Cetaphil',
+            'ingredients': 'Macadamia Oil, Dimethicone',
+        },
+        {
+            'name': 'Natural Moisturizing Factors + HA',
+            'brand': 'The Ordinary',
+            'ingredients': 'Sodium Hyaluronate, PCA',
+        },
+    ],
+    'sunscreen': [
+        {
+            'name': 'AM Facial Moisturizing Lotion SPF 30',
+            'brand': 'CeraVe',
+            'ingredients': 'Zinc Oxide, Niacinamide',
+        },
+        {
+            'name': 'Ultra Sheer Dry-Touch SPF 45',
+            'brand': 'Neutrogena',
+            'ingredients': 'Avobenzone, Homosalate, Octisalate',
+        },
+        {
+            'name': 'UV Clear Broad-Spectrum SPF 46',
+            'brand': 'EltaMD',
+            'ingredients': 'Zinc Oxide, Niacinamide',
+        },
+        {
+            'name': 'Invisible Zinc Oxide SPF 50',
+            'brand': 'Blue Lizard',
+            'ingredients': 'Zinc Oxide, Titanium Dioxide',
+        },
+    ],
+    'serum': [
+        {
+            'name': 'Vitamin C + E Ferulic Acid Serum',
+            'brand': 'Skinceuticals',
+            'ingredients': 'L-Ascorbic Acid, Vitamin E, Ferulic Acid',
+        },
+        {
+            'name': 'Niacinamide 10% + Zinc 1%',
+            'brand': 'The Ordinary',
+            'ingredients': 'Niacinamide, Zinc PCA',
+        },
+        {
+            'name': 'Hyaluronic Acid 2% + B5',
+            'brand': 'The Ordinary',
+            'ingredients': 'Sodium Hyaluronate, Panthenol',
+        },
+        {
+            'name': 'Vitamin C Brightening Serum',
+            'brand': 'Mad Hippie',
+            'ingredients': 'Sodium Ascorbyl Phosphate, HA',
+        },
+    ],
+    'toner': [
+        {
+            'name': 'Alcohol-Free Toner',
+            'brand': 'Thayers',
+            'ingredients': 'Witch Hazel, Aloe Vera',
+        },
+        {
+            'name': 'Ultra Gentle Toner',
+            'brand': 'Neutrogena',
+            'ingredients': 'Glycerin, Cucumber Extract',
+        },
+        {
+            'name': 'Clarifying Toner',
+            'brand': 'CeraVe',
+            'ingredients': 'Niacinamide, Hyaluronic Acid',
+        },
+    ],
+}
+
+
+def get_timeout():
+    return getattr(settings, 'BROWSE_CATALOG_TIMEOUT', DEFAULT_TIMEOUT)
+
+
+def default_suggestions(category):
+    """Return unsaved ``Product`` instances for the default suggestions."""
+    products_data = DEFAULT_SUGGESTIONS.get(
+        category, DEFAULT_SUGGESTIONS['moisturizer']
+    )
+    return [
+        Product(
+            id=9000 + i,
+            name=pdata['name'],
+            brand=pdata['brand'],
+            product_type=category,
+            ingredients=pdata.get('ingredients', ''),
+            description='Popular {} product'.format(category),
+            external_id='default_{}_{}'.format(category, i),
+        )
+        for i, pdata in enumerate(products_data)
+    ]
+
+
+def build_category(category, use_db=True):
+    """Serialize one category's suggestion list to ``(body, etag)``."""
+    # Imported here to avoid a circular import with serializers.
+    from .serializers import ProductSerializer, dumps_json
+
+    products = []
+    if use_db:
+        products = list(
+            Product.objects.filter(product_type=category)
+            .select_related('user', 'catalog_product')
+            .order_by('brand', 'name')[:MAX_PRODUCTS]
+        )
+    if len(products) < MIN_DB_PRODUCTS:
+        products = default_suggestions(category)
+
+    body = dumps_json(ProductSerializer(products, many=True).data)
+    etag = '"{}"'.format(hashlib.md5(body).hexdigest())
+    return body, etag
+
+
+def get_category(category):
+    """Return cached ``(body, etag)`` for a category, building on a miss.
+
+    Only known product types are cached, so arbitrary URLs can't fill
+    the cache. Unknown categories get the default list without a query.
+    """
+    if category not in CATEGORIES:
+        return build_category(category, use_db=False)
+
+    key = CACHE_KEY.format(category)
+    entry = cache.get(key)
+    if entry is None:
+        entry = build_category(category)
+        cache.set(key, entry, get_timeout())
+    return entry
+
+
+def warm(categories=None):
+    """Precompute and cache every category (or the given ones)."""
+    timeout = get_timeout()
+    cache.set_many(
+        {
+            CACHE_KEY.format(category): build_category(category)
+            for category in categories or CATEGORIES
+            if category in CATEGORIES
+        },
+        timeout,
+    )
+
+
+def invalidate(*categories):
+    """Drop cached entries for the given categories (all if none given)."""
+    cache.delete_many(
+        [CACHE_KEY.format(c) for c in categories or CATEGORIES]
+    )
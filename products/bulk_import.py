@@ -0,0 +1,208 @@
+"""Bulk product import from CSV or JSON uploads.
+
+Rows are validated one at a time with ``ProductForm`` (so the rules match
+the add/edit pages) and the valid ones are written in a single
+transaction with ``bulk_create(update_conflicts=True)`` on the
+``(user, name, brand)`` unique key.
+"""
+import codecs
+import copy
+import csv
+import json
+
+from django.db import transaction
+
+from config import http_cache
+
+from . import autocomplete, browse_catalog, catalog, expiry
+from .forms import ProductForm
+from .models import Product, dedupe_key
+
+IMPORT_FORMATS = ('csv', 'json')
+IMPORT_FIELDS = ProductForm.Meta.fields
+UNIQUE_FIELDS = ['user', 'name', 'brand']
+UPDATE_FIELDS = [
+    f for f in IMPORT_FIELDS if f not in ('name', 'brand')
+] + ['catalog_product', 'expiry_alert_on', 'expiry_alert_days', 'updated_at']
+BATCH_SIZE = 500
+
+TRUE_VALUES = ('1', 'true', 'yes', 'on', 'y')
+
+
+class ImportFormatError(ValueError):
+    """Raised when an upload can't be parsed at all."""
+
+
+class _SharedFields(dict):
+    """Field dict that deep-copies to itself."""
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class ImportRowForm(ProductForm):
+    """ProductForm that reuses one set of field objects for every row.
+
+    ``BaseForm.__init__`` deep-copies ``base_fields`` per instance, which
+    is most of the cost of validating thousands of rows. Cleaning never
+    mutates fields, so one copy can be shared.
+    """
+
+    base_fields = _SharedFields(copy.deepcopy(ProductForm.base_fields))
+
+
+def detect_format(filename, content_type=''):
+    """Guess the upload format from its name or content type."""
+    name = (filename or '').lower()
+    if name.endswith('.json') or 'json' in (content_type or ''):
+        return 'json'
+    if name.endswith('.csv') or 'csv' in (content_type or ''):
+        return 'csv'
+    return None
+
+
+def iter_rows(fileobj, fmt):
+    """Yield raw row dicts from an uploaded file.
+
+    CSV is decoded and parsed incrementally. JSON must be a list of
+    objects (or an object with a ``products`` list).
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(codecs.iterdecode(fileobj, 'utf-8-sig'))
+        try:
+            for row in reader:
+                yield {
+                    (key or '').strip(): value
+                    for key, value in row.items()
+                }
+        except UnicodeDecodeError:
+            raise ImportFormatError(
+                'CSV files must be UTF-8 encoded (in Excel, save as '
+                '"CSV UTF-8").'
+            )
+        except csv.Error as exc:
+            raise ImportFormatError('Invalid CSV file: {}'.format(exc))
+    elif fmt == 'json':
+        try:
+            data = json.load(codecs.getreader('utf-8-sig')(fileobj))
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+            raise ImportFormatError('Invalid JSON file: {}'.format(exc))
+        if isinstance(data, dict):
+            data = data.get('products')
+        if not isinstance(data, list):
+            raise ImportFormatError(
+                'JSON uploads must contain a list of products.'
+            )
+        for row in data:
+            yield row if isinstance(row, dict) else {}
+    else:
+        raise ImportFormatError('Unsupported file format.')
+
+
+def _form_data(row):
+    """Turn a raw row into form data ProductForm understands."""
+    data = {}
+    for field in IMPORT_FIELDS:
+        value = row.get(field)
+        if value is None:
+            continue
+        if field == 'is_favorite':
+            # CheckboxInput treats any non-empty string as checked.
+            value = str(value).strip().lower() in TRUE_VALUES
+        elif isinstance(value, str):
+            value = value.strip()
+        data[field] = value
+    return data
+
+
+def validate_rows(rows):
+    """Validate rows with ProductForm.
+
+    Returns ``(products, errors)``: ``(product, fields)`` pairs keyed by
+    ``(name, brand)``, where ``product`` is an unsaved ``Product`` and
+    ``fields`` the set of fields the row actually had (a later row wins
+    over an earlier one with the same key), and a list of
+    ``{'row': n, 'errors': {...}}`` dicts, where ``n`` is 1-based and
+    counts data rows only.
+    """
+    products = {}
+    errors = []
+    for index, row in enumerate(rows, start=1):
+        data = _form_data(row)
+        form = ImportRowForm(data=data)
+        if form.is_valid():
+            product = form.save(commit=False)
+            products[(product.name, product.brand)] = (product, set(data))
+        else:
+            errors.append(
+                {
+                    'row': index,
+                    'errors': {
+                        field: list(messages)
+                        for field, messages in form.errors.items()
+                    },
+                }
+            )
+    return products, errors
+
+
+def import_products(user, fileobj, fmt):
+    """Validate and upsert products from ``fileobj`` for ``user``.
+
+    Returns counts of created/updated products plus per-row errors. Rows
+    with errors are skipped; the valid ones are still saved.
+    """
+    products, errors = validate_rows(iter_rows(fileobj, fmt))
+
+    # The upsert writes every field in UPDATE_FIELDS, so fields a row
+    # leaves out (e.g. a CSV with only name, brand and rating) take the
+    # existing product's value instead of the form's empty default.
+    existing = {
+        (row['name'], row['brand']): row
+        for row in Product.objects.filter(
+            user=user, name__in={name for name, _ in products}
+        ).values(*IMPORT_FIELDS)
+    }
+    updated = 0
+    objs = []
+    for key, (product, fields) in products.items():
+        current = existing.get(key)
+        if current is not None:
+            updated += 1
+            for field in IMPORT_FIELDS:
+                if field not in fields:
+                    setattr(product, field, current[field])
+        objs.append(product)
+
+    entries = [{'name': p.name, 'brand': p.brand} for p in objs]
+    catalog_rows = catalog.resolve(entries, create=False)
+    for product, catalog_product in zip(objs, catalog_rows):
+        product.user = user
+        product.catalog_product = catalog_product
+        product.dedupe_key = dedupe_key(product.brand, product.name)
+        product.schedule_expiry_alert()
+        # bulk_create skips Product.save(), so drop catalog duplicates here.
+        if (catalog_product
+                and product.ingredients == catalog_product.ingredients):
+            product.ingredients = None
+
+    with transaction.atomic():
+        Product.objects.bulk_create(
+            objs,
+            batch_size=BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=UNIQUE_FIELDS,
+            update_fields=UPDATE_FIELDS,
+        )
+    # bulk_create doesn't send post_save, so clear the caches here.
+    browse_catalog.invalidate()
+    autocomplete.invalidate_user(user.pk)
+    expiry.invalidate_summary(user.pk)
+    http_cache.bump_user_version(user.pk)
+
+    return {
+        'created': len(objs) - updated,
+        'updated': updated,
+        'skipped': len(errors),
+        'errors': errors,
+    }
@@ -0,0 +1,73 @@
+"""Lookup and creation of shared ``CatalogProduct`` rows.
+
+``resolve()`` maps a batch of product dicts to catalog entries with a
+fixed number of queries, matching on ``external_id`` first and the
+normalized brand/name key second.
+"""
+from .autocomplete import invalidate_catalog
+from .models import CatalogProduct, catalog_key
+
+CATALOG_FIELDS = (
+    'name', 'brand', 'product_type', 'ingredients', 'description',
+    'external_id',
+)
+
+
+def resolve(entries, create=True):
+    """Return a catalog entry (or ``None``) for each dict in ``entries``.
+
+    Entries need ``name`` and ``brand``; the other ``CATALOG_FIELDS`` are
+    used when a new catalog row is created. With ``create=False`` only
+    existing rows are returned.
+    """
+    keys = [catalog_key(e['brand'], e['name']) for e in entries]
+    external_ids = {e.get('external_id') for e in entries} - {None, ''}
+
+    by_external = {}
+    if external_ids:
+        by_external = {
+            c.external_id: c
+            for c in CatalogProduct.objects.filter(
+                external_id__in=external_ids
+            )
+        }
+    by_key = {}
+    for c in CatalogProduct.objects.filter(
+        normalized_key__in=set(keys)
+    ).order_by('pk'):
+        by_key.setdefault(c.normalized_key, c)
+
+    results = []
+    to_create = {}
+    for entry, key in zip(entries, keys):
+        ext = entry.get('external_id') or None
+        match = by_external.get(ext) if ext else None
+        if match is None:
+            match = by_key.get(key)
+        if match is None and create:
+            # One new row per key (or external id) within the batch.
+            new_key = ext or key
+            match = to_create.get(new_key)
+            if match is None:
+                match = CatalogProduct(
+                    normalized_key=key,
+                    **{f: entry.get(f) or None for f in CATALOG_FIELDS},
+                )
+                if match.product_type is None:
+                    match.product_type = ''
+                to_create[new_key] = match
+                by_key.setdefault(key, match)
+        results.append(match)
+
+    if to_create:
+        CatalogProduct.objects.bulk_create(list(to_create.values()))
+        # bulk_create doesn't send post_save.
+        invalidate_catalog()
+    return results
+
+
+def find(brand, name):
+    """Return the catalog entry for a brand/name, or ``None``."""
+    return CatalogProduct.objects.filter(
+        normalized_key=catalog_key(brand, name)
+    ).order_by('pk').first()
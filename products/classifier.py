@@ -0,0 +1,109 @@
+"""Classify Open Beauty Facts category strings into our product types.
+
+The rules are data: each row of ``CATEGORY_RULES`` gives a product type,
+a priority and the patterns that select it. They are compiled into one
+case-insensitive regex alternation, so a category string is scanned once
+however many rules there are. When several rules match, the highest
+priority wins (ties go to the earlier row), which lets specific phrases
+beat generic ones: "eye cream" is an eye cream even though it also
+contains "cream".
+"""
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# (product_type, priority, patterns). Patterns are regexes matched at word
+# boundaries, case-insensitively; a space also matches "-" or "_" (as in
+# category tags like "en:eye-creams") and a trailing "s"/"es" is allowed.
+CATEGORY_RULES = [
+    ('spot_treatment', 90, ['spot treatment', 'acne treatment']),
+    ('retinol', 85, ['retinol', 'retinoid']),
+    ('vitamin_c', 85, ['vitamin c']),
+    ('sunscreen', 80, ['sunscreen', 'sun protection', r'spf\s*\d*']),
+    ('eye_cream', 75, ['eye cream', 'eye care']),
+    ('mask', 70, ['mask', 'face mask']),
+    ('exfoliant', 70, ['exfoliant', 'scrub', 'peeling']),
+    ('cleanser', 65, ['cleanser', 'cleansing', 'face wash', 'gel cleanser']),
+    ('oil', 60, ['face oil']),
+    ('essence', 55, ['essence']),
+    ('toner', 50, ['toner', 'tonic']),
+    ('serum', 50, ['serum']),
+    ('moisturizer', 40, [
+        'moisturizer', 'moisturiser', 'cream', 'lotion', 'face cream',
+    ]),
+    # Plain "oil" is weak evidence ("oil-free moisturizer").
+    ('oil', 30, ['oil']),
+]
+DEFAULT_TYPE = 'other'
+
+Classification = namedtuple('Classification', 'product_type rule matched')
+
+
+class CategoryClassifier:
+    """A compiled set of category rules.
+
+    ``classify()`` returns a ``Classification`` with the product type,
+    the index of the rule that decided it (``None`` if nothing matched)
+    and the text it matched.
+    """
+
+    def __init__(self, rules=CATEGORY_RULES, default=DEFAULT_TYPE):
+        self.rules = list(rules)
+        self.default = default
+        self.no_match = Classification(default, None, None)
+        # Try higher-priority alternatives first at any given position.
+        order = sorted(
+            range(len(self.rules)), key=lambda i: -self.rules[i][1]
+        )
+        alternatives = []
+        for index in order:
+            patterns = '|'.join(
+                p.replace(' ', r'[\s_-]+') for p in self.rules[index][2]
+            )
+            alternatives.append(f'(?P<r{index}>{patterns})')
+        self.pattern = re.compile(
+            r'\b(?:{})(?:e?s)?\b'.format('|'.join(alternatives)),
+            re.IGNORECASE,
+        )
+        # Regex group number -> (priority, -index) ranking key and index.
+        self.group_rules = {
+            number: ((self.rules[int(name[1:])][1], -int(name[1:])),
+                     int(name[1:]))
+            for name, number in self.pattern.groupindex.items()
+        }
+        self.classify = lru_cache(maxsize=4096)(self._classify)
+
+    def _classify(self, categories):
+        if not categories:
+            return self.no_match
+        best = None
+        best_key = None
+        for match in self.pattern.finditer(categories):
+            key, index = self.group_rules[match.lastindex]
+            if best_key is None or key > best_key:
+                best, best_key = match, key
+        if best is None:
+            return self.no_match
+        index = self.group_rules[best.lastindex][1]
+        return Classification(
+            self.rules[index][0], index, best.group(best.lastindex)
+        )
+
+    def classify_batch(self, categories_list):
+        """Classify many category strings; repeats are classified once."""
+        results = {}
+        for categories in categories_list:
+            if categories not in results:
+                results[categories] = self.classify(categories or '')
+        return [results[categories] for categories in categories_list]
+
+
+default_classifier = CategoryClassifier()
+
+
+def classify(categories):
+    return default_classifier.classify(categories or '')
+
+
+def classify_batch(categories_list):
+    return default_classifier.classify_batch(categories_list)
@@ -0,0 +1,123 @@
+"""Fuzzy duplicate detection and merging for a user's products.
+
+Every product stores a blocking key (``Product.dedupe_key``, indexed with
+``user``). Candidates are only compared within a block, so the work grows
+with block size rather than with the square of the collection.
+"""
+import re
+from difflib import SequenceMatcher
+
+from django.db import transaction
+from django.db.models import Count
+
+from .models import Product, normalize_text
+
+SIMILARITY_THRESHOLD = 0.85
+# Personal fields copied onto the kept product when it has no value.
+MERGE_FILL_FIELDS = (
+    'notes', 'ingredients', 'description', 'external_id', 'rating',
+    'expiry_date', 'skin_type', 'catalog_product_id',
+)
+
+
+def compare_text(product):
+    """Brand and name, lowercased, punctuation collapsed to spaces."""
+    text = normalize_text('{} {}'.format(product.brand, product.name))
+    return ' '.join(re.sub(r'[\W_]+', ' ', text).split())
+
+
+def similarity(a, b):
+    """Similarity ratio (0-1) between two compare strings."""
+    if a == b:
+        return 1.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def find_duplicates(user, threshold=SIMILARITY_THRESHOLD):
+    """Return groups of products that look like the same product.
+
+    Each group is a dict with ``products`` (oldest first) and ``score``
+    (the lowest pairwise score that joined the group).
+    """
+    keys = (
+        Product.objects.filter(user=user)
+        .values('dedupe_key')
+        .annotate(n=Count('id'))
+        .filter(n__gt=1)
+        .values_list('dedupe_key', flat=True)
+    )
+    blocks = {}
+    for product in Product.objects.filter(
+        user=user, dedupe_key__in=list(keys)
+    ).order_by('dedupe_key', 'created_at', 'pk'):
+        blocks.setdefault(product.dedupe_key, []).append(product)
+
+    groups = []
+    for products in blocks.values():
+        groups.extend(_group_block(products, threshold))
+    return groups
+
+
+def _group_block(products, threshold):
+    """Union-find over pairs in one block scoring at or above threshold."""
+    texts = [compare_text(p) for p in products]
+    parent = list(range(len(products)))
+    scores = {}
+
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i in range(len(products)):
+        for j in range(i + 1, len(products)):
+            score = similarity(texts[i], texts[j])
+            if score >= threshold:
+                ri, rj = root(i), root(j)
+                if ri != rj:
+                    parent[rj] = ri
+                scores[ri] = min(scores.get(ri, 1.0), score)
+
+    members = {}
+    for i in range(len(products)):
+        members.setdefault(root(i), []).append(products[i])
+    return [
+        {'products': group, 'score': round(scores.get(r, 1.0), 3)}
+        for r, group in members.items()
+        if len(group) > 1
+    ]
+
+
+def merge_products(user, keep_id, merge_ids):
+    """Merge ``merge_ids`` into ``keep_id`` for ``user``.
+
+    Routine steps pointing at the merged products are repointed with one
+    UPDATE, blank personal fields on the kept product are filled from the
+    merged ones, and the merged products are deleted. Returns the number
+    of products merged; raises ``Product.DoesNotExist`` for unknown ids.
+    """
+    from routines.models import RoutineStep
+
+    merge_ids = [int(pk) for pk in merge_ids if int(pk) != int(keep_id)]
+    with transaction.atomic():
+        keep = Product.objects.select_for_update().get(pk=keep_id, user=user)
+        others = list(
+            Product.objects.filter(pk__in=merge_ids, user=user).order_by('pk')
+        )
+        if len(others) != len(set(merge_ids)):
+            raise Product.DoesNotExist('Some products were not found.')
+
+        RoutineStep.objects.filter(
+            product_id__in=[p.pk for p in others]
+        ).update(product=keep)
+
+        for other in others:
+            for field in MERGE_FILL_FIELDS:
+                if getattr(keep, field) in (None, '') and getattr(other, field):
+                    setattr(keep, field, getattr(other, field))
+            keep.is_favorite = keep.is_favorite or other.is_favorite
+        keep.save()
+
+        Product.objects.filter(pk__in=[p.pk for p in others]).delete()
+    return len(others)
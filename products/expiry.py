@@ -0,0 +1,156 @@
+"""Expiry tracking: scheduled alerts, the in-app inbox and dashboard data.
+
+Each product stores the date of its next alert (``expiry_alert_on``,
+indexed) and the 90/30/0-day threshold it is for. ``send_due_alerts()``
+runs daily (``manage.py send_expiry_alerts``): one range query finds every
+product across all users whose alert is due, alerts are written with
+``bulk_create`` and products are moved on to their next threshold.
+
+The dashboard's "expiring soon" list is computed once per user per day and
+cached; ``products.signals`` drops it whenever a product changes.
+"""
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from config import http_cache
+
+from .models import ExpiryAlert, Product, expiry_alert_schedule, shared_value
+
+SUMMARY_CACHE_KEY = 'expiry:summary:{}'
+SUMMARY_WINDOW_DAYS = 90
+BATCH_SIZE = 1000
+INBOX_LIMIT = 50
+
+
+def send_due_alerts(today=None, batch_size=BATCH_SIZE):
+    """Create alerts for every product whose next alert is due.
+
+    If the job missed some days, only the most urgent threshold crossed
+    since is sent. Returns the number of alerts created.
+    """
+    today = today or date.today()
+    due = Product.objects.filter(expiry_alert_on__lte=today).only(
+        'pk', 'user_id', 'expiry_date', 'expiry_alert_on',
+        'expiry_alert_days',
+    ).order_by('pk')
+
+    created = 0
+    last_pk = 0
+    while True:
+        batch = list(due.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+
+        alerts = []
+        for product in batch:
+            _, days = expiry_alert_schedule(
+                product.expiry_date, today,
+                after=product.expiry_alert_days + 1,
+            )
+            if days is not None:
+                alerts.append(
+                    ExpiryAlert(
+                        user_id=product.user_id,
+                        product_id=product.pk,
+                        days_before=days,
+                        expiry_date=product.expiry_date,
+                    )
+                )
+            product.expiry_alert_on, product.expiry_alert_days = (
+                expiry_alert_schedule(product.expiry_date, today, after=days)
+                if days is not None else (None, None)
+            )
+
+        with transaction.atomic():
+            ExpiryAlert.objects.bulk_create(alerts, ignore_conflicts=True)
+            Product.objects.bulk_update(
+                batch, ['expiry_alert_on', 'expiry_alert_days']
+            )
+        created += len(alerts)
+        for user_id in {p.user_id for p in batch}:
+            invalidate_summary(user_id)
+            http_cache.bump_user_version(user_id)
+    return created
+
+
+def unread_alerts(user, limit=INBOX_LIMIT):
+    """Return ``(alerts, count)``: the newest unread alerts and the total."""
+    unread = ExpiryAlert.objects.filter(user=user, read_at__isnull=True)
+    return list(unread.select_related('product')[:limit]), unread.count()
+
+
+def mark_read(user, alert_ids=None):
+    """Mark the given alerts (or all unread ones) as read."""
+    alerts = ExpiryAlert.objects.filter(user=user, read_at__isnull=True)
+    if alert_ids is not None:
+        alerts = alerts.filter(pk__in=alert_ids)
+    return alerts.update(read_at=timezone.now())
+
+
+def dashboard_summary(user, today=None):
+    """Return ``{'products': [...], 'events': [...]}`` for the dashboard.
+
+    Covers products expiring in the next 90 days, cached for the day.
+    """
+    today = today or date.today()
+    key = SUMMARY_CACHE_KEY.format(user.pk)
+    summary = cache.get(key)
+    if summary is None or summary['date'] != today:
+        summary = _build_summary(user, today)
+        cache.set(key, summary, 24 * 60 * 60)
+    return summary
+
+
+def _build_summary(user, today):
+    rows = Product.objects.filter(
+        user=user,
+        expiry_date__lte=today + timedelta(days=SUMMARY_WINDOW_DAYS),
+        expiry_date__gte=today,
+    ).order_by('expiry_date').values(
+        'id', 'name', 'brand', 'rating', 'expiry_date', 'ingredients',
+        'catalog_product__ingredients',
+    )
+
+    products = []
+    events = []
+    for row in rows:
+        days_until = (row['expiry_date'] - today).days
+        if days_until < 0:
+            status = 'expired'
+        elif days_until <= 30:
+            status = 'warning'
+        else:
+            status = 'info'
+        products.append(
+            {
+                'id': row['id'],
+                'name': row['name'],
+                'brand': row['brand'],
+                'rating': row['rating'],
+                'expiry_date': row['expiry_date'],
+                'ingredients': shared_value(
+                    row['ingredients'], row['catalog_product__ingredients']
+                ),
+            }
+        )
+        events.append(
+            {
+                'date': row['expiry_date'].strftime('%Y-%m-%d'),
+                'title': f"{row['name']} expires",
+                'type': 'expiry',
+                'status': status,
+                'product_name': row['name'],
+                'brand': row['brand'],
+                'days_until': days_until,
+                'expiry_date': row['expiry_date'].strftime('%Y-%m-%d'),
+            }
+        )
+    return {'date': today, 'products': products, 'events': events}
+
+
+def invalidate_summary(user_id):
+    cache.delete(SUMMARY_CACHE_KEY.format(user_id))
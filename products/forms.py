@@ -74,3 +74,23 @@ class ProductForm(forms.ModelForm):
                 }
             ),
         }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Show shared catalog ingredients when the user has none of their own
+        if self.instance.pk and not self.instance.ingredients:
+            self.initial['ingredients'] = self.instance.get_ingredients()
+
+
+class ProductImportForm(forms.Form):
+    """Upload form for bulk importing products from CSV or JSON."""
+
+    file = forms.FileField(
+        label='CSV or JSON file',
+        widget=forms.ClearableFileInput(
+            attrs={
+                'class': 'form-control',
+                'accept': '.csv,.json,text/csv,application/json',
+            }
+        ),
+    )
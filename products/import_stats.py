@@ -0,0 +1,107 @@
+"""Per-stage instrumentation for the Open Beauty Facts import pipeline.
+
+An ``ImportStats`` is threaded through ``iter_products()`` and
+``import_openbeautyfacts_products()``; each stage (fetch, parse, classify,
+persist) is timed with ``stats.stage(name)``. Fetching runs in several
+threads at once, so its seconds are summed across threads and can add up
+to more than the wall time; they include waiting on the rate limiter.
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+from django.db import connection
+
+STAGES = ('fetch', 'parse', 'classify', 'persist')
+
+
+class StageTimer:
+    """Handed out by ``ImportStats.stage()``; set ``items`` when known."""
+
+    def __init__(self, items=0):
+        self.items = items
+
+
+class ImportStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stages = {
+            name: {'seconds': 0.0, 'calls': 0, 'items': 0}
+            for name in STAGES
+        }
+        self.bytes_downloaded = 0
+        self.db_statements = 0
+        self.started = time.perf_counter()
+        self.finished = None
+
+    @contextmanager
+    def stage(self, name, items=0):
+        timer = StageTimer(items)
+        start = time.perf_counter()
+        try:
+            yield timer
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                totals = self.stages[name]
+                totals['seconds'] += elapsed
+                totals['calls'] += 1
+                totals['items'] += timer.items
+
+    def add_bytes(self, count):
+        with self.lock:
+            self.bytes_downloaded += count
+
+    @contextmanager
+    def count_queries(self):
+        """Count SQL statements run on this thread's connection."""
+        def count(execute, sql, params, many, context):
+            self.db_statements += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count):
+            yield
+
+    def finish(self):
+        self.finished = time.perf_counter()
+
+    @property
+    def wall_seconds(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    def as_dict(self):
+        """JSON-serialisable summary."""
+        stages = {}
+        for name, totals in self.stages.items():
+            seconds = totals['seconds']
+            stages[name] = {
+                'seconds': round(seconds, 4),
+                'calls': totals['calls'],
+                'items': totals['items'],
+                'items_per_second': (
+                    round(totals['items'] / seconds, 1) if seconds else None
+                ),
+            }
+        return {
+            'wall_seconds': round(self.wall_seconds, 4),
+            'bytes_downloaded': self.bytes_downloaded,
+            'db_statements': self.db_statements,
+            'stages': stages,
+        }
+
+    def log(self, logger):
+        summary = self.as_dict()
+        logger.info(
+            'Import timing: %.2fs wall, %s bytes downloaded, %s DB statements',
+            summary['wall_seconds'], summary['bytes_downloaded'],
+            summary['db_statements'],
+        )
+        for name, stage in summary['stages'].items():
+            logger.info(
+                'Stage %s: %.3fs, %d items, %s items/s',
+                name, stage['seconds'], stage['items'],
+                stage['items_per_second'] or '-',
+            )
+        logger.info('OBF import summary: %s', json.dumps(summary))
+        return summary
@@ -0,0 +1,174 @@
+import csv
+import json
+import random
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from products.classifier import CategoryClassifier
+from products.obf_dump import detect_format, open_dump
+
+LEGACY_RULES = [
+    ('cleanser', ['cleanser', 'cleansing', 'face wash', 'gel cleanser']),
+    ('toner', ['toner', 'tonic']),
+    ('serum', ['serum']),
+    ('moisturizer', ['moisturizer', 'moisturiser', 'cream', 'lotion',
+                     'face cream']),
+    ('sunscreen', ['sunscreen', 'sun protection', 'spf']),
+    ('exfoliant', ['exfoliant', 'scrub', 'peeling']),
+    ('mask', ['mask', 'face mask']),
+    ('eye_cream', ['eye cream', 'eye care']),
+    ('oil', ['oil', 'face oil']),
+    ('essence', ['essence']),
+    ('spot_treatment', ['spot treatment', 'acne treatment']),
+    ('retinol', ['retinol', 'retinoid']),
+    ('vitamin_c', ['vitamin c', 'vitamin-c']),
+]
+
+SYNTHETIC_CATEGORIES = [
+    'Skin care, Face care, Face creams, Moisturizers',
+    'en:beauty,en:skin-care,en:eye-creams',
+    'Cosmetics, Cleansers, Face wash',
+    'Hair care, Shampoos',
+    'Sun protection, Sunscreens, SPF 50',
+    'Face masks, Peeling',
+    'Serums, Vitamin C serums',
+    'Body care, Body lotions',
+    'Make-up, Lipsticks',
+    'Oil-free moisturizer',
+]
+
+
+def legacy_map_category(categories):
+    """The substring checks map_category_to_product_type used to run."""
+    if not categories:
+        return 'other'
+    categories_lower = categories.lower()
+    for product_type, words in LEGACY_RULES:
+        if any(word in categories_lower for word in words):
+            return product_type
+    return 'other'
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the compiled category classifier against the old '
+        'substring checks, on a dump file or synthetic data'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            nargs='?',
+            help='Open Beauty Facts dump (JSONL or CSV, optionally gzipped)'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=500000,
+            help='Maximum records to read (default: 500000)'
+        )
+        parser.add_argument(
+            '--examples',
+            type=int,
+            default=10,
+            help='Disagreements to print (default: 10)'
+        )
+
+    def handle(self, *args, **options):
+        if options['path']:
+            categories = self.read_categories(
+                options['path'], options['limit']
+            )
+        else:
+            rng = random.Random(0)
+            categories = [
+                rng.choice(SYNTHETIC_CATEGORIES)
+                for _ in range(options['limit'])
+            ]
+        if not categories:
+            raise CommandError('No records found.')
+
+        start = time.perf_counter()
+        legacy = [legacy_map_category(c) for c in categories]
+        legacy_time = time.perf_counter() - start
+
+        # A fresh classifier so the per-string cache starts empty.
+        classifier = CategoryClassifier()
+        start = time.perf_counter()
+        results = classifier.classify_batch(categories)
+        batch_time = time.perf_counter() - start
+
+        classifier = CategoryClassifier()
+        start = time.perf_counter()
+        for c in categories:
+            classifier._classify(c)
+        uncached_time = time.perf_counter() - start
+
+        n = len(categories)
+        self.stdout.write(
+            f'{n} records, {len(set(categories))} distinct category strings'
+        )
+        for label, elapsed in (
+            ('substring checks', legacy_time),
+            ('regex, per record', uncached_time),
+            ('regex, batch', batch_time),
+        ):
+            self.stdout.write(
+                f'  {label:<18} {elapsed * 1000:9.1f} ms  '
+                f'{n / elapsed:12,.0f} records/s'
+            )
+
+        hits = Counter(
+            'no match' if r.rule is None else
+            f'{r.product_type} (rule {r.rule})'
+            for r in results
+        )
+        self.stdout.write('Rule hits:')
+        for rule, count in hits.most_common():
+            self.stdout.write(f'  {rule:<28} {count}')
+
+        changed = [
+            (c, old, new.product_type, new.matched)
+            for c, old, new in zip(categories, legacy, results)
+            if old != new.product_type
+        ]
+        self.stdout.write(f'{len(changed)} records classified differently:')
+        shown = set()
+        for c, old, new, matched in changed:
+            if c in shown:
+                continue
+            shown.add(c)
+            self.stdout.write(f'  {c[:70]!r}: {old} -> {new} ({matched!r})')
+            if len(shown) >= options['examples']:
+                break
+
+    @staticmethod
+    def read_categories(path, limit):
+        fmt = detect_format(path)
+        if fmt is None:
+            raise CommandError(f'Unsupported dump format for {path}')
+        categories = []
+        with open_dump(path) as fh:
+            if fmt == 'csv':
+                header = fh.readline().decode('utf-8').rstrip('\r\n')
+                column = header.split('\t').index('categories')
+            for line in fh:
+                text = line.decode('utf-8', errors='replace')
+                if fmt == 'jsonl':
+                    try:
+                        raw = json.loads(text)
+                    except ValueError:
+                        continue
+                    value = raw.get('categories') if isinstance(raw, dict) else None
+                else:
+                    values = next(csv.reader(
+                        [text.rstrip('\r\n')], delimiter='\t',
+                        quoting=csv.QUOTE_NONE,
+                    ))
+                    value = values[column] if column < len(values) else ''
+                categories.append(value or '')
+                if len(categories) >= limit:
+                    break
+        return categories
@@ -0,0 +1,97 @@
+import logging
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from products.catalog import resolve as resolve_catalog
+from products.models import Product
+from products.openbeautyfacts import save_products_to_database
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the bulk Open Beauty Facts save stage against saving one '
+        'product at a time. Test data is created inside a transaction and '
+        'rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            nargs='+',
+            default=[1000],
+            help='Products per run (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        for rows in options['rows']:
+            products = [
+                {
+                    'name': f'Benchmark Product {i}',
+                    'brand': f'Brand {i % 50}',
+                    'product_type': 'moisturizer',
+                    'ingredients': 'Aqua, Glycerin, Niacinamide',
+                    'description': 'Face cream',
+                    'external_id': f'benchmark-{i}',
+                }
+                for i in range(rows)
+            ]
+            for label, save in (
+                ('one by one', self.save_one_by_one),
+                ('bulk', save_products_to_database),
+            ):
+                with transaction.atomic():
+                    user = User.objects.create_user(
+                        username='benchmark-obf-save'
+                    )
+                    # First run creates every product, the second updates.
+                    for phase in ('create', 'overwrite'):
+                        elapsed, queries = self.measure(
+                            save, products, user
+                        )
+                        self.stdout.write(
+                            f'{rows:>6} rows  {label:<10}  {phase:<9}  '
+                            f'{elapsed * 1000:8.1f} ms  {queries:>6} queries'
+                        )
+                    transaction.set_rollback(True)
+
+    @staticmethod
+    def measure(save, products, user):
+        queries = 0
+
+        def count_queries(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        # Keep the per-batch log lines out of the table.
+        logging.disable(logging.INFO)
+        try:
+            with connection.execute_wrapper(count_queries):
+                start = time.perf_counter()
+                save(products, user, overwrite=True)
+                elapsed = time.perf_counter() - start
+        finally:
+            logging.disable(logging.NOTSET)
+        return elapsed, queries
+
+    @staticmethod
+    def save_one_by_one(products, user, overwrite=False):
+        """The previous save stage: a lookup plus a save per product."""
+        catalog_rows = resolve_catalog(products)
+        for pdata, catalog_product in zip(products, catalog_rows):
+            existing = Product.objects.filter(
+                user=user, name=pdata['name'], brand=pdata['brand'],
+            ).first()
+            if existing:
+                for key, value in pdata.items():
+                    setattr(existing, key, value)
+                existing.catalog_product = catalog_product
+                existing.save()
+            else:
+                Product.objects.create(
+                    user=user, catalog_product=catalog_product, **pdata
+                )
@@ -0,0 +1,90 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from products.models import Product
+from products.serializers import (
+    ProductSerializer,
+    dumps_json,
+    product_rows,
+    resolve_fields,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare ProductSerializer against the fast .values() list path. '
+        'Test data is created inside a transaction and rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            nargs='+',
+            default=[1000, 10000],
+            help='Row counts to benchmark (default: 1000 10000)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Runs per measurement, best time is reported (default: 3)'
+        )
+
+    def handle(self, *args, **options):
+        for rows in options['rows']:
+            with transaction.atomic():
+                self.run_case(rows, options['repeat'])
+                transaction.set_rollback(True)
+
+    def run_case(self, rows, repeat):
+        user = User.objects.create_user(username='benchmark-product-list')
+        types = [choice for choice, _ in Product.PRODUCT_TYPE_CHOICES]
+        Product.objects.bulk_create(
+            [
+                Product(
+                    user=user,
+                    name=f'Product {i}',
+                    brand=f'Brand {i % 50}',
+                    product_type=types[i % len(types)],
+                    ingredients='Aqua, Glycerin, Niacinamide',
+                    rating=(i % 5) + 1,
+                )
+                for i in range(rows)
+            ],
+            batch_size=1000,
+        )
+        queryset = Product.objects.filter(user=user)
+        renderer = JSONRenderer()
+
+        def drf():
+            data = ProductSerializer(queryset.all(), many=True).data
+            return renderer.render(data)
+
+        def fast():
+            fields = resolve_fields(None)
+            return dumps_json(
+                list(product_rows(queryset.all(), fields, str(user)))
+            )
+
+        drf_time = self.best_of(drf, repeat)
+        fast_time = self.best_of(fast, repeat)
+        self.stdout.write(
+            f'{rows:>7} rows  serializer: {drf_time * 1000:8.1f} ms  '
+            f'fast path: {fast_time * 1000:8.1f} ms  '
+            f'speedup: {drf_time / fast_time:5.1f}x'
+        )
+
+    @staticmethod
+    def best_of(func, repeat):
+        best = None
+        for _ in range(max(repeat, 1)):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from products import asset_bundles
+
+
+class Command(BaseCommand):
+    help = (
+        'Build the per-page JS/CSS bundles: minified, content-hashed and '
+        'precompressed (gzip and brotli)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keep-stale',
+            action='store_true',
+            help='Keep previously built bundles that the new manifest no '
+                 'longer references (default: delete them)'
+        )
+
+    def handle(self, *args, **options):
+        for module, package in (
+            ('rjsmin', 'rjsmin'), ('rcssmin', 'rcssmin'), ('brotli', 'Brotli'),
+        ):
+            try:
+                __import__(module)
+            except ImportError:
+                raise CommandError(f'{package} is required: pip install {package}')
+
+        manifest = {}
+        for kind, bundles in asset_bundles.BUNDLES.items():
+            manifest[kind] = {}
+            for name in bundles:
+                try:
+                    entry = asset_bundles.build_bundle(kind, name)
+                except OSError as exc:
+                    raise CommandError(f'Could not build {kind} bundle {name}: {exc}')
+                manifest[kind][name] = entry
+                self.stdout.write(
+                    f"{entry['path']}: {entry['source_bytes']} -> "
+                    f"{entry['bytes']} bytes ({entry['gzip_bytes']} gzip, "
+                    f"{entry['br_bytes']} br)"
+                )
+
+        asset_bundles.write_manifest(manifest)
+        if not options['keep_stale']:
+            for path in asset_bundles.remove_stale(manifest):
+                self.stdout.write(f'Removed {path}')
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Wrote manifest to {asset_bundles.manifest_path()}'
+            )
+        )
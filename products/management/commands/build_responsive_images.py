@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from products import responsive_images
+
+
+class Command(BaseCommand):
+    help = 'Generate AVIF/WebP variants of static images at several widths'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths',
+            nargs='*',
+            help='Static paths to process, e.g. images/hero/hero.webp '
+                 '(default: everything under static/images)'
+        )
+        parser.add_argument(
+            '--widths',
+            type=str,
+            default=','.join(str(w) for w in responsive_images.WIDTHS),
+            help='Comma-separated target widths in pixels'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Rebuild variants even if the source image is unchanged'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            import PIL  # noqa: F401
+        except ImportError:
+            raise CommandError('Pillow is required: pip install Pillow')
+
+        try:
+            widths = tuple(sorted(
+                int(w) for w in options['widths'].split(',') if w.strip()
+            ))
+        except ValueError:
+            raise CommandError('--widths must be a comma-separated list of integers.')
+        if not widths:
+            raise CommandError('--widths must list at least one width.')
+
+        paths = options['paths'] or list(responsive_images.find_sources())
+        old_manifest = responsive_images.load_manifest()
+        # Rebuilding everything drops entries for deleted sources.
+        manifest = dict(old_manifest) if options['paths'] else {}
+
+        for path in paths:
+            try:
+                entry, built = responsive_images.build_image(
+                    path,
+                    widths=widths,
+                    force=options['force'],
+                    manifest=old_manifest,
+                )
+            except OSError as exc:
+                raise CommandError(f'Could not process {path}: {exc}')
+            manifest[path] = entry
+            status = 'built' if built else 'unchanged'
+            count = sum(len(v) for v in entry['variants'].values())
+            self.stdout.write(
+                f"{path} ({entry['width']}x{entry['height']}): "
+                f"{status}, {count} variants"
+            )
+
+        responsive_images.write_manifest(manifest)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Wrote manifest for {len(manifest)} images to '
+                f'{responsive_images.manifest_path()}'
+            )
+        )
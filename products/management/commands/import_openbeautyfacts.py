@@ -1,17 +1,29 @@
+import cProfile
+import io
+import json
+import pstats
+
 from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth.models import User
-from products.openbeautyfacts import import_openbeautyfacts_products
+from products.openbeautyfacts import (
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_RATE,
+    DEFAULT_WORKERS,
+    MAX_PAGE_SIZE,
+    import_openbeautyfacts_products,
+)
 
 
 class Command(BaseCommand):
     help = 'Import skincare products from Open Beauty Facts API'
 
     def add_arguments(self, parser):
-        # Required category argument
+        # Required category arguments
         parser.add_argument(
-            'category',
+            'categories',
+            nargs='+',
             type=str,
-            help='Product category to import (e.g., moisturizer, cleanser, sunscreen)'
+            help='Product categories to import (e.g., moisturizer cleanser sunscreen)'
         )
         
         # Optional arguments
@@ -26,7 +38,28 @@ class Command(BaseCommand):
             '--limit',
             type=int,
             default=10,
-            help='Maximum number of products to import (default: 10)'
+            help='Maximum number of products to import per category (default: 10)'
+        )
+
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            default=DEFAULT_PAGE_SIZE,
+            help=f'Results requested per page, up to {MAX_PAGE_SIZE} (default: {DEFAULT_PAGE_SIZE})'
+        )
+
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=DEFAULT_WORKERS,
+            help=f'Pages fetched concurrently (default: {DEFAULT_WORKERS})'
+        )
+
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=DEFAULT_RATE,
+            help=f'Maximum requests per minute (default: {DEFAULT_RATE})'
         )
         
         parser.add_argument(
@@ -35,26 +68,82 @@ class Command(BaseCommand):
             help='Update existing products instead of skipping them'
         )
 
+        cache = parser.add_mutually_exclusive_group()
+        cache.add_argument(
+            '--offline',
+            dest='cache_mode',
+            action='store_const',
+            const='offline',
+            default='default',
+            help='Only use cached responses; never contact Open Beauty Facts'
+        )
+        cache.add_argument(
+            '--refresh',
+            dest='cache_mode',
+            action='store_const',
+            const='refresh',
+            help='Download every page again and update the cache'
+        )
+        cache.add_argument(
+            '--no-cache',
+            dest='cache_mode',
+            action='store_const',
+            const='off',
+            help='Neither read nor write the response cache'
+        )
+
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Fetch, classify and parse products without saving them'
+        )
+
+        parser.add_argument(
+            '--profile',
+            action='store_true',
+            help='Run under cProfile and print the slowest functions '
+                 '(fetch threads are timed, not profiled)'
+        )
+
+        parser.add_argument(
+            '--summary',
+            type=str,
+            metavar='FILE',
+            help='Write the per-stage timing summary as JSON to FILE ("-" for stdout)'
+        )
+
+        parser.add_argument(
+            '--cache-ttl',
+            type=int,
+            default=None,
+            help='Seconds a cached response is used before revalidating it '
+                 '(default: OPENBEAUTYFACTS_CACHE_TTL, 1 day)'
+        )
+
     def handle(self, *args, **options):
-        category = options['category']
+        categories = options['categories']
         username = options['user']
         limit = options['limit']
         overwrite = options['overwrite']
+        dry_run = options['dry_run']
         
         # Get or create user
         try:
             user = User.objects.get(username=username)
             self.stdout.write(f"✅ Using existing user: {username}")
         except User.DoesNotExist:
-            # Create a basic user for demo purposes
-            user = User.objects.create_user(
-                username=username,
-                email=f"{username}@example.com",
-                password='defaultpassword123'
-            )
-            self.stdout.write(
-                self.style.WARNING(f"⚠️  Created new user: {username} (password: defaultpassword123)")
-            )
+            if dry_run:
+                user = None
+            else:
+                # Create a basic user for demo purposes
+                user = User.objects.create_user(
+                    username=username,
+                    email=f"{username}@example.com",
+                    password='defaultpassword123'
+                )
+                self.stdout.write(
+                    self.style.WARNING(f"⚠️  Created new user: {username} (password: defaultpassword123)")
+                )
         
         # Validate category
         valid_categories = [
@@ -63,23 +152,42 @@ class Command(BaseCommand):
             'spot treatment', 'retinol', 'vitamin c'
         ]
         
-        if category.lower() not in [cat.lower() for cat in valid_categories]:
-            self.stdout.write(
-                self.style.WARNING(f"⚠️  '{category}' is not a standard category, but we'll try anyway!")
-            )
+        for category in categories:
+            if category.lower() not in [cat.lower() for cat in valid_categories]:
+                self.stdout.write(
+                    self.style.WARNING(f"⚠️  '{category}' is not a standard category, but we'll try anyway!")
+                )
         
         # Start import process
-        self.stdout.write(f"🚀 Starting import of '{category}' products...")
-        self.stdout.write(f"📊 Settings: limit={limit}, user={username}, overwrite={overwrite}")
+        self.stdout.write(f"🚀 Starting import of {', '.join(categories)} products...")
+        self.stdout.write(
+            f"📊 Settings: limit={limit}, user={username}, overwrite={overwrite}, "
+            f"workers={options['workers']}, rate={options['rate']}/min, "
+            f"cache={options['cache_mode']}, dry_run={dry_run}"
+        )
         
+        profiler = cProfile.Profile() if options['profile'] else None
         try:
             # Import products
+            if profiler:
+                profiler.enable()
             results = import_openbeautyfacts_products(
-                category=category,
+                categories=categories,
                 user=user,
                 limit=limit,
-                overwrite=overwrite
+                overwrite=overwrite,
+                page_size=options['page_size'],
+                workers=max(1, options['workers']),
+                rate=options['rate'],
+                cache_mode=options['cache_mode'],
+                cache_ttl=options['cache_ttl'],
+                dry_run=dry_run,
             )
+            if profiler:
+                profiler.disable()
+                self.print_profile(profiler)
+            if options['summary']:
+                self.write_summary(options['summary'], results)
             
             if 'error' in results:
                 raise CommandError(f"❌ Import failed: {results['error']}")
@@ -89,15 +197,42 @@ class Command(BaseCommand):
             self.stdout.write(self.style.SUCCESS("🎉 IMPORT COMPLETED SUCCESSFULLY!"))
             self.stdout.write("="*50)
             self.stdout.write(f"📊 RESULTS:")
+            if dry_run:
+                self.stdout.write(f"   🧪 Dry run: {results['fetched']} products fetched, nothing saved")
             self.stdout.write(f"   ✅ Created: {results['created']} new products")
             self.stdout.write(f"   ✏️  Updated: {results['updated']} existing products") 
             self.stdout.write(f"   ⏭️  Skipped: {results['skipped']} products")
+            self.stdout.write(
+                "   🗄️  Cache: {hits} hits, {revalidated} revalidated, "
+                "{misses} misses".format(**results['cache'])
+            )
             self.stdout.write("\n💡 TIP: You can now view these products in your app or via the API!")
             self.stdout.write(f"🔗 Try: GET /api/products/api/ to see all products for {username}")
             
         except Exception as e:
             raise CommandError(f"❌ Import failed with error: {str(e)}")
 
+    def print_profile(self, profiler, limit=25):
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(limit)
+        self.stdout.write(out.getvalue())
+
+    def write_summary(self, path, results):
+        summary = json.dumps({
+            'fetched': results.get('fetched', 0),
+            'created': results.get('created', 0),
+            'updated': results.get('updated', 0),
+            'skipped': results.get('skipped', 0),
+            'cache': results.get('cache'),
+            **results['stats'],
+        }, indent=2)
+        if path == '-':
+            self.stdout.write(summary)
+        else:
+            with open(path, 'w', encoding='utf-8') as fh:
+                fh.write(summary + '\n')
+            self.stdout.write(f"📝 Timing summary written to {path}")
+
 
 # Example usage displayed when someone runs --help
 """
@@ -109,12 +244,21 @@ Basic import:
 Import more products:
   python manage.py import_openbeautyfacts "vitamin c serum" --limit 20
 
+Import several categories at once (fetched concurrently):
+  python manage.py import_openbeautyfacts cleanser toner serum --limit 100
+
 Import for specific user:
   python manage.py import_openbeautyfacts cleanser --user myusername
 
 Update existing products:
   python manage.py import_openbeautyfacts sunscreen --overwrite
 
+See where an import spends its time without saving anything:
+  python manage.py import_openbeautyfacts serum --limit 200 --dry-run --profile --summary stats.json
+
+Re-import from cached responses only (no network):
+  python manage.py import_openbeautyfacts cleanser toner --offline
+
 Popular categories to try:
   - moisturizer
   - cleanser  
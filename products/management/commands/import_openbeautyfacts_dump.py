@@ -0,0 +1,80 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from products.obf_dump import (
+    DEFAULT_BATCH_SIZE,
+    DUMP_FORMATS,
+    checkpoint_path,
+    import_dump,
+)
+
+
+class Command(BaseCommand):
+    help = 'Import skincare products from a local Open Beauty Facts dump (JSONL or CSV, optionally gzipped) into the shared catalog'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            type=str,
+            help='Dump file, e.g. openbeautyfacts-products.jsonl.gz'
+        )
+        parser.add_argument(
+            '--format',
+            choices=DUMP_FORMATS,
+            help='Dump format (default: guessed from the file name)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Records per upsert and checkpoint (default: {DEFAULT_BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=0,
+            help='Parse chunks in this many worker processes (default: parse inline)'
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Continue from the last checkpoint instead of the start of the file'
+        )
+        parser.add_argument(
+            '--checkpoint',
+            type=str,
+            help='Checkpoint file (default: <path>.checkpoint.json)'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.isfile(path):
+            raise CommandError(f'Dump file "{path}" does not exist.')
+        checkpoint = options['checkpoint'] or checkpoint_path(path)
+
+        def progress(totals):
+            self.stdout.write(
+                f"📦 {totals['records']} records read, "
+                f"{totals['imported']} imported, {totals['skipped']} skipped "
+                f"(offset {totals['offset']})"
+            )
+
+        try:
+            totals = import_dump(
+                path,
+                fmt=options['format'],
+                batch_size=max(1, options['batch_size']),
+                processes=max(0, options['processes']),
+                resume=options['resume'],
+                checkpoint=checkpoint,
+                progress=progress if options['verbosity'] > 1 else None,
+            )
+        except (OSError, ValueError) as e:
+            raise CommandError(f'❌ Import failed: {e}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"🎉 Imported {totals['imported']} catalog products "
+            f"({totals['records']} records read, {totals['skipped']} skipped)"
+        ))
+        self.stdout.write(f'Checkpoint: {checkpoint}')
@@ -0,0 +1,35 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from products.expiry import BATCH_SIZE, send_due_alerts
+
+
+class Command(BaseCommand):
+    help = 'Create in-app alerts for products nearing expiry (run daily)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--date',
+            type=str,
+            help='Treat this day (YYYY-MM-DD) as today (default: today)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help=f'Products processed per batch (default: {BATCH_SIZE})'
+        )
+
+    def handle(self, *args, **options):
+        today = None
+        if options['date']:
+            try:
+                today = date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError('--date must be in YYYY-MM-DD format.')
+
+        created = send_due_alerts(today, batch_size=options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Created {created} expiry alerts')
+        )
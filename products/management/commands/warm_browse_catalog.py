@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from products import browse_catalog
+
+
+class Command(BaseCommand):
+    help = 'Precompute and cache the public browse-by-category product lists'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'categories',
+            nargs='*',
+            help='Categories to warm (default: all product types)'
+        )
+
+    def handle(self, *args, **options):
+        categories = options['categories'] or browse_catalog.CATEGORIES
+        browse_catalog.warm(categories)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Cached browse catalog for {len(categories)} categories.'
+            )
+        )
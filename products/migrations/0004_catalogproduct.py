@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-19 11:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0003_remove_image_field'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogProduct',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('brand', models.CharField(max_length=100)),
+                ('product_type', models.CharField(blank=True, max_length=20)),
+                ('ingredients', models.TextField(blank=True, null=True)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('external_id', models.CharField(blank=True, help_text='External ID from Open Beauty Facts', max_length=100, null=True, unique=True)),
+                ('normalized_key', models.CharField(db_index=True, max_length=301)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['brand', 'name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='catalog_product',
+            field=models.ForeignKey(blank=True, help_text='Shared catalog entry this product comes from', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='user_products', to='products.catalogproduct'),
+        ),
+    ]
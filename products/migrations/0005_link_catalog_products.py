@@ -0,0 +1,142 @@
+"""Move shared product data into CatalogProduct, in batches.
+
+Products that came from Open Beauty Facts or the API (they carry an
+external id or a description, which the product form can't set) are
+matched to a catalog entry by external id or normalized brand/name.
+Their own ingredients/description are cleared when they match the
+catalog's copy. Products typed in by hand are left alone.
+
+The matching rules are copied here as they were when this migration was
+written, so later changes to ``products.catalog`` don't change what it
+does.
+"""
+from django.db import migrations
+from django.db.models import Q
+
+BATCH_SIZE = 1000
+
+CATALOG_FIELDS = (
+    'name', 'brand', 'product_type', 'ingredients', 'description',
+    'external_id',
+)
+
+
+def catalog_key(brand, name):
+    def normalize(value):
+        return ' '.join((value or '').casefold().split())
+
+    return '{}|{}'.format(normalize(brand), normalize(name))
+
+
+def resolve(CatalogProduct, entries):
+    """Return a catalog entry for each dict, creating the missing ones."""
+    keys = [catalog_key(e['brand'], e['name']) for e in entries]
+    external_ids = {e['external_id'] for e in entries} - {None, ''}
+
+    by_external = {
+        c.external_id: c
+        for c in CatalogProduct.objects.filter(external_id__in=external_ids)
+    }
+    by_key = {}
+    for c in CatalogProduct.objects.filter(
+        normalized_key__in=set(keys)
+    ).order_by('pk'):
+        by_key.setdefault(c.normalized_key, c)
+
+    results = []
+    to_create = {}
+    for entry, key in zip(entries, keys):
+        ext = entry['external_id'] or None
+        match = by_external.get(ext) if ext else None
+        if match is None:
+            match = by_key.get(key)
+        if match is None:
+            new_key = ext or key
+            match = to_create.get(new_key)
+            if match is None:
+                match = CatalogProduct(
+                    normalized_key=key,
+                    **{f: entry[f] or None for f in CATALOG_FIELDS},
+                )
+                if match.product_type is None:
+                    match.product_type = ''
+                to_create[new_key] = match
+                by_key.setdefault(key, match)
+        results.append(match)
+
+    CatalogProduct.objects.bulk_create(list(to_create.values()))
+    return results
+
+
+def link_products(apps, schema_editor):
+    Product = apps.get_model('products', 'Product')
+    CatalogProduct = apps.get_model('products', 'CatalogProduct')
+
+    candidates = Product.objects.filter(catalog_product__isnull=True).filter(
+        Q(external_id__gt='') | Q(description__gt='')
+    ).order_by('pk')
+
+    last_pk = 0
+    while True:
+        batch = list(candidates.filter(pk__gt=last_pk)[:BATCH_SIZE])
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+
+        entries = [
+            {
+                'name': p.name,
+                'brand': p.brand,
+                'product_type': p.product_type,
+                'ingredients': p.ingredients,
+                'description': p.description,
+                'external_id': p.external_id,
+            }
+            for p in batch
+        ]
+        catalog_rows = resolve(CatalogProduct, entries)
+
+        for product, catalog in zip(batch, catalog_rows):
+            product.catalog_product_id = catalog.pk
+            if product.ingredients == catalog.ingredients:
+                product.ingredients = None
+            if product.description == catalog.description:
+                product.description = None
+        Product.objects.bulk_update(
+            batch, ['catalog_product', 'ingredients', 'description']
+        )
+
+
+def unlink_products(apps, schema_editor):
+    Product = apps.get_model('products', 'Product')
+
+    linked = Product.objects.filter(
+        catalog_product__isnull=False
+    ).select_related('catalog_product').order_by('pk')
+
+    last_pk = 0
+    while True:
+        batch = list(linked.filter(pk__gt=last_pk)[:BATCH_SIZE])
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+
+        for product in batch:
+            catalog = product.catalog_product
+            product.ingredients = product.ingredients or catalog.ingredients
+            product.description = product.description or catalog.description
+            product.catalog_product = None
+        Product.objects.bulk_update(
+            batch, ['catalog_product', 'ingredients', 'description']
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0004_catalogproduct'),
+    ]
+
+    operations = [
+        migrations.RunPython(link_products, unlink_products),
+    ]
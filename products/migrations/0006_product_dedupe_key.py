@@ -0,0 +1,58 @@
+# Generated by Django 5.2.6 on 2026-10-19 11:49
+
+import re
+
+from django.conf import settings
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def dedupe_key(brand, name):
+    # Frozen copy of products.models.dedupe_key as of this migration.
+    def normalize(value):
+        return re.sub(r'[\W_]+', '', (value or '').casefold())
+
+    brand = normalize(brand)
+    name = normalize(name)
+    if brand and name.startswith(brand) and len(name) > len(brand):
+        name = name[len(brand):]
+    return '{}:{}'.format(brand, name[:4])
+
+
+def fill_dedupe_keys(apps, schema_editor):
+    Product = apps.get_model('products', 'Product')
+    last_pk = 0
+    while True:
+        batch = list(
+            Product.objects.filter(pk__gt=last_pk)
+            .order_by('pk')
+            .only('pk', 'name', 'brand')[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+        for product in batch:
+            product.dedupe_key = dedupe_key(product.brand, product.name)
+        Product.objects.bulk_update(batch, ['dedupe_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0005_link_catalog_products'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='dedupe_key',
+            field=models.CharField(blank=True, editable=False, max_length=110),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['user', 'dedupe_key'], name='products_pr_user_id_e42336_idx'),
+        ),
+        migrations.RunPython(fill_dedupe_keys, migrations.RunPython.noop),
+    ]
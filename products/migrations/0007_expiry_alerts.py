@@ -0,0 +1,87 @@
+# Generated by Django 5.2.6 on 2026-10-19 11:51
+
+import datetime
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+EXPIRY_ALERT_DAYS = (90, 30, 0)
+
+
+def expiry_alert_schedule(expiry_date, today):
+    # Frozen copy of products.models.expiry_alert_schedule as of this
+    # migration (no alerts have been sent yet, so there's no ``after``).
+    if expiry_date is None or expiry_date < today:
+        return None, None
+    crossed = [
+        d for d in EXPIRY_ALERT_DAYS
+        if expiry_date - datetime.timedelta(days=d) <= today
+    ]
+    if crossed:
+        return today, min(crossed)
+    days = EXPIRY_ALERT_DAYS[0]
+    return expiry_date - datetime.timedelta(days=days), days
+
+
+def schedule_alerts(apps, schema_editor):
+    """Schedule the next alert for products that haven't expired yet."""
+    Product = apps.get_model('products', 'Product')
+    today = datetime.date.today()
+    pending = Product.objects.filter(expiry_date__gte=today).order_by('pk')
+    last_pk = 0
+    while True:
+        batch = list(
+            pending.filter(pk__gt=last_pk)
+            .only('pk', 'expiry_date')[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+        for product in batch:
+            product.expiry_alert_on, product.expiry_alert_days = (
+                expiry_alert_schedule(product.expiry_date, today)
+            )
+        Product.objects.bulk_update(
+            batch, ['expiry_alert_on', 'expiry_alert_days']
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0006_product_dedupe_key'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='expiry_alert_days',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='expiry_alert_on',
+            field=models.DateField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name='ExpiryAlert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('days_before', models.PositiveSmallIntegerField(help_text='Threshold this alert is for (90, 30 or 0 days)')),
+                ('expiry_date', models.DateField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('read_at', models.DateTimeField(blank=True, null=True)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='expiry_alerts', to='products.product')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='expiry_alerts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['user', 'read_at'], name='products_ex_user_id_84c573_idx')],
+                'constraints': [models.UniqueConstraint(fields=('product', 'expiry_date', 'days_before'), name='unique_expiry_alert')],
+            },
+        ),
+        migrations.RunPython(schedule_alerts, migrations.RunPython.noop),
+    ]
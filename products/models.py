@@ -1,10 +1,111 @@
+import re
+from datetime import date, timedelta
+
 from django.db import models
 from django.contrib.auth.models import User
 from django.urls import reverse
 
 
+def normalize_text(value):
+    """Casefold and collapse whitespace: ' CeraVe  ' -> 'cerave'."""
+    return ' '.join((value or '').casefold().split())
+
+
+def catalog_key(brand, name):
+    """Key used to match the same product across users."""
+    return '{}|{}'.format(normalize_text(brand), normalize_text(name))
+
+
+def dedupe_key(brand, name):
+    """Blocking key for fuzzy duplicate detection.
+
+    Brand letters/digits plus the first few of the name (with a repeated
+    brand prefix dropped), so "CeraVe - Hydrating Cleanser" and
+    "Cerave hydrating cleanser " land in the same block.
+    """
+    brand = re.sub(r'[\W_]+', '', normalize_text(brand))
+    name = re.sub(r'[\W_]+', '', normalize_text(name))
+    if brand and name.startswith(brand) and len(name) > len(brand):
+        name = name[len(brand):]
+    return '{}:{}'.format(brand, name[:4])
+
+
+# Days before expiry at which the user gets an alert, earliest first.
+EXPIRY_ALERT_DAYS = (90, 30, 0)
+
+
+def expiry_alert_schedule(expiry_date, today=None, after=None):
+    """Return ``(alert_on, days)`` for a product's next expiry alert.
+
+    ``days`` is the threshold the alert is for. If thresholds have already
+    been crossed, only the most urgent one is scheduled, for ``today``.
+    ``after`` skips thresholds at or above an alert already sent. Returns
+    ``(None, None)`` when nothing is left to send or the product has
+    already expired.
+    """
+    today = today or date.today()
+    if expiry_date is None or expiry_date < today:
+        return None, None
+    pending = [d for d in EXPIRY_ALERT_DAYS if after is None or d < after]
+    crossed = [d for d in pending if expiry_date - timedelta(days=d) <= today]
+    if crossed:
+        return today, min(crossed)
+    if pending:
+        days = pending[0]
+        return expiry_date - timedelta(days=days), days
+    return None, None
+
+
+def shared_value(own, catalog):
+    """Prefer a user's own text, then the catalog's."""
+    return own or catalog or own
+
+
+class CatalogProduct(models.Model):
+    """Shared product data, stored once and referenced by user products.
+
+    Open Beauty Facts imports and quick-adds for the same product point at
+    one catalog row instead of each copying its ingredients and
+    description. ``normalized_key`` is a case- and whitespace-insensitive
+    brand/name key used to match products without an ``external_id``.
+    """
+
+    name = models.CharField(max_length=200)
+    brand = models.CharField(max_length=100)
+    product_type = models.CharField(max_length=20, blank=True)
+    ingredients = models.TextField(blank=True, null=True)
+    description = models.TextField(blank=True, null=True)
+    external_id = models.CharField(
+        max_length=100,
+        unique=True,
+        blank=True,
+        null=True,
+        help_text="External ID from Open Beauty Facts",
+    )
+    normalized_key = models.CharField(max_length=301, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['brand', 'name']
+
+    def __str__(self):
+        return f"{self.brand} - {self.name}"
+
+    def save(self, *args, **kwargs):
+        self.normalized_key = catalog_key(self.brand, self.name)
+        if not self.external_id:
+            self.external_id = None
+        super().save(*args, **kwargs)
+
+
 class Product(models.Model):
-    """A skincare product that users can add to their collection."""
+    """A skincare product that users can add to their collection.
+
+    Products linked to a ``CatalogProduct`` leave ``ingredients`` and
+    ``description`` empty unless the user has their own version; use
+    ``get_ingredients()``/``get_description()`` to read the shared value.
+    """
 
     PRODUCT_TYPE_CHOICES = [
         ('cleanser', 'Cleanser'),
@@ -101,7 +202,26 @@ class Product(models.Model):
         help_text="Recommended skin type for this product",
     )
 
+    # Blocking key for duplicate detection, set on save
+    dedupe_key = models.CharField(max_length=110, blank=True, editable=False)
+
+    # Next expiry alert (see products.expiry), set when expiry_date changes
+    expiry_alert_on = models.DateField(
+        blank=True, null=True, db_index=True, editable=False
+    )
+    expiry_alert_days = models.PositiveSmallIntegerField(
+        blank=True, null=True, editable=False
+    )
+
     # Relationships and metadata
+    catalog_product = models.ForeignKey(
+        CatalogProduct,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='user_products',
+        help_text="Shared catalog entry this product comes from",
+    )
     user = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -114,6 +234,9 @@ class Product(models.Model):
     class Meta:
         ordering = ['brand', 'name']
         unique_together = ['user', 'name', 'brand']
+        indexes = [
+            models.Index(fields=['user', 'dedupe_key']),
+        ]
 
     def __str__(self):
         return f"{self.brand} - {self.name}"
@@ -124,3 +247,98 @@ class Product(models.Model):
     def get_product_type_display_badge(self):
         """Return product type in a format suitable for UI badges."""
         return self.get_product_type_display()
+
+    def get_ingredients(self):
+        """Own ingredients, falling back to the catalog entry's."""
+        if self.ingredients or not self.catalog_product_id:
+            return self.ingredients
+        return shared_value(self.ingredients, self.catalog_product.ingredients)
+
+    def get_description(self):
+        """Own description, falling back to the catalog entry's."""
+        if self.description or not self.catalog_product_id:
+            return self.description
+        return shared_value(
+            self.description, self.catalog_product.description
+        )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_expiry_date = instance.__dict__.get('expiry_date')
+        return instance
+
+    def schedule_expiry_alert(self, today=None):
+        """Reset the next expiry alert from ``expiry_date``."""
+        # Like any DateField, expiry_date may have been assigned a string
+        # such as '2026-11-01'; it's only converted when saved.
+        self.expiry_date = self._meta.get_field('expiry_date').to_python(
+            self.expiry_date
+        )
+        self.expiry_alert_on, self.expiry_alert_days = (
+            expiry_alert_schedule(self.expiry_date, today)
+        )
+
+    def save(self, *args, **kwargs):
+        self.dedupe_key = dedupe_key(self.brand, self.name)
+        self.expiry_date = self._meta.get_field('expiry_date').to_python(
+            self.expiry_date
+        )
+        if (self._state.adding
+                or self.expiry_date != getattr(
+                    self, '_loaded_expiry_date', None)):
+            self.schedule_expiry_alert()
+            self._loaded_expiry_date = self.expiry_date
+        # Don't keep a private copy of text the catalog already holds.
+        if self.catalog_product_id:
+            catalog = self.catalog_product
+            if self.ingredients and self.ingredients == catalog.ingredients:
+                self.ingredients = None
+            if self.description and self.description == catalog.description:
+                self.description = None
+        super().save(*args, **kwargs)
+
+
+class ExpiryAlert(models.Model):
+    """In-app notification that a product is close to (or at) expiry."""
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='expiry_alerts',
+    )
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        related_name='expiry_alerts',
+    )
+    days_before = models.PositiveSmallIntegerField(
+        help_text="Threshold this alert is for (90, 30 or 0 days)",
+    )
+    expiry_date = models.DateField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    read_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['product', 'expiry_date', 'days_before'],
+                name='unique_expiry_alert',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'read_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.product} expires {self.expiry_date}"
+
+    @property
+    def message(self):
+        if self.days_before == 0:
+            return f"{self.product.name} expires today."
+        return (
+            f"{self.product.name} expires in {self.days_before} days or less "
+            f"({self.expiry_date:%d %b %Y})."
+        )
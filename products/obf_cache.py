@@ -0,0 +1,156 @@
+"""Persistent cache of Open Beauty Facts API responses.
+
+Responses are stored in a small SQLite file keyed by the request URL and
+its sorted query parameters. Fresh entries (younger than the TTL) are
+served without touching the network; stale ones are revalidated with
+``If-None-Match``/``If-Modified-Since`` when the server sent an ETag or
+Last-Modified header. In ``offline`` mode only the cache is used.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlencode
+
+import requests
+from django.conf import settings
+
+MODES = ('default', 'refresh', 'offline', 'off')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    body BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL
+)
+"""
+
+
+class CacheMiss(requests.exceptions.RequestException):
+    """Raised in offline mode when a response isn't cached."""
+
+
+class ResponseCache:
+    """SQLite-backed response store, safe to share between threads."""
+
+    def __init__(self, path, ttl):
+        self.path = path
+        self.ttl = ttl
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0}
+
+    def _db(self):
+        db = getattr(self.local, 'db', None)
+        if db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=30)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute(SCHEMA)
+            self.local.db = db
+        return db
+
+    @staticmethod
+    def make_key(url, params):
+        query = urlencode(sorted((str(k), str(v)) for k, v in params.items()))
+        return hashlib.sha256(f'{url}?{query}'.encode()).hexdigest()
+
+    def get(self, key):
+        return self._db().execute(
+            'SELECT body, etag, last_modified, stored_at FROM responses '
+            'WHERE key = ?',
+            (key,),
+        ).fetchone()
+
+    def store(self, key, url, body, etag=None, last_modified=None):
+        db = self._db()
+        with db:
+            db.execute(
+                'INSERT OR REPLACE INTO responses '
+                '(key, url, body, etag, last_modified, stored_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (key, url, body, etag, last_modified, time.time()),
+            )
+
+    def touch(self, key):
+        db = self._db()
+        with db:
+            db.execute(
+                'UPDATE responses SET stored_at = ? WHERE key = ?',
+                (time.time(), key),
+            )
+
+    def count(self, stat):
+        with self.lock:
+            self.stats[stat] += 1
+
+    def summary(self):
+        return '{hits} hits, {revalidated} revalidated, {misses} misses'.format(
+            **self.stats
+        )
+
+    def get_body(self, session, url, params, timeout, mode='default',
+                 before_request=None):
+        """Return ``(body, downloaded)`` for a GET, from the cache if possible.
+
+        ``downloaded`` is the number of bytes fetched over the network (0
+        for hits and 304s). ``before_request`` is called before any network
+        request (used for rate limiting, which cache hits shouldn't count
+        against).
+        """
+        key = self.make_key(url, params)
+        entry = self.get(key) if mode in ('default', 'offline') else None
+
+        if entry is not None:
+            body, etag, last_modified, stored_at = entry
+            if mode == 'offline' or time.time() - stored_at < self.ttl:
+                self.count('hits')
+                return body, 0
+        elif mode == 'offline':
+            self.count('misses')
+            raise CacheMiss(f'Not cached (offline mode): {url} {params}')
+
+        headers = {}
+        if entry is not None:
+            if entry[1]:
+                headers['If-None-Match'] = entry[1]
+            if entry[2]:
+                headers['If-Modified-Since'] = entry[2]
+
+        if before_request:
+            before_request()
+        response = session.get(
+            url, params=params, headers=headers, timeout=timeout
+        )
+        if response.status_code == 304 and entry is not None:
+            self.touch(key)
+            self.count('revalidated')
+            return entry[0], 0
+        response.raise_for_status()
+
+        self.count('misses')
+        if mode != 'off':
+            self.store(
+                key, url, response.content,
+                response.headers.get('ETag'),
+                response.headers.get('Last-Modified'),
+            )
+        return response.content, len(response.content)
+
+
+def from_settings(ttl=None):
+    """A cache configured by the ``OPENBEAUTYFACTS_CACHE_*`` settings.
+
+    Each import makes its own instance so its hit/miss counts are its own;
+    they all share the same file.
+    """
+    return ResponseCache(
+        settings.OPENBEAUTYFACTS_CACHE_PATH,
+        settings.OPENBEAUTYFACTS_CACHE_TTL if ttl is None else ttl,
+    )
@@ -0,0 +1,247 @@
+"""Offline import of Open Beauty Facts data dumps into the shared catalog.
+
+Open Beauty Facts publishes full exports as JSONL
+(``openbeautyfacts-products.jsonl.gz``) and tab-separated CSV
+(``en.openbeautyfacts.org.products.csv``). ``import_dump()`` reads one
+line at a time (gzip or plain), keeps skincare records, maps them with
+``products.classifier`` and upserts them into ``CatalogProduct``
+on ``external_id`` in batches, so memory use doesn't grow with the file.
+
+After every batch the byte offset reached is written to a checkpoint file;
+a later run with ``resume=True`` continues from there. For gzip dumps the
+offset is into the decompressed stream, so resuming has to decompress
+(but not parse) everything before it.
+"""
+import csv
+import gzip
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import autocomplete
+from .models import CatalogProduct, catalog_key
+from .classifier import classify, classify_batch
+from .openbeautyfacts import parse_product
+
+DUMP_FORMATS = ('jsonl', 'csv')
+DEFAULT_BATCH_SIZE = 1000
+UPSERT_FIELDS = [
+    'name', 'brand', 'product_type', 'ingredients', 'description',
+    'normalized_key', 'updated_at',
+]
+# Category words that mark a record as skincare even when it doesn't map
+# to one of our product types.
+SKINCARE_TERMS = ('skin', 'face', 'facial')
+
+# The CSV export has very long fields (ingredients in many languages).
+csv.field_size_limit(sys.maxsize)
+
+
+def detect_format(path):
+    name = path.lower()
+    if name.endswith('.gz'):
+        name = name[:-3]
+    if name.endswith(('.jsonl', '.json', '.ndjson')):
+        return 'jsonl'
+    if name.endswith(('.csv', '.tsv')):
+        return 'csv'
+    return None
+
+
+def open_dump(path):
+    if path.lower().endswith('.gz'):
+        return gzip.open(path, 'rb')
+    return open(path, 'rb')
+
+
+def is_skincare(product_type, categories):
+    if product_type != 'other':
+        return True
+    categories = (categories or '').lower()
+    return any(term in categories for term in SKINCARE_TERMS)
+
+
+def parse_record(raw, product_type=None):
+    """Return a catalog entry dict for a skincare record, else ``None``."""
+    categories = raw.get('categories') or ''
+    product_type = product_type or classify(categories).product_type
+    if not is_skincare(product_type, categories):
+        return None
+    raw['_id'] = raw.get('_id') or raw.get('code') or ''
+    product = parse_product(raw, product_type)
+    if product is None or not product['external_id']:
+        return None
+    product['external_id'] = product['external_id'][:100]
+    return product
+
+
+def parse_chunk(lines, fmt, header=None):
+    """Parse raw dump lines; returns ``(products, skipped)``.
+
+    Runs in worker processes when ``import_dump`` is given ``processes``.
+    """
+    records = []
+    skipped = 0
+    for line in lines:
+        text = line.decode('utf-8', errors='replace').rstrip('\r\n')
+        if not text:
+            continue
+        if fmt == 'jsonl':
+            try:
+                raw = json.loads(text)
+            except ValueError:
+                skipped += 1
+                continue
+            if not isinstance(raw, dict):
+                skipped += 1
+                continue
+        else:
+            values = next(csv.reader([text], delimiter='\t',
+                                     quoting=csv.QUOTE_NONE))
+            raw = dict(zip(header, values))
+        records.append(raw)
+
+    products = []
+    classified = classify_batch(
+        [raw.get('categories') or '' for raw in records]
+    )
+    for raw, match in zip(records, classified):
+        product = parse_record(raw, match.product_type)
+        if product is None:
+            skipped += 1
+        else:
+            products.append(product)
+    return products, skipped
+
+
+def iter_chunks(fh, chunk_size):
+    """Yield ``(lines, end_offset)`` for consecutive blocks of lines."""
+    lines = []
+    for line in iter(fh.readline, b''):
+        lines.append(line)
+        if len(lines) >= chunk_size:
+            yield lines, fh.tell()
+            lines = []
+    if lines:
+        yield lines, fh.tell()
+
+
+def upsert(products):
+    """Insert or update catalog rows on ``external_id``; returns the count."""
+    now = timezone.now()
+    rows = {}
+    for p in products:
+        # A dump can list a product twice; ON CONFLICT can't touch a row
+        # twice in one statement, so keep the last one.
+        rows[p['external_id']] = CatalogProduct(
+            normalized_key=catalog_key(p['brand'], p['name']),
+            created_at=now,
+            updated_at=now,
+            **p,
+        )
+    CatalogProduct.objects.bulk_create(
+        list(rows.values()),
+        update_conflicts=True,
+        unique_fields=['external_id'],
+        update_fields=UPSERT_FIELDS,
+    )
+    return len(rows)
+
+
+def checkpoint_path(path):
+    return path + '.checkpoint.json'
+
+
+def read_checkpoint(path):
+    try:
+        with open(path, encoding='utf-8') as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def write_checkpoint(path, state):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        json.dump(state, fh)
+    os.replace(tmp_path, path)
+
+
+def _parsed_chunks(chunks, fmt, header, processes):
+    """Yield ``((products, skipped), end_offset)`` in file order.
+
+    With ``processes`` the chunks are parsed in a process pool, keeping
+    only a few chunks in flight so memory stays bounded.
+    """
+    if not processes:
+        for lines, offset in chunks:
+            yield parse_chunk(lines, fmt, header), offset
+        return
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        in_flight = deque()
+        for lines, offset in chunks:
+            in_flight.append(
+                (pool.submit(parse_chunk, lines, fmt, header), offset)
+            )
+            if len(in_flight) >= processes * 2:
+                future, end = in_flight.popleft()
+                yield future.result(), end
+        while in_flight:
+            future, end = in_flight.popleft()
+            yield future.result(), end
+
+
+def import_dump(path, fmt=None, batch_size=DEFAULT_BATCH_SIZE,
+                processes=0, resume=False, checkpoint=None, progress=None):
+    """Stream a dump file into ``CatalogProduct``.
+
+    Returns counts of ``records`` read, ``imported`` rows upserted and
+    ``skipped`` records (not skincare, unnamed or unparseable), including
+    those from earlier runs when resuming. ``progress`` is called with
+    the running totals after each batch.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in DUMP_FORMATS:
+        raise ValueError(f'Unsupported dump format for {path}')
+    checkpoint = checkpoint or checkpoint_path(path)
+
+    totals = {'offset': 0, 'records': 0, 'imported': 0, 'skipped': 0}
+    if resume:
+        state = read_checkpoint(checkpoint)
+        if state and state.get('path') == os.path.abspath(path):
+            totals.update(
+                {key: state[key] for key in totals if key in state}
+            )
+
+    with open_dump(path) as fh:
+        header = None
+        if fmt == 'csv':
+            header = fh.readline().decode('utf-8').rstrip('\r\n').split('\t')
+        if totals['offset']:
+            fh.seek(totals['offset'])
+
+        chunks = iter_chunks(fh, batch_size)
+        for (products, skipped), offset in _parsed_chunks(
+            chunks, fmt, header, processes
+        ):
+            with transaction.atomic():
+                if products:
+                    totals['imported'] += upsert(products)
+            totals['skipped'] += skipped
+            totals['records'] += len(products) + skipped
+            totals['offset'] = offset
+            write_checkpoint(
+                checkpoint, {'path': os.path.abspath(path), **totals}
+            )
+            if progress:
+                progress(totals)
+
+    # bulk_create doesn't send post_save.
+    autocomplete.invalidate_catalog()
+    return totals
@@ -1,196 +1,311 @@
+import json
+import logging
+import math
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
 import requests
-from django.contrib.auth.models import User
-from .models import Product
+from django.conf import settings
+from django.db import transaction
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import http_cache
+
+from . import autocomplete, browse_catalog, obf_cache
+from .catalog import resolve as resolve_catalog
+from .classifier import classify, classify_batch
+from .import_stats import ImportStats
+from .models import Product, dedupe_key
+
+logger = logging.getLogger(__name__)
+
+# Open Beauty Facts asks API clients to identify themselves.
+USER_AGENT = 'SKYN Skincare Tracker - https://github.com/iismail06/Skincare_tracker_SKYN'
+TIMEOUT = (5, 30)  # connect, read
+MAX_RETRIES = 3
+MAX_PAGE_SIZE = 100
+DEFAULT_PAGE_SIZE = 50
+DEFAULT_WORKERS = 4
+# Search requests per minute; Open Beauty Facts allows about 10.
+DEFAULT_RATE = 10
+SAVE_BATCH_SIZE = 100
+# Fields replaced on existing products with --overwrite.
+OVERWRITE_FIELDS = [
+    'product_type', 'ingredients', 'description', 'external_id',
+    'catalog_product', 'updated_at',
+]
 
 
 def map_category_to_product_type(categories):
     """Map Open Beauty Facts categories to our product types."""
-    if not categories:
-        return 'other'
-
-    categories_lower = categories.lower()
-
-    if any(
-        word in categories_lower
-        for word in [
-            'cleanser',
-            'cleansing',
-            'face wash',
-            'gel cleanser',
-        ]
-    ):
-        return 'cleanser'
-
-    if any(word in categories_lower for word in ['toner', 'tonic']):
-        return 'toner'
-
-    if any(word in categories_lower for word in ['serum']):
-        return 'serum'
-
-    if any(
-        word in categories_lower
-        for word in [
-            'moisturizer',
-            'moisturiser',
-            'cream',
-            'lotion',
-            'face cream',
-        ]
-    ):
-        return 'moisturizer'
-
-    if any(
-        word in categories_lower
-        for word in ['sunscreen', 'sun protection', 'spf']
-    ):
-        return 'sunscreen'
-
-    if any(word in categories_lower for word in ['exfoliant', 'scrub',
-                                                 'peeling']):
-        return 'exfoliant'
-
-    if any(word in categories_lower for word in ['mask', 'face mask']):
-        return 'mask'
-
-    if any(word in categories_lower for word in ['eye cream', 'eye care']):
-        return 'eye_cream'
-
-    if any(word in categories_lower for word in ['oil', 'face oil']):
-        return 'oil'
-
-    if any(word in categories_lower for word in ['essence']):
-        return 'essence'
-
-    if any(
-        word in categories_lower
-        for word in ['spot treatment', 'acne treatment']
-    ):
-        return 'spot_treatment'
-
-    if any(word in categories_lower for word in ['retinol', 'retinoid']):
-        return 'retinol'
-
-    if any(
-        word in categories_lower
-        for word in ['vitamin c', 'vitamin-c']
-    ):
-        return 'vitamin_c'
-
-    return 'other'
+    return classify(categories).product_type
+
+
+class RateLimiter:
+    """Spaces out request starts across threads to ``per_minute``."""
+
+    def __init__(self, per_minute):
+        self.interval = 60.0 / per_minute if per_minute else 0
+        self.lock = threading.Lock()
+        self.next_at = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_at)
+            self.next_at = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def make_session(pool_size=DEFAULT_WORKERS, retries=MAX_RETRIES):
+    """Return a keep-alive session that retries failed GETs with backoff.
+
+    Retries cover connection errors, 429 (honouring ``Retry-After``) and
+    5xx responses.
+    """
+    session = requests.Session()
+    session.headers['User-Agent'] = USER_AGENT
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(
+            total=retries,
+            backoff_factor=1,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=('GET',),
+            respect_retry_after_header=True,
+        ),
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
 
 
-def fetch_products_from_openbeautyfacts(category='moisturizer',
-                                        limit=10):
-    """Fetch products from Open Beauty Facts API by category."""
-    base_url = "https://world.openbeautyfacts.org/cgi/search.pl"
+def parse_product(raw, product_type=None):
+    """Turn an Open Beauty Facts product into our product dict.
+
+    ``product_type`` can be passed in when categories were classified in
+    a batch. Returns ``None`` for products without a usable name.
+    """
+    name = raw.get('product_name', 'Unknown Product')
+    brand = raw.get('brands', 'Unknown Brand')
+
+    if not name or name == 'Unknown Product':
+        return None
+
+    if brand and ',' in brand:
+        brand = brand.split(',')[0].strip()
+
+    return {
+        'name': name[:200],
+        'brand': brand[:100] if brand else 'Unknown Brand',
+        'product_type': product_type or map_category_to_product_type(
+            raw.get('categories', '')
+        ),
+        'ingredients': raw.get('ingredients_text', ''),
+        'description': raw.get('generic_name', ''),
+        'external_id': raw.get('_id', ''),
+    }
+
 
+def fetch_page(session, category, page, page_size, limiter=None,
+               cache=None, cache_mode='default', stats=None):
+    """Fetch one page of search results.
+
+    With a ``cache`` (``obf_cache.ResponseCache``) the response is read
+    from and stored in it according to ``cache_mode``; cache hits don't
+    wait on the rate limiter. Time and bytes are recorded in ``stats``
+    (an ``ImportStats``) under the fetch stage.
+    Returns ``(raw_products, total_count)``.
+    """
     params = {
         'search_terms': f'{category} face skin care',
         'search_simple': '1',
         'action': 'process',
         'json': '1',
-        'page_size': limit,
+        'page': page,
+        'page_size': page_size,
         'sort_by': 'popularity',
     }
+    url = settings.OPENBEAUTYFACTS_SEARCH_URL
+    stats = stats or ImportStats()
+    with stats.stage('fetch') as timer:
+        if cache is not None:
+            body, downloaded = cache.get_body(
+                session, url, params, TIMEOUT, mode=cache_mode,
+                before_request=limiter.wait if limiter else None,
+            )
+        else:
+            if limiter:
+                limiter.wait()
+            response = session.get(url, params=params, timeout=TIMEOUT)
+            response.raise_for_status()
+            body = response.content
+            downloaded = len(body)
+        data = json.loads(body)
+        products = data.get('products') or []
+        timer.items = len(products)
+    stats.add_bytes(downloaded)
+    return products, int(data.get('count') or 0)
+
+
+def iter_products(categories, limit=10, page_size=DEFAULT_PAGE_SIZE,
+                  workers=DEFAULT_WORKERS, rate=DEFAULT_RATE,
+                  session=None, cache=None, cache_mode='default',
+                  stats=None):
+    """Yield parsed products for several categories as pages arrive.
+
+    Up to ``limit`` products are yielded per category. The first page of
+    every category is requested at once; when it reports more results,
+    the remaining pages needed are queued too. ``workers`` requests run
+    concurrently, started at most ``rate`` times a minute. Products that
+    show up under several categories are yielded once. A page that still
+    fails after retries is reported and skipped. ``cache`` and
+    ``cache_mode`` are passed on to ``fetch_page()``; fetch, classify and
+    parse times are recorded in ``stats`` if given.
+    """
+    page_size = max(1, min(page_size, limit, MAX_PAGE_SIZE))
+    session = session or make_session(workers)
+    limiter = RateLimiter(rate)
+    stats = stats or ImportStats()
+    remaining = {category: limit for category in categories}
+    seen = set()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {
+            pool.submit(
+                fetch_page, session, category, 1, page_size, limiter,
+                cache, cache_mode, stats,
+            ): (category, 1)
+            for category in remaining
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                category, page = pending.pop(future)
+                try:
+                    raw_products, count = future.result()
+                except (requests.exceptions.RequestException,
+                        ValueError) as exc:
+                    logger.warning(
+                        "Error fetching '%s' page %s: %s",
+                        category, page, exc,
+                    )
+                    continue
 
-    try:
-        print(
-            "🔍 Searching Open Beauty Facts for '{}' products..."
-            .format(category)
-        )
-        response = requests.get(base_url, params=params, timeout=30)
-        response.raise_for_status()
-        data = response.json()
-
-        if 'products' not in data:
-            print("❌ No products found in response")
-            return []
-
-        products = data['products']
-        print("✅ Found {} products".format(len(products)))
-
-        processed_products = []
-
-        for product in products:
-            name = product.get('product_name', 'Unknown Product')
-            brand = product.get('brands', 'Unknown Brand')
-
-            if not name or name == 'Unknown Product':
-                continue
+                if page == 1:
+                    logger.info(
+                        "Found %s '%s' products", count, category
+                    )
+                    pages = math.ceil(min(count, limit) / page_size)
+                    for next_page in range(2, pages + 1):
+                        pending[pool.submit(
+                            fetch_page, session, category, next_page,
+                            page_size, limiter, cache, cache_mode, stats,
+                        )] = (category, next_page)
+
+                with stats.stage('classify', len(raw_products)):
+                    classified = classify_batch(
+                        [raw.get('categories') or '' for raw in raw_products]
+                    )
+                with stats.stage('parse', len(raw_products)):
+                    parsed = [
+                        parse_product(raw, match.product_type)
+                        for raw, match in zip(raw_products, classified)
+                    ]
+                for product in parsed:
+                    if remaining[category] <= 0:
+                        break
+                    if product is None:
+                        continue
+                    key = product['external_id'] or (
+                        product['brand'], product['name']
+                    )
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    remaining[category] -= 1
+                    yield product
 
-            if brand and ',' in brand:
-                brand = brand.split(',')[0].strip()
 
-            processed_product = {
-                'name': name[:200],
-                'brand': brand[:100] if brand else 'Unknown Brand',
-                'product_type': map_category_to_product_type(
-                    product.get('categories', '')
-                ),
-                'ingredients': product.get('ingredients_text', ''),
-                'description': product.get('generic_name', ''),
-                'external_id': product.get('_id', ''),
-            }
+def fetch_products_from_openbeautyfacts(category='moisturizer',
+                                        limit=10):
+    """Fetch products from Open Beauty Facts API by category."""
+    logger.info(
+        "Searching Open Beauty Facts for '%s' products", category
+    )
+    products = list(iter_products([category], limit))
+    logger.info("Processed %s valid products", len(products))
+    return products
 
-            processed_products.append(processed_product)
 
-        print("📦 Processed {} valid products"
-              .format(len(processed_products)))
-        return processed_products
+def save_products_to_database(products, user, overwrite=False):
+    """Save fetched products to the database.
+
+    Existing (name, brand) pairs for the user are looked up in one query
+    and the batch is written with a single ``bulk_create`` (an upsert on
+    ``(user, name, brand)`` when ``overwrite`` is set) in one transaction.
+    Rows another import inserts between the lookup and the write are left
+    alone rather than failing the batch, so the counts come from the
+    lookup and can be slightly off when imports overlap.
+    """
+    if not products:
+        return {'created': 0, 'updated': 0, 'skipped': 0}
 
-    except requests.exceptions.RequestException as exc:
-        print("❌ Error fetching data from Open Beauty Facts: {}".format(exc))
-        return []
-    except Exception as exc:
-        print("❌ Unexpected error: {}".format(exc))
-        return []
+    # Shared data (ingredients, description) lives on the catalog entry.
+    catalog_rows = resolve_catalog(products)
 
+    existing = set(
+        Product.objects.filter(
+            user=user,
+            name__in={p['name'] for p in products},
+        ).values_list('name', 'brand')
+    )
 
-def save_products_to_database(products, user, overwrite=False):
-    """Save fetched products to the database."""
+    rows = {}
     created_count = 0
     updated_count = 0
     skipped_count = 0
-
-    for pdata in products:
-        try:
-            existing = Product.objects.filter(
-                user=user,
-                name=pdata['name'],
-                brand=pdata['brand'],
-            ).first()
-
-            if existing:
-                if overwrite:
-                    for key, value in pdata.items():
-                        setattr(existing, key, value)
-                    existing.save()
-                    updated_count += 1
-                    print(
-                        "✏️  Updated: {} - {}"
-                        .format(pdata['brand'], pdata['name'])
-                    )
-                else:
-                    skipped_count += 1
-                    print(
-                        "⏭️  Skipped (exists): {} - {}"
-                        .format(pdata['brand'], pdata['name'])
-                    )
-            else:
-                Product.objects.create(user=user, **pdata)
-                created_count += 1
-                print(
-                    "✅ Created: {} - {}"
-                    .format(pdata['brand'], pdata['name'])
-                )
-
-        except Exception as exc:
-            print(
-                "❌ Error saving product {}: {}"
-                .format(pdata.get('name', 'Unknown'), exc)
+    for pdata, catalog_product in zip(products, catalog_rows):
+        key = (pdata['name'], pdata['brand'])
+        if key in existing or key in rows:
+            if not overwrite:
+                skipped_count += 1
+                continue
+            updated_count += 1
+        else:
+            created_count += 1
+        rows[key] = _build_product(pdata, user, catalog_product)
+
+    objs = list(rows.values())
+    with transaction.atomic():
+        if overwrite:
+            Product.objects.bulk_create(
+                objs,
+                batch_size=SAVE_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=['user', 'name', 'brand'],
+                update_fields=OVERWRITE_FIELDS,
+            )
+        else:
+            Product.objects.bulk_create(
+                objs, batch_size=SAVE_BATCH_SIZE, ignore_conflicts=True
             )
-            skipped_count += 1
 
+    # bulk_create doesn't send post_save, so clear the caches here.
+    browse_catalog.invalidate()
+    autocomplete.invalidate_user(user.pk)
+    http_cache.bump_user_version(user.pk)
+
+    logger.info(
+        "Saved batch: %s created, %s updated, %s skipped",
+        created_count, updated_count, skipped_count,
+    )
     return {
         'created': created_count,
         'updated': updated_count,
@@ -198,22 +313,105 @@ def save_products_to_database(products, user, overwrite=False):
     }
 
 
-def import_openbeautyfacts_products(category, user, limit=10, overwrite=False):
-    """Main function to import products from Open Beauty Facts."""
-    print(
-        "🚀 Starting import of '{}' products..."
-        .format(category)
+def _build_product(pdata, user, catalog_product):
+    """Unsaved Product for ``pdata``, prepared the way ``save()`` would."""
+    product = Product(user=user, catalog_product=catalog_product, **pdata)
+    product.dedupe_key = dedupe_key(product.brand, product.name)
+    # Don't keep a private copy of text the catalog already holds.
+    if catalog_product:
+        if product.ingredients == catalog_product.ingredients:
+            product.ingredients = None
+        if product.description == catalog_product.description:
+            product.description = None
+    return product
+
+
+def import_openbeautyfacts_products(categories, user, limit=10,
+                                    overwrite=False,
+                                    page_size=DEFAULT_PAGE_SIZE,
+                                    workers=DEFAULT_WORKERS,
+                                    rate=DEFAULT_RATE, progress=None,
+                                    cache_mode='default', cache_ttl=None,
+                                    dry_run=False):
+    """Main function to import products from Open Beauty Facts.
+
+    ``categories`` is a category name or a list of them. Products are
+    saved in batches while later pages are still downloading; after each
+    batch ``progress(fetched, expected)`` is called if given. With
+    ``dry_run`` products are fetched, classified and parsed but not saved.
+
+    Responses go through the on-disk cache (``products.obf_cache``).
+    ``cache_mode`` is ``'default'`` (use fresh entries, revalidate stale
+    ones), ``'refresh'`` (always download, then store), ``'offline'``
+    (cache only, never the network) or ``'off'``.
+
+    The results include ``fetched``, the ``cache`` counts and ``stats``,
+    a JSON-serialisable per-stage summary (see ``products.import_stats``)
+    that is also logged.
+    """
+    if isinstance(categories, str):
+        categories = [categories]
+    logger.info(
+        "Starting import of %s products%s",
+        ', '.join("'{}'".format(c) for c in categories),
+        ' (dry run)' if dry_run else '',
     )
-    products = fetch_products_from_openbeautyfacts(category, limit)
 
-    if not products:
-        return {'error': 'No products fetched from Open Beauty Facts'}
+    results = {'created': 0, 'updated': 0, 'skipped': 0}
+    fetched = 0
+    batch = []
+    stats = ImportStats()
+    cache = obf_cache.from_settings(cache_ttl)
+    products = iter_products(
+        categories, limit, page_size=page_size, workers=workers, rate=rate,
+        cache=cache, cache_mode=cache_mode, stats=stats,
+    )
+    expected = limit * len(categories)
+
+    def save(batch):
+        with stats.stage('persist', len(batch)):
+            if not dry_run:
+                _add_results(results, save_products_to_database(
+                    batch, user, overwrite
+                ))
+        if progress:
+            progress(fetched, expected)
+
+    with stats.count_queries():
+        for product in products:
+            batch.append(product)
+            if len(batch) >= SAVE_BATCH_SIZE:
+                fetched += len(batch)
+                save(batch)
+                batch = []
+        if batch:
+            fetched += len(batch)
+            save(batch)
+    stats.finish()
+
+    logger.info("Cache: %s", cache.summary())
+    summary = stats.log(logger)
+    if not fetched:
+        return {
+            'error': 'No products fetched from Open Beauty Facts',
+            'cache': dict(cache.stats),
+            'stats': summary,
+        }
+
+    if dry_run:
+        logger.info("Dry run: %s products fetched, nothing saved", fetched)
+    else:
+        logger.info(
+            "Import completed: %s created, %s updated, %s skipped",
+            results['created'], results['updated'], results['skipped'],
+        )
 
-    results = save_products_to_database(products, user, overwrite)
+    results['fetched'] = fetched
+    results['cache'] = dict(cache.stats)
+    results['stats'] = summary
+    return results
 
-    print("🎉 Import completed!")
-    print("   📊 Created: {}".format(results['created']))
-    print("   ✏️  Updated: {}".format(results['updated']))
-    print("   ⏭️  Skipped: {}".format(results['skipped']))
 
-    return results
+def _add_results(totals, results):
+    for key in totals:
+        totals[key] += results[key]
@@ -0,0 +1,144 @@
+"""Responsive variants of the site's static images.
+
+``build_responsive_images`` resizes each source image under
+``static/images`` to several widths in AVIF and WebP and records them,
+with the source's intrinsic size, in ``static/images/responsive/
+manifest.json``. The ``image_tags`` template library reads that manifest
+to emit ``srcset``/``sizes``/``width``/``height`` so browsers only
+download the width they need.
+"""
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+from django.conf import settings
+
+SOURCE_DIR = 'images'
+OUTPUT_DIR = 'images/responsive'
+MANIFEST_NAME = 'manifest.json'
+SOURCE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+# Icons are served at fixed sizes already.
+SKIP_DIRS = ('images/favicon', OUTPUT_DIR)
+
+WIDTHS = (480, 768, 1280, 1920)
+# Preferred first: browsers take the first <source> they support.
+FORMATS = ('avif', 'webp')
+QUALITY = {'avif': 50, 'webp': 75}
+
+
+def static_root():
+    """Directory the source images (and generated variants) live in."""
+    return str(settings.STATICFILES_DIRS[0])
+
+
+def manifest_path():
+    return os.path.join(static_root(), OUTPUT_DIR, MANIFEST_NAME)
+
+
+@lru_cache(maxsize=1)
+def load_manifest():
+    """Return the variant manifest, or ``{}`` if it hasn't been built."""
+    try:
+        with open(manifest_path(), encoding='utf-8') as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def get_image(path):
+    """Return the manifest entry for a static image path, or ``None``."""
+    return load_manifest().get(path)
+
+
+def find_sources():
+    """Yield static paths (e.g. ``images/hero/hero.webp``) to process."""
+    root = static_root()
+    for dirpath, dirnames, filenames in os.walk(
+        os.path.join(root, SOURCE_DIR)
+    ):
+        rel_dir = os.path.relpath(dirpath, root).replace(os.sep, '/')
+        dirnames[:] = sorted(
+            d for d in dirnames
+            if '{}/{}'.format(rel_dir, d) not in SKIP_DIRS
+        )
+        for filename in sorted(filenames):
+            if filename.lower().endswith(SOURCE_EXTENSIONS):
+                yield '{}/{}'.format(rel_dir, filename)
+
+
+def file_hash(filename):
+    digest = hashlib.md5()
+    with open(filename, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def variant_widths(source_width, widths=WIDTHS):
+    """Return the widths to generate for a source image, never upscaling."""
+    result = [w for w in widths if w < source_width]
+    result.append(min(source_width, max(widths)))
+    return sorted(set(result))
+
+
+def build_image(path, widths=WIDTHS, formats=FORMATS, force=False,
+                manifest=None):
+    """Generate the variants for one source image.
+
+    Returns ``(entry, built)``; the work is skipped when the manifest
+    already has an entry for the same source file, widths and formats.
+    """
+    # Only needed when building, not when rendering templates.
+    from PIL import Image, ImageOps
+
+    root = static_root()
+    source = os.path.join(root, path)
+    digest = file_hash(source)
+    previous = (manifest or {}).get(path)
+    if (not force and previous
+            and previous.get('hash') == digest
+            and previous.get('formats') == list(formats)
+            and previous.get('widths') == list(widths)):
+        return previous, False
+
+    name = os.path.splitext(path[len(SOURCE_DIR) + 1:])[0]
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+        width, height = image.size
+
+        variants = {fmt: [] for fmt in formats}
+        for target in variant_widths(width, widths):
+            resized = image
+            if target != width:
+                resized = image.resize(
+                    (target, round(height * target / width)),
+                    Image.LANCZOS,
+                )
+            for fmt in formats:
+                variant = '{}/{}-{}.{}'.format(OUTPUT_DIR, name, target, fmt)
+                filename = os.path.join(root, variant)
+                os.makedirs(os.path.dirname(filename), exist_ok=True)
+                resized.save(filename, fmt.upper(), quality=QUALITY[fmt])
+                variants[fmt].append({'width': target, 'path': variant})
+
+    entry = {
+        'width': width,
+        'height': height,
+        'hash': digest,
+        'widths': list(widths),
+        'formats': list(formats),
+        'variants': variants,
+    }
+    return entry, True
+
+
+def write_manifest(manifest):
+    filename = manifest_path()
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    with open(filename, 'w', encoding='utf-8') as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+        fh.write('\n')
+    load_manifest.cache_clear()
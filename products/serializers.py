@@ -1,5 +1,12 @@
+import json
+
 from rest_framework import serializers
-from .models import Product
+from .models import Product, shared_value
+
+try:
+    import orjson
+except ImportError:  # in requirements; stdlib json keeps dev setups working
+    orjson = None
 
 
 class ProductSerializer(serializers.ModelSerializer):
@@ -33,6 +40,15 @@ class ProductSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'user', 'created_at', 'updated_at']
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Fill in shared text from the catalog entry, if linked.
+        if 'ingredients' in data:
+            data['ingredients'] = instance.get_ingredients()
+        if 'description' in data:
+            data['description'] = instance.get_description()
+        return data
+
 
 class ProductCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating products (without user field)"""
@@ -50,4 +66,86 @@ class ProductCreateSerializer(serializers.ModelSerializer):
             'expiry_date',
             'is_favorite',
             'skin_type'
-        ]
\ No newline at end of file
+        ]
+
+# Fast read path for list endpoints.
+#
+# ``ProductSerializer`` builds one field object per column per row and
+# resolves ``user`` through a relation lookup.  For large lists we read
+# plain dicts with ``.values()`` and format them here instead; the output
+# is identical to what ``ProductSerializer(many=True)`` returns.
+
+PRODUCT_TYPE_DISPLAY = dict(Product.PRODUCT_TYPE_CHOICES)
+
+# Fields that are computed rather than read straight from the table.
+COMPUTED_FIELDS = {'product_type_display', 'user'}
+# Fields that fall back to the linked CatalogProduct when empty.
+SHARED_FIELDS = ('ingredients', 'description')
+
+
+def resolve_fields(fields_param):
+    """Turn a ``?fields=a,b`` value into an ordered list of known fields.
+
+    Unknown names are ignored; an empty or missing value means all fields.
+    """
+    all_fields = ProductSerializer.Meta.fields
+    if not fields_param:
+        return list(all_fields)
+    requested = {f.strip() for f in fields_param.split(',') if f.strip()}
+    fields = [f for f in all_fields if f in requested]
+    return fields or list(all_fields)
+
+
+def _format_datetime(value):
+    if not value:
+        return None
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def _format_date(value):
+    return value.isoformat() if value else None
+
+
+def product_rows(queryset, fields, username):
+    """Yield serialized product dicts for ``queryset``.
+
+    ``username`` is used for the ``user`` field, since list endpoints only
+    ever return products belonging to the requesting user.
+    """
+    columns = [f for f in fields if f not in COMPUTED_FIELDS]
+    if 'product_type_display' in fields and 'product_type' not in columns:
+        columns.append('product_type')
+    shared = [f for f in SHARED_FIELDS if f in fields]
+    columns.extend('catalog_product__' + f for f in shared)
+
+    for row in queryset.values(*columns).iterator(chunk_size=2000):
+        item = {}
+        for field in fields:
+            if field == 'user':
+                item['user'] = username
+            elif field == 'product_type_display':
+                ptype = row['product_type']
+                item[field] = PRODUCT_TYPE_DISPLAY.get(ptype, ptype)
+            elif field in ('created_at', 'updated_at'):
+                item[field] = _format_datetime(row[field])
+            elif field == 'expiry_date':
+                item[field] = _format_date(row[field])
+            elif field in SHARED_FIELDS:
+                item[field] = shared_value(
+                    row[field], row['catalog_product__' + field]
+                )
+            else:
+                item[field] = row[field]
+        yield item
+
+
+def dumps_json(data):
+    """Encode ``data`` as compact UTF-8 JSON bytes (orjson if installed)."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(
+        data, ensure_ascii=False, separators=(',', ':')
+    ).encode('utf-8')
@@ -0,0 +1,46 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from config import http_cache
+
+from . import autocomplete, browse_catalog, expiry
+from .models import CatalogProduct, Product
+
+
+@receiver(post_save, sender=Product)
+def invalidate_browse_catalog_on_save(sender, instance, created, **kwargs):
+    if created:
+        browse_catalog.invalidate(instance.product_type)
+    else:
+        # The product may have moved between categories; we don't know
+        # the old type without another query, so clear them all.
+        browse_catalog.invalidate()
+
+
+@receiver(post_delete, sender=Product)
+def invalidate_browse_catalog_on_delete(sender, instance, **kwargs):
+    browse_catalog.invalidate(instance.product_type)
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_user_autocomplete(sender, instance, **kwargs):
+    autocomplete.invalidate_user(instance.user_id)
+
+
+@receiver(post_save, sender=CatalogProduct)
+@receiver(post_delete, sender=CatalogProduct)
+def invalidate_catalog_autocomplete(sender, instance, **kwargs):
+    autocomplete.invalidate_catalog()
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_expiry_summary(sender, instance, **kwargs):
+    expiry.invalidate_summary(instance.user_id)
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def bump_http_version(sender, instance, **kwargs):
+    http_cache.bump_user_version(instance.user_id)
@@ -0,0 +1,35 @@
+"""Background job handlers (see ``jobs.registry``)."""
+from jobs.registry import register
+
+OBF_IMPORT = 'obf_import'
+# Limits for imports started from the web
+MAX_IMPORT_CATEGORIES = 5
+MAX_IMPORT_LIMIT = 200
+
+
+@register(OBF_IMPORT)
+def import_openbeautyfacts(job):
+    """Import Open Beauty Facts products into the job owner's list."""
+    # Imported here: every process loads this module at startup (job
+    # autodiscovery), but only workers need requests and the importer.
+    from .openbeautyfacts import import_openbeautyfacts_products
+
+    payload = job.payload
+
+    def progress(fetched, expected):
+        job.set_progress(
+            fetched * 100 // max(expected, 1),
+            f'{fetched} products saved',
+        )
+
+    results = import_openbeautyfacts_products(
+        payload['categories'],
+        job.user,
+        limit=payload.get('limit', 10),
+        overwrite=payload.get('overwrite', False),
+        progress=progress,
+    )
+    if 'error' in results:
+        # Nothing found isn't worth retrying.
+        return {'created': 0, 'updated': 0, 'skipped': 0, **results}
+    return results
@@ -0,0 +1,27 @@
+"""Template tags for the per-page JS/CSS bundles."""
+
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html_join
+
+from products.asset_bundles import get_bundle
+
+register = template.Library()
+
+
+@register.simple_tag
+def js_bundle(name):
+    """``<script>`` tag(s) for a JS bundle defined in ``asset_bundles``."""
+    return format_html_join(
+        '\n', '<script src="{}"></script>',
+        ((static(path),) for path in get_bundle('js', name)),
+    )
+
+
+@register.simple_tag
+def css_bundle(name):
+    """``<link rel="stylesheet">`` tag(s) for a CSS bundle."""
+    return format_html_join(
+        '\n', '<link rel="stylesheet" href="{}">',
+        ((static(path),) for path in get_bundle('css', name)),
+    )
@@ -2,14 +2,87 @@
 
 from django import template
 from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+from products.responsive_images import get_image
 
 register = template.Library()
 
+
+def _srcset(variants):
+    return ', '.join(
+        '{} {}w'.format(static(v['path']), v['width']) for v in variants
+    )
+
+
+def _attrs(attrs):
+    return format_html_join('', ' {}="{}"', sorted(attrs.items()))
+
+
 @register.simple_tag
-def optimized_image_url(image_path):
-    """Return optimized static URL with proper attributes for performance."""
-    return static(image_path)
-    
+def optimized_image_url(image_path, width=None):
+    """Return the URL of the smallest WebP variant at least ``width`` wide.
+
+    Without ``width`` the largest variant is used. Falls back to the
+    original image when no variants have been built.
+    """
+    entry = get_image(image_path)
+    variants = entry and entry['variants'].get('webp')
+    if not variants:
+        return static(image_path)
+    if width is not None:
+        for variant in variants:
+            if variant['width'] >= int(width):
+                return static(variant['path'])
+    return static(variants[-1]['path'])
+
+
+@register.simple_tag
+def responsive_image(image_path, alt='', sizes='100vw', loading='lazy',
+                     **attrs):
+    """Render a ``<picture>`` with AVIF/WebP ``srcset`` sources.
+
+    ``width``/``height`` come from the manifest so the browser can reserve
+    space before the image loads. Extra keyword arguments become ``<img>``
+    attributes (use ``class_name`` for ``class``). Images with no built
+    variants render as a plain lazy ``<img>``.
+    """
+    if 'class_name' in attrs:
+        attrs['class'] = attrs.pop('class_name')
+    attrs = {k.replace('_', '-'): v for k, v in attrs.items()}
+
+    entry = get_image(image_path)
+    if not entry:
+        return format_html(
+            '<img src="{}" alt="{}" loading="{}" decoding="async"{}>',
+            static(image_path), alt, loading, _attrs(attrs),
+        )
+
+    formats = entry['formats']
+    fallback = entry['variants'][formats[-1]]
+    sources = format_html_join(
+        '',
+        '<source type="image/{}" srcset="{}" sizes="{}">',
+        (
+            (fmt, _srcset(entry['variants'][fmt]), sizes)
+            for fmt in formats
+        ),
+    )
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}" alt="{}" '
+        'width="{}" height="{}" loading="{}" decoding="async"{}></picture>',
+        sources,
+        static(fallback[-1]['path']),
+        _srcset(fallback),
+        sizes,
+        alt,
+        entry['width'],
+        entry['height'],
+        loading,
+        _attrs(attrs),
+    )
+
+
 @register.filter
 def with_lazy_loading(html_tag):
     """Add loading=lazy attribute to img tags."""
@@ -18,4 +91,4 @@ def with_lazy_loading(html_tag):
             insert_pos = html_tag.find('>')
             if insert_pos > 0:
                 return html_tag[:insert_pos] + ' loading="lazy"' + html_tag[insert_pos:]
-    return html_tag
\ No newline at end of file
+    return html_tag
@@ -0,0 +1,88 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+
+from products import autocomplete
+from products.models import CatalogProduct, Product
+
+
+def catalog_product(name, brand='Brand'):
+    return CatalogProduct.objects.create(
+        name=name, brand=brand, product_type='serum',
+        normalized_key='{}|{}'.format(brand.lower(), name.lower()),
+    )
+
+
+class CatalogIndexTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        autocomplete._catalog_index = None
+        autocomplete._user_indexes.clear()
+        self.addCleanup(setattr, autocomplete, '_catalog_index', None)
+        self.addCleanup(self.release_catalog_lock)
+        self.user = User.objects.create_user(username='typist')
+        catalog_product('Niacinamide Serum')
+
+    def release_catalog_lock(self):
+        # Held when a test stubbed out the rebuild thread.
+        if autocomplete._catalog_lock.locked():
+            autocomplete._catalog_lock.release()
+
+    def names(self, query):
+        results = autocomplete.suggest(self.user.pk, query)
+        return [item['name'] for item in results['catalog']]
+
+    def test_first_build_happens_in_the_request(self):
+        self.assertEqual(self.names('niac'), ['Niacinamide Serum'])
+
+    def test_stale_index_is_served_while_one_rebuild_runs(self):
+        self.names('niac')
+        catalog_product('Niacinamide Toner')  # bumps the catalog version
+
+        with mock.patch.object(autocomplete.threading, 'Thread') as thread:
+            self.assertEqual(self.names('niac'), ['Niacinamide Serum'])
+            self.assertEqual(self.names('niac'), ['Niacinamide Serum'])
+
+        # One rebuild for both requests, started off the request path.
+        self.assertEqual(thread.call_count, 1)
+        kwargs = thread.call_args.kwargs
+        with mock.patch.object(autocomplete, 'connection'):
+            kwargs['target'](*kwargs['args'])
+
+        self.assertEqual(
+            self.names('niac'), ['Niacinamide Serum', 'Niacinamide Toner']
+        )
+        self.assertFalse(autocomplete._catalog_lock.locked())
+
+    def test_failed_rebuild_keeps_the_old_index(self):
+        self.names('niac')
+        catalog_product('Niacinamide Toner')
+
+        with mock.patch.object(autocomplete.threading, 'Thread') as thread:
+            self.names('niac')
+        kwargs = thread.call_args.kwargs
+        with mock.patch.object(
+            autocomplete, '_build_catalog', side_effect=RuntimeError
+        ), mock.patch.object(autocomplete, 'connection'), \
+                self.assertLogs('products.autocomplete', 'ERROR'):
+            kwargs['target'](*kwargs['args'])
+
+        self.assertFalse(autocomplete._catalog_lock.locked())
+        with mock.patch.object(autocomplete.threading, 'Thread'):
+            self.assertEqual(self.names('niac'), ['Niacinamide Serum'])
+
+    @mock.patch.object(autocomplete, 'MAX_CATALOG_ENTRIES', 2)
+    def test_index_is_capped_keeping_products_people_use(self):
+        used = catalog_product('Niacinamide Toner')
+        catalog_product('Niacinamide Mist')
+        Product.objects.create(
+            user=self.user, name='Other', brand='Other',
+            product_type='toner', catalog_product=used,
+        )
+
+        self.assertEqual(
+            sorted(self.names('niac')),
+            ['Niacinamide Serum', 'Niacinamide Toner'],
+        )
@@ -0,0 +1,61 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from products.models import Product
+
+
+class BrowseCategoryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create_user(username='browser')
+        for i in range(4):
+            Product.objects.create(
+                user=self.user, name=f'Serum {i}', brand='Brand',
+                product_type='serum',
+            )
+        self.url = reverse('product-browse-category', args=['serum'])
+
+    def get(self, **headers):
+        return self.client.get(self.url, headers=headers)
+
+    def test_matching_etag_gets_304(self):
+        etag = self.get()['ETag']
+
+        response = self.get(if_none_match=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+
+    def test_etag_list_weak_etag_and_star_get_304(self):
+        etag = self.get()['ETag']
+
+        for header in ('"other", ' + etag, 'W/' + etag, '*'):
+            with self.subTest(header=header):
+                response = self.get(if_none_match=header)
+                self.assertEqual(response.status_code, 304)
+
+    def test_etag_containing_ours_is_not_a_match(self):
+        etag = self.get()['ETag']
+
+        # The old substring test matched this.
+        response = self.get(if_none_match='"x{}"'.format(etag))
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_product_change_serves_new_etag(self):
+        etag = self.get()['ETag']
+        Product.objects.create(
+            user=self.user, name='Another Serum', brand='Brand',
+            product_type='serum',
+        )
+
+        response = self.get(if_none_match=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        names = [p['name'] for p in response.json()]
+        self.assertIn('Another Serum', names)
@@ -0,0 +1,114 @@
+import csv
+import io
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.urls import reverse
+
+from products.bulk_import import ImportFormatError, import_products
+from products.models import Product
+
+
+def csv_upload(text):
+    return io.BytesIO(text.encode('utf-8'))
+
+
+class ImportProductsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='importer')
+        self.product = Product.objects.create(
+            user=self.user,
+            name='Hydrating Cleanser',
+            brand='CeraVe',
+            product_type='cleanser',
+            rating=3,
+            expiry_date=date(2030, 1, 1),
+            notes='Morning only',
+            ingredients='Water, Glycerin',
+            is_favorite=True,
+            skin_type='dry',
+        )
+
+    def test_partial_reimport_keeps_columns_not_in_file(self):
+        results = import_products(
+            self.user,
+            csv_upload(
+                'name,brand,product_type,rating\n'
+                'Hydrating Cleanser,CeraVe,cleanser,5\n'
+            ),
+            'csv',
+        )
+
+        self.assertEqual(results['updated'], 1)
+        self.assertEqual(results['created'], 0)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.rating, 5)
+        self.assertEqual(self.product.expiry_date, date(2030, 1, 1))
+        self.assertEqual(self.product.notes, 'Morning only')
+        self.assertEqual(self.product.ingredients, 'Water, Glycerin')
+        self.assertTrue(self.product.is_favorite)
+        self.assertEqual(self.product.skin_type, 'dry')
+
+    def test_columns_in_file_still_overwrite(self):
+        import_products(
+            self.user,
+            csv_upload(
+                'name,brand,product_type,notes,is_favorite\n'
+                'Hydrating Cleanser,CeraVe,cleanser,,no\n'
+                'Toleriane Toner,La Roche-Posay,toner,New,yes\n'
+            ),
+            'csv',
+        )
+
+        self.product.refresh_from_db()
+        self.assertFalse(self.product.notes)
+        self.assertFalse(self.product.is_favorite)
+        self.assertEqual(self.product.expiry_date, date(2030, 1, 1))
+        created = Product.objects.get(user=self.user, name='Toleriane Toner')
+        self.assertEqual(created.notes, 'New')
+        self.assertTrue(created.is_favorite)
+
+
+class ImportFormatErrorTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='latin1')
+
+    def test_non_utf8_csv_is_a_format_error(self):
+        upload = io.BytesIO(
+            'name,brand,product_type\n'
+            'Crème Hydratante,Avène,moisturizer\n'.encode('latin-1')
+        )
+
+        with self.assertRaisesMessage(ImportFormatError, 'UTF-8'):
+            import_products(self.user, upload, 'csv')
+        self.assertFalse(Product.objects.exists())
+
+    def test_malformed_csv_is_a_format_error(self):
+        upload = csv_upload(
+            'name,brand,product_type\n'
+            'Serum,Brand,"{}"\n'.format('x' * (csv.field_size_limit() + 1))
+        )
+
+        with self.assertRaisesMessage(ImportFormatError, 'Invalid CSV'):
+            import_products(self.user, upload, 'csv')
+
+    def test_view_shows_form_error_for_non_utf8_csv(self):
+        self.client.force_login(self.user)
+        upload = SimpleUploadedFile(
+            'products.csv',
+            'name,brand,product_type\nCrème,Avène,serum\n'.encode('latin-1'),
+            content_type='text/csv',
+        )
+
+        response = self.client.post(
+            reverse('products:import'), {'file': upload}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFormError(
+            response.context['form'], 'file',
+            'CSV files must be UTF-8 encoded (in Excel, save as '
+            '"CSV UTF-8").',
+        )
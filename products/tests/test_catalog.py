@@ -0,0 +1,116 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from products import catalog
+from products.models import CatalogProduct, Product
+
+
+class ResolveTests(TestCase):
+    def setUp(self):
+        self.existing = CatalogProduct.objects.create(
+            name='Hydrating Cleanser',
+            brand='CeraVe',
+            product_type='cleanser',
+            ingredients='Aqua, Glycerin',
+            external_id='3337875597197',
+        )
+
+    def test_matches_normalized_brand_and_name(self):
+        [match] = catalog.resolve(
+            [{'brand': ' cerave ', 'name': 'Hydrating  CLEANSER'}]
+        )
+
+        self.assertEqual(match, self.existing)
+        self.assertEqual(CatalogProduct.objects.count(), 1)
+
+    def test_external_id_wins_over_name(self):
+        [match] = catalog.resolve(
+            [{'brand': 'CeraVe', 'name': 'Renamed Cleanser',
+              'external_id': '3337875597197'}]
+        )
+
+        self.assertEqual(match, self.existing)
+
+    def test_creates_one_row_per_product_in_a_batch(self):
+        entries = [
+            {'brand': 'The Ordinary', 'name': 'Niacinamide 10%',
+             'product_type': 'serum', 'ingredients': 'Aqua, Niacinamide'},
+            {'brand': 'the ordinary', 'name': 'niacinamide 10%'},
+            {'brand': 'CeraVe', 'name': 'Hydrating Cleanser'},
+            {'brand': 'La Roche-Posay', 'name': 'Cicaplast',
+             'external_id': '3337872411991'},
+        ]
+
+        # Two lookups (external id and key) and one insert.
+        with self.assertNumQueries(3):
+            results = catalog.resolve(entries)
+
+        self.assertIs(results[0], results[1])
+        self.assertEqual(results[2], self.existing)
+        self.assertEqual(CatalogProduct.objects.count(), 3)
+        niacinamide = CatalogProduct.objects.get(
+            normalized_key='the ordinary|niacinamide 10%'
+        )
+        self.assertEqual(niacinamide.ingredients, 'Aqua, Niacinamide')
+        self.assertIsNone(niacinamide.external_id)
+        self.assertTrue(
+            CatalogProduct.objects.filter(
+                external_id='3337872411991'
+            ).exists()
+        )
+
+    def test_without_create_unknown_products_are_none(self):
+        results = catalog.resolve(
+            [{'brand': 'CeraVe', 'name': 'Hydrating Cleanser'},
+             {'brand': 'Unknown', 'name': 'Product'}],
+            create=False,
+        )
+
+        self.assertEqual(results, [self.existing, None])
+        self.assertEqual(CatalogProduct.objects.count(), 1)
+
+    def test_find(self):
+        self.assertEqual(
+            catalog.find('CERAVE', 'hydrating cleanser'), self.existing
+        )
+        self.assertIsNone(catalog.find('CeraVe', 'Moisturizer'))
+
+
+class SharedTextTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='catalog')
+        self.entry = CatalogProduct.objects.create(
+            name='Hydrating Cleanser',
+            brand='CeraVe',
+            ingredients='Aqua, Glycerin',
+            description='Gentle cleanser',
+        )
+
+    def create_product(self, **kwargs):
+        return Product.objects.create(
+            user=self.user,
+            name='Hydrating Cleanser',
+            brand='CeraVe',
+            product_type='cleanser',
+            catalog_product=self.entry,
+            **kwargs
+        )
+
+    def test_text_matching_the_catalog_is_not_copied(self):
+        product = self.create_product(
+            ingredients='Aqua, Glycerin', description='Gentle cleanser'
+        )
+        product.refresh_from_db()
+
+        self.assertIsNone(product.ingredients)
+        self.assertIsNone(product.description)
+        self.assertEqual(product.get_ingredients(), 'Aqua, Glycerin')
+        self.assertEqual(product.get_description(), 'Gentle cleanser')
+
+    def test_own_text_is_kept(self):
+        product = self.create_product(ingredients='Aqua, Ceramide NP')
+        product.refresh_from_db()
+
+        self.assertEqual(product.ingredients, 'Aqua, Ceramide NP')
+        self.assertEqual(product.get_ingredients(), 'Aqua, Ceramide NP')
+        self.assertEqual(product.get_description(), 'Gentle cleanser')
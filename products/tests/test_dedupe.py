@@ -0,0 +1,73 @@
+import json
+import logging
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from products.models import Product
+from routines.models import Routine, RoutineStep
+
+
+class MergeProductsViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='merger')
+        self.client.force_login(self.user)
+        self.url = reverse('product-merge')
+        # Rejected requests are logged as warnings; they're expected here.
+        logger = logging.getLogger('django.request')
+        self.addCleanup(logger.setLevel, logger.level)
+        logger.setLevel(logging.ERROR)
+        self.keep, self.other = [
+            Product.objects.create(
+                user=self.user, name=name, brand='CeraVe',
+                product_type='cleanser',
+            )
+            for name in ('Hydrating Cleanser', 'CeraVe hydrating cleanser')
+        ]
+
+    def post_json(self, payload):
+        return self.client.post(
+            self.url, json.dumps(payload), content_type='application/json'
+        )
+
+    def test_merges_products(self):
+        routine = Routine.objects.create(
+            user=self.user, name='AM', routine_type='morning'
+        )
+        step = RoutineStep.objects.create(
+            routine=routine, step_name='Cleanse', product=self.other,
+        )
+
+        response = self.post_json(
+            {'keep_id': self.keep.pk, 'merge_ids': [self.other.pk]}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['merged'], 1)
+        self.assertFalse(Product.objects.filter(pk=self.other.pk).exists())
+        step.refresh_from_db()
+        self.assertEqual(step.product_id, self.keep.pk)
+
+    def test_json_body_that_is_not_an_object_is_rejected(self):
+        for payload in ([1, 2], 'keep', 3, None):
+            with self.subTest(payload=payload):
+                response = self.post_json(payload)
+
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.json()['success'])
+
+    def test_merge_ids_that_is_not_a_list_is_rejected(self):
+        response = self.post_json(
+            {'keep_id': self.keep.pk, 'merge_ids': str(self.other.pk)}
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(Product.objects.filter(pk=self.other.pk).exists())
+
+    def test_malformed_json_is_rejected(self):
+        response = self.client.post(
+            self.url, '{', content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,112 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from products.expiry import send_due_alerts
+from products.models import ExpiryAlert, Product
+
+
+class SendDueAlertsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='alerts')
+        self.today = date.today()
+        self.expiry = self.today + timedelta(days=100)
+
+    def create_product(self, name='Serum', expiry_date=None):
+        return Product.objects.create(
+            user=self.user,
+            name=name,
+            brand='Brand',
+            product_type='serum',
+            expiry_date=expiry_date or self.expiry,
+        )
+
+    def alerts(self, product):
+        return list(
+            ExpiryAlert.objects.filter(product=product)
+            .order_by('id').values_list('days_before', 'expiry_date')
+        )
+
+    def test_save_schedules_first_alert(self):
+        product = self.create_product()
+
+        self.assertEqual(product.expiry_alert_days, 90)
+        self.assertEqual(
+            product.expiry_alert_on, self.expiry - timedelta(days=90)
+        )
+
+    def test_alerts_are_created_once_per_threshold(self):
+        product = self.create_product()
+
+        for day, expected in [(10, 1), (10, 0), (69, 0), (70, 1), (100, 1)]:
+            with self.subTest(day=day):
+                created = send_due_alerts(self.today + timedelta(days=day))
+                self.assertEqual(created, expected)
+
+        self.assertEqual(
+            self.alerts(product),
+            [(90, self.expiry), (30, self.expiry), (0, self.expiry)],
+        )
+        product.refresh_from_db()
+        self.assertIsNone(product.expiry_alert_on)
+        self.assertIsNone(product.expiry_alert_days)
+
+    def test_missed_days_send_only_the_most_urgent_threshold(self):
+        product = self.create_product()
+
+        send_due_alerts(self.expiry - timedelta(days=5))
+
+        self.assertEqual(self.alerts(product), [(30, self.expiry)])
+        product.refresh_from_db()
+        self.assertEqual(product.expiry_alert_on, self.expiry)
+        self.assertEqual(product.expiry_alert_days, 0)
+
+    def test_changing_expiry_date_reschedules_alerts(self):
+        product = self.create_product()
+        send_due_alerts(self.today + timedelta(days=10))
+        product.refresh_from_db()
+        self.assertEqual(product.expiry_alert_days, 30)
+
+        new_expiry = self.today + timedelta(days=200)
+        product.expiry_date = new_expiry
+        product.save()
+        product.refresh_from_db()
+        self.assertEqual(product.expiry_alert_days, 90)
+        self.assertEqual(
+            product.expiry_alert_on, new_expiry - timedelta(days=90)
+        )
+
+        send_due_alerts(new_expiry - timedelta(days=90))
+        self.assertEqual(
+            self.alerts(product), [(90, self.expiry), (90, new_expiry)]
+        )
+
+    def test_saving_other_fields_keeps_the_schedule(self):
+        product = self.create_product()
+        send_due_alerts(self.today + timedelta(days=10))
+        product.refresh_from_db()
+
+        product.name = 'Renamed'
+        product.save()
+        product.refresh_from_db()
+
+        self.assertEqual(product.expiry_alert_days, 30)
+        self.assertEqual(
+            product.expiry_alert_on, self.expiry - timedelta(days=30)
+        )
+
+    def test_batches_cover_every_due_product(self):
+        products = [self.create_product(name=f'P{i}') for i in range(5)]
+        later = self.create_product(
+            name='Later', expiry_date=self.today + timedelta(days=300)
+        )
+
+        created = send_due_alerts(
+            self.today + timedelta(days=10), batch_size=2
+        )
+
+        self.assertEqual(created, 5)
+        for product in products:
+            self.assertEqual(self.alerts(product), [(90, self.expiry)])
+        self.assertEqual(self.alerts(later), [])
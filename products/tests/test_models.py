@@ -0,0 +1,38 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from products.models import Product
+
+
+class ProductExpiryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='expiry')
+
+    def test_create_with_expiry_date_string(self):
+        product = Product.objects.create(
+            user=self.user,
+            name='Vitamin C Serum',
+            brand='Brand',
+            product_type='serum',
+            expiry_date='2099-11-01',
+        )
+
+        self.assertEqual(product.expiry_date, date(2099, 11, 1))
+        self.assertEqual(product.expiry_alert_days, 90)
+        self.assertEqual(product.expiry_alert_on, date(2099, 8, 3))
+
+    def test_changing_expiry_date_with_string_reschedules(self):
+        product = Product.objects.create(
+            user=self.user,
+            name='Retinol',
+            brand='Brand',
+            product_type='serum',
+            expiry_date=date(2099, 11, 1),
+        )
+        product.expiry_date = '2000-01-01'
+        product.save()
+
+        self.assertIsNone(product.expiry_alert_on)
+        self.assertIsNone(product.expiry_alert_days)
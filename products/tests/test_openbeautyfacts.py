@@ -0,0 +1,267 @@
+import json
+import logging
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from products import openbeautyfacts
+from products.models import Product
+
+
+class StubSearchHandler(BaseHTTPRequestHandler):
+    """Answers ``/cgi/search.pl`` like Open Beauty Facts.
+
+    Each category has ``server.total`` products; ``server.failures`` maps
+    ``(category, page)`` to how many times that page answers 503 first.
+    """
+
+    def do_GET(self):
+        server = self.server
+        query = parse_qs(urlparse(self.path).query)
+        category = query['search_terms'][0].split()[0]
+        page = int(query['page'][0])
+        size = int(query['page_size'][0])
+        with server.lock:
+            server.requests.append((category, page, time.monotonic()))
+            failures = server.failures.get((category, page), 0)
+            if failures:
+                server.failures[(category, page)] = failures - 1
+        if failures:
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        start = (page - 1) * size
+        products = [
+            {
+                '_id': f'{category}-{i}',
+                'product_name': f'{category} {i}',
+                'brands': 'Brand, Other',
+                'categories': category,
+                'ingredients_text': 'Aqua',
+            }
+            for i in range(start, min(server.total, start + size))
+        ]
+        body = json.dumps({'count': server.total, 'products': products})
+        body = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServerMixin:
+    """Runs a local stub search server and points the importer at it."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubSearchHandler)
+        cls.server.lock = threading.Lock()
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.cache_dir = tempfile.TemporaryDirectory()
+        url = 'http://127.0.0.1:{}/cgi/search.pl'.format(
+            cls.server.server_port
+        )
+        cls.settings_override = override_settings(
+            OPENBEAUTYFACTS_SEARCH_URL=url,
+            OPENBEAUTYFACTS_CACHE_PATH=cls.cache_dir.name + '/obf.sqlite3',
+        )
+        cls.settings_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.cache_dir.cleanup()
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+        quiet_importer_logs(self)
+        self.server.total = 12
+        self.server.failures = {}
+        self.server.requests = []
+
+    def requested_pages(self, category):
+        return sorted(
+            page for name, page, _ in self.server.requests if name == category
+        )
+
+
+class IterProductsTests(StubServerMixin, SimpleTestCase):
+    def fetch(self, categories, **kwargs):
+        kwargs.setdefault('rate', 0)
+        kwargs.setdefault('cache_mode', 'off')
+        return list(openbeautyfacts.iter_products(categories, **kwargs))
+
+    def test_fetches_every_page_needed(self):
+        products = self.fetch(['serum'], limit=10, page_size=4)
+
+        self.assertEqual(self.requested_pages('serum'), [1, 2, 3])
+        self.assertEqual(len(products), 10)
+        # Pages 2 and 3 are fetched concurrently, so which of them fills
+        # the limit first depends on timing.
+        names = {p['name'] for p in products}
+        self.assertEqual(len(names), 10)
+        self.assertLessEqual(
+            names, {'serum {}'.format(i) for i in range(12)}
+        )
+        self.assertLessEqual({'serum {}'.format(i) for i in range(4)}, names)
+        self.assertEqual(products[0]['brand'], 'Brand')
+
+    def test_stops_at_last_page(self):
+        self.server.total = 6
+
+        products = self.fetch(['toner'], limit=20, page_size=4)
+
+        self.assertEqual(self.requested_pages('toner'), [1, 2])
+        self.assertEqual(len(products), 6)
+
+    def test_retries_server_errors(self):
+        self.server.failures = {('serum', 2): 1}
+
+        products = self.fetch(['serum'], limit=8, page_size=4)
+
+        self.assertEqual(self.requested_pages('serum'), [1, 2, 2])
+        self.assertEqual(len(products), 8)
+
+    def test_page_failing_after_retries_is_skipped(self):
+        self.server.failures = {('serum', 2): 5}
+
+        with self.assertLogs('products.openbeautyfacts', 'WARNING'):
+            products = self.fetch(
+                ['serum'], limit=8, page_size=4,
+                session=openbeautyfacts.make_session(retries=1),
+            )
+
+        self.assertEqual(self.requested_pages('serum'), [1, 2, 2])
+        self.assertEqual(len(products), 4)
+
+    def test_rate_limit_spaces_out_requests(self):
+        # 600 a minute: one request every 0.1s, even with four workers.
+        self.fetch(['serum'], limit=12, page_size=3, rate=600, workers=4)
+
+        starts = sorted(at for _, _, at in self.server.requests)
+        self.assertEqual(len(starts), 4)
+        gaps = [b - a for a, b in zip(starts, starts[1:])]
+        self.assertGreaterEqual(min(gaps), 0.08)
+
+    def test_rate_limiter_schedules_request_starts(self):
+        limiter = openbeautyfacts.RateLimiter(per_minute=1200)
+        with mock.patch.object(openbeautyfacts.time, 'sleep') as sleep:
+            for _ in range(3):
+                limiter.wait()
+
+        self.assertEqual(sleep.call_count, 2)
+        self.assertAlmostEqual(sleep.call_args_list[-1][0][0], 0.1, places=2)
+
+
+class ImportStreamingTests(StubServerMixin, TestCase):
+    def test_batches_are_saved_while_pages_download(self):
+        user = User.objects.create_user(username='obf-import')
+        saved_at = []
+
+        def progress(fetched, expected):
+            saved_at.append(
+                (fetched, Product.objects.filter(user=user).count(),
+                 len(self.server.requests))
+            )
+
+        with mock.patch.object(openbeautyfacts, 'SAVE_BATCH_SIZE', 4):
+            results = openbeautyfacts.import_openbeautyfacts_products(
+                'serum', user, limit=12, page_size=4, workers=1, rate=600,
+                progress=progress, cache_mode='off',
+            )
+
+        self.assertEqual(results['created'], 12)
+        self.assertEqual(results['fetched'], 12)
+        self.assertEqual([fetched for fetched, _, _ in saved_at], [4, 8, 12])
+        # Each batch is in the database when progress is reported ...
+        self.assertEqual([count for _, count, _ in saved_at], [4, 8, 12])
+        # ... and the first was saved before the last page was requested.
+        self.assertLess(saved_at[0][2], 3)
+        self.assertEqual(results['stats']['stages']['persist']['items'], 12)
+
+    def test_logs_plain_text(self):
+        user = User.objects.create_user(username='obf-logs')
+
+        with self.assertLogs(openbeautyfacts.logger, 'INFO') as logs:
+            openbeautyfacts.import_openbeautyfacts_products(
+                'serum', user, limit=4, page_size=4, workers=1, rate=0,
+                cache_mode='off',
+            )
+
+        messages = [record.getMessage() for record in logs.records]
+        self.assertIn("Found 12 'serum' products", messages)
+        self.assertIn(
+            'Import completed: 4 created, 0 updated, 0 skipped', messages
+        )
+        for message in messages:
+            with self.subTest(message=message):
+                self.assertTrue(message.isascii())
+
+
+def quiet_importer_logs(test):
+    """Keep the importer's progress messages out of the test output."""
+    logger = openbeautyfacts.logger
+    test.addCleanup(logger.setLevel, logger.level)
+    logger.setLevel(logging.WARNING)
+
+
+def product_data(name, brand='Brand'):
+    return {'name': name, 'brand': brand, 'product_type': 'serum'}
+
+
+class SaveProductsTests(TestCase):
+    def setUp(self):
+        quiet_importer_logs(self)
+        self.user = User.objects.create_user(username='obf-save')
+
+    def test_skips_existing_products(self):
+        Product.objects.create(
+            user=self.user, name='Serum A', brand='Brand', product_type='serum'
+        )
+
+        results = openbeautyfacts.save_products_to_database(
+            [product_data('Serum A'), product_data('Serum B')], self.user
+        )
+
+        self.assertEqual(results, {'created': 1, 'updated': 0, 'skipped': 1})
+        self.assertEqual(Product.objects.filter(user=self.user).count(), 2)
+
+    def test_row_inserted_concurrently_does_not_fail_batch(self):
+        build = openbeautyfacts._build_product
+
+        def build_after_other_import(pdata, user, catalog_product):
+            # Another import saves the same product after the lookup.
+            if pdata['name'] == 'Serum A':
+                Product.objects.create(user=user, **pdata)
+            return build(pdata, user, catalog_product)
+
+        with mock.patch.object(
+            openbeautyfacts, '_build_product', build_after_other_import
+        ):
+            openbeautyfacts.save_products_to_database(
+                [product_data('Serum A'), product_data('Serum B')], self.user
+            )
+
+        self.assertEqual(
+            sorted(
+                Product.objects.filter(user=self.user)
+                .values_list('name', flat=True)
+            ),
+            ['Serum A', 'Serum B'],
+        )
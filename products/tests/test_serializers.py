@@ -0,0 +1,40 @@
+import json
+from unittest import mock, skipIf
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from products import serializers
+from products.models import Product
+from products.serializers import ProductSerializer, dumps_json, product_rows
+
+
+class ProductRowsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='rows')
+        Product.objects.create(
+            user=self.user, name='Crème Hydratante', brand='Avène',
+            product_type='moisturizer', expiry_date='2030-01-01', rating=4,
+        )
+        self.queryset = Product.objects.filter(user=self.user)
+
+    def test_rows_match_the_serializer(self):
+        fields = list(ProductSerializer.Meta.fields)
+
+        rows = list(product_rows(self.queryset, fields, str(self.user)))
+
+        expected = json.loads(json.dumps(
+            ProductSerializer(self.queryset, many=True).data
+        ))
+        self.assertEqual(json.loads(dumps_json(rows)), expected)
+
+    @skipIf(serializers.orjson is None, 'orjson is not installed')
+    def test_orjson_and_stdlib_output_match(self):
+        fields = list(ProductSerializer.Meta.fields)
+        rows = list(product_rows(self.queryset, fields, str(self.user)))
+
+        fast = dumps_json(rows)
+        with mock.patch.object(serializers, 'orjson', None):
+            fallback = dumps_json(rows)
+
+        self.assertEqual(fast, fallback)
@@ -7,6 +7,7 @@ urlpatterns = [
     # Web interface URLs
     path('', views.product_list, name='list'),
     path('add/', views.product_create, name='create'),
+    path('import/', views.product_import, name='import'),
     path('edit/<int:pk>/', views.product_edit, name='edit'),
     path('delete/<int:pk>/', views.product_delete, name='delete'),
 ]
\ No newline at end of file
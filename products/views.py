@@ -1,14 +1,20 @@
+import json
+
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.http import JsonResponse
 from django.urls import reverse
-from rest_framework import generics, permissions
-from rest_framework.response import Response
+from django.views.decorators.http import require_http_methods
+
+from jobs.models import Job
+from jobs.queue import enqueue
 
 from .models import Product
-from .forms import ProductForm
-from .serializers import ProductSerializer, ProductCreateSerializer
+from . import autocomplete, catalog, dedupe, expiry, tasks
+from .bulk_import import ImportFormatError, detect_format, import_products
+from .forms import ProductForm, ProductImportForm
 
 
 @login_required
@@ -149,196 +155,300 @@ def product_delete(request, pk):
     )
 
 
-class ProductListCreateAPIView(generics.ListCreateAPIView):
-    """API endpoint for listing and creating products."""
-    permission_classes = [permissions.IsAuthenticated]
-
-    def get_queryset(self):
-        return Product.objects.filter(user=self.request.user)
-
-    def get_serializer_class(self):
-        if self.request.method == 'POST':
-            return ProductCreateSerializer
-        return ProductSerializer
+@login_required
+def product_import(request):
+    """Bulk import products from an uploaded CSV or JSON file."""
+    is_ajax = request.headers.get('x-requested-with') == 'XMLHttpRequest'
+    results = None
 
-    def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+    if request.method == 'POST':
+        form = ProductImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            upload = form.cleaned_data['file']
+            fmt = detect_format(upload.name, upload.content_type)
+            try:
+                if fmt is None:
+                    raise ImportFormatError(
+                        'Please upload a .csv or .json file.'
+                    )
+                results = import_products(request.user, upload, fmt)
+            except ImportFormatError as exc:
+                form.add_error('file', str(exc))
+            else:
+                summary = (
+                    'Import finished: {} added, {} updated, {} skipped.'
+                ).format(
+                    results['created'], results['updated'],
+                    results['skipped'],
+                )
+                if is_ajax:
+                    return JsonResponse(
+                        {'status': 'success', 'message': summary, **results}
+                    )
+                if results['errors']:
+                    messages.warning(request, summary)
+                else:
+                    messages.success(request, summary)
+                    return redirect('products:list')
 
-    def list(self, request, *args, **kwargs):
-        """Return user's products; fallback to suggestions on error."""
-        try:
-            return super().list(request, *args, **kwargs)
-        except Exception:
-            category = request.GET.get('category', 'moisturizer')
-            suggestions = (
-                ProductBrowseByCategoryAPIView()
-                .create_default_suggestions(category)
-            )
-            serializer = ProductSerializer(
-                suggestions, many=True, context={'request': request}
-            )
-            return Response(serializer.data)
-
-
-class ProductRetrieveUpdateDestroyAPIView(
-    generics.RetrieveUpdateDestroyAPIView
-):
-    """API endpoint for single product retrieve/update/delete."""
-    serializer_class = ProductSerializer
-    permission_classes = [permissions.IsAuthenticated]
-
-    def get_queryset(self):
-        return Product.objects.filter(user=self.request.user)
-
-
-class ProductBrowseByCategoryAPIView(generics.ListAPIView):
-    """API endpoint for browsing products by category."""
-    serializer_class = ProductSerializer
-    permission_classes = []  # Public browsing allowed
-
-    def get_queryset(self):
-        category = self.kwargs.get('category', 'moisturizer')
-        db_products = Product.objects.filter(
-            product_type=category
-        ).order_by('brand', 'name')[:10]
-        if len(db_products) >= 4:
-            return db_products
-        return self.create_default_suggestions(category)
-
-    def create_default_suggestions(self, category):
-        """Create default product suggestions when DB is empty."""
-        default_products = {
-            'cleanser': [
-                {
-                    'name': 'Hydrating Foaming Oil Cleanser',
-                    'brand': 'CeraVe',
-                    'ingredients': (
-                        'Hyaluronic Acid, Ceramides, Niacinamide'
-                    ),
-                },
-                {
-                    'name': 'Gentle Skin Cleanser',
-                    'brand': 'Cetaphil',
-                    'ingredients': 'Sodium Cocoyl Glycinate, Glycerin',
-                },
-                {
-                    'name': 'Ultra Gentle Daily Cleanser',
-                    'brand': 'Neutrogena',
-                    'ingredients': 'Glycerin, Polyglyceryl-4 Caprate',
-                },
-                {
-                    'name': 'Squalane Cleanser',
-                    'brand': 'The Ordinary',
-                    'ingredients': 'Squalane, Aqua, Coco-Caprylate',
-                },
-            ],
-            'moisturizer': [
-                {
-                    'name': 'Daily Facial Moisturizing Lotion',
-                    'brand': 'CeraVe',
-                    'ingredients': 'Hyaluronic Acid, Ceramides',
-                },
-                {
-                    'name': 'Hydro Boost Water Gel',
-                    'brand': 'Neutrogena',
-                    'ingredients': 'Hyaluronic Acid, Glycerin',
-                },
-                {
-                    'name': 'Daily Facial Moisturizer',
-                    'brand': 'Cetaphil',
-                    'ingredients': 'Macadamia Oil, Dimethicone',
-                },
-                {
-                    'name': 'Natural Moisturizing Factors + HA',
-                    'brand': 'The Ordinary',
-                    'ingredients': 'Sodium Hyaluronate, PCA',
-                },
-            ],
-            'sunscreen': [
-                {
-                    'name': 'AM Facial Moisturizing Lotion SPF 30',
-                    'brand': 'CeraVe',
-                    'ingredients': 'Zinc Oxide, Niacinamide',
-                },
-                {
-                    'name': 'Ultra Sheer Dry-Touch SPF 45',
-                    'brand': 'Neutrogena',
-                    'ingredients': 'Avobenzone, Homosalate, Octisalate',
-                },
-                {
-                    'name': 'UV Clear Broad-Spectrum SPF 46',
-                    'brand': 'EltaMD',
-                    'ingredients': 'Zinc Oxide, Niacinamide',
-                },
-                {
-                    'name': 'Invisible Zinc Oxide SPF 50',
-                    'brand': 'Blue Lizard',
-                    'ingredients': 'Zinc Oxide, Titanium Dioxide',
-                },
-            ],
-            'serum': [
-                {
-                    'name': 'Vitamin C + E Ferulic Acid Serum',
-                    'brand': 'Skinceuticals',
-                    'ingredients': 'L-Ascorbic Acid, Vitamin E, Ferulic Acid',
-                },
-                {
-                    'name': 'Niacinamide 10% + Zinc 1%',
-                    'brand': 'The Ordinary',
-                    'ingredients': 'Niacinamide, Zinc PCA',
-                },
+        if is_ajax and form.errors:
+            return JsonResponse(
                 {
-                    'name': 'Hyaluronic Acid 2% + B5',
-                    'brand': 'The Ordinary',
-                    'ingredients': 'Sodium Hyaluronate, Panthenol',
+                    'status': 'error',
+                    'message': 'Please correct the errors below.',
+                    'errors': form.errors,
                 },
+                status=400,
+            )
+    else:
+        form = ProductImportForm()
+
+    return render(
+        request,
+        'products/product_import.html',
+        {'form': form, 'results': results},
+    )
+
+
+@login_required
+def product_autocomplete(request):
+    """AJAX endpoint: suggest products and brands for a typed prefix.
+
+    Served from an in-memory prefix index (see ``products.autocomplete``).
+    """
+    try:
+        limit = int(request.GET.get('limit', autocomplete.DEFAULT_LIMIT))
+    except (TypeError, ValueError):
+        limit = autocomplete.DEFAULT_LIMIT
+    limit = max(1, min(limit, autocomplete.MAX_LIMIT))
+
+    results = autocomplete.suggest(
+        request.user.pk, request.GET.get('q', ''), limit
+    )
+    return JsonResponse({'success': True, **results})
+
+
+@login_required
+def product_duplicates(request):
+    """AJAX endpoint: list groups of products that look like duplicates."""
+    groups = dedupe.find_duplicates(request.user)
+    return JsonResponse(
+        {
+            'success': True,
+            'groups': [
                 {
-                    'name': 'Vitamin C Brightening Serum',
-                    'brand': 'Mad Hippie',
-                    'ingredients': 'Sodium Ascorbyl Phosphate, HA',
-                },
+                    'score': group['score'],
+                    'products': [
+                        {
+                            'id': p.id,
+                            'name': p.name,
+                            'brand': p.brand,
+                            'product_type': p.product_type,
+                            'created_at': p.created_at.isoformat(),
+                        }
+                        for p in group['products']
+                    ],
+                }
+                for group in groups
             ],
-            'toner': [
-                {
-                    'name': 'Alcohol-Free Toner',
-                    'brand': 'Thayers',
-                    'ingredients': 'Witch Hazel, Aloe Vera',
-                },
-                {
-                    'name': 'Ultra Gentle Toner',
-                    'brand': 'Neutrogena',
-                    'ingredients': 'Glycerin, Cucumber Extract',
-                },
+        }
+    )
+
+
+@login_required
+@require_http_methods(["POST"])
+def merge_products(request):
+    """AJAX endpoint: merge duplicate products into one.
+
+    Accepts JSON or form data with ``keep_id`` and ``merge_ids`` (a list).
+    Routine steps using the merged products are moved to the kept one.
+    """
+    try:
+        if request.content_type == 'application/json':
+            payload = json.loads(request.body or '{}')
+            if not isinstance(payload, dict):
+                return JsonResponse(
+                    {'success': False, 'error': 'Expected a JSON object.'},
+                    status=400,
+                )
+            merge_ids = payload.get('merge_ids') or []
+            if not isinstance(merge_ids, list):
+                raise TypeError('merge_ids must be a list')
+        else:
+            payload = request.POST
+            merge_ids = payload.getlist('merge_ids')
+        keep_id = int(payload.get('keep_id'))
+        merge_ids = [int(pk) for pk in merge_ids]
+    except (TypeError, ValueError):
+        return JsonResponse(
+            {
+                'success': False,
+                'error': 'keep_id and merge_ids must be product ids.',
+            },
+            status=400,
+        )
+
+    if not merge_ids:
+        return JsonResponse(
+            {'success': False, 'error': 'merge_ids is required.'},
+            status=400,
+        )
+
+    try:
+        merged = dedupe.merge_products(request.user, keep_id, merge_ids)
+    except Product.DoesNotExist:
+        return JsonResponse(
+            {'success': False, 'error': 'Product not found.'},
+            status=404,
+        )
+
+    return JsonResponse(
+        {'success': True, 'kept_id': keep_id, 'merged': merged}
+    )
+
+
+@login_required
+def expiry_alerts(request):
+    """AJAX endpoint: the user's unread expiry alerts."""
+    alerts, count = expiry.unread_alerts(request.user)
+    return JsonResponse(
+        {
+            'success': True,
+            'count': count,
+            'alerts': [
                 {
-                    'name': 'Clarifying Toner',
-                    'brand': 'CeraVe',
-                    'ingredients': 'Niacinamide, Hyaluronic Acid',
-                },
+                    'id': alert.id,
+                    'product_id': alert.product_id,
+                    'product_name': alert.product.name,
+                    'days_before': alert.days_before,
+                    'expiry_date': alert.expiry_date.isoformat(),
+                    'message': alert.message,
+                    'created_at': alert.created_at.isoformat(),
+                }
+                for alert in alerts
             ],
         }
+    )
+
+
+@login_required
+@require_http_methods(["POST"])
+def mark_alerts_read(request):
+    """AJAX endpoint: mark expiry alerts as read.
 
-        products_data = default_products.get(
-            category, default_products['moisturizer']
+    Accepts JSON or form data with ``ids`` (a list); without it every
+    unread alert is marked.
+    """
+    try:
+        if request.content_type == 'application/json':
+            ids = json.loads(request.body or '{}').get('ids')
+        else:
+            ids = request.POST.getlist('ids') or None
+        if ids is not None:
+            ids = [int(pk) for pk in ids]
+    except (AttributeError, TypeError, ValueError):
+        return JsonResponse(
+            {'success': False, 'error': 'ids must be a list of alert ids.'},
+            status=400,
         )
 
-        suggestions = []
-        for i, pdata in enumerate(products_data):
-            product = Product(
-                id=9000 + i,
-                name=pdata['name'],
-                brand=pdata['brand'],
-                product_type=category,
-                ingredients=pdata.get('ingredients', ''),
-                description='Popular {} product'.format(category),
-                external_id='default_{}_{}'.format(category, i),
+    marked = expiry.mark_read(request.user, ids)
+    return JsonResponse({'success': True, 'marked': marked})
+
+
+@login_required
+@require_http_methods(["POST"])
+def enqueue_openbeautyfacts_import(request):
+    """AJAX endpoint: import Open Beauty Facts products in the background.
+
+    Accepts JSON or form data with ``categories`` (a list, or a
+    comma-separated string), ``limit`` (per category) and ``overwrite``.
+    Responds 202 with the job; poll ``/api/jobs/<id>/`` for progress.
+    """
+    if request.content_type == 'application/json':
+        try:
+            payload = json.loads(request.body or '{}')
+        except ValueError:
+            payload = None
+        if not isinstance(payload, dict):
+            return JsonResponse(
+                {'success': False, 'error': 'Invalid JSON body.'},
+                status=400,
             )
-            suggestions.append(product)
+        categories = payload.get('categories') or []
+    else:
+        payload = request.POST
+        categories = payload.getlist('categories')
+    if isinstance(categories, str):
+        categories = [categories]
+    categories = [
+        c.strip()
+        for value in categories if isinstance(value, str)
+        for c in value.split(',') if c.strip()
+    ]
+
+    try:
+        limit = int(payload.get('limit') or 10)
+    except (TypeError, ValueError):
+        limit = 0
+    overwrite = str(payload.get('overwrite', '')).lower() in (
+        '1', 'true', 'yes', 'on'
+    )
 
-        return suggestions
+    if not 1 <= len(categories) <= tasks.MAX_IMPORT_CATEGORIES:
+        return JsonResponse(
+            {
+                'success': False,
+                'error': 'Give between 1 and {} categories.'.format(
+                    tasks.MAX_IMPORT_CATEGORIES
+                ),
+            },
+            status=400,
+        )
+    if not 1 <= limit <= tasks.MAX_IMPORT_LIMIT:
+        return JsonResponse(
+            {
+                'success': False,
+                'error': 'limit must be between 1 and {}.'.format(
+                    tasks.MAX_IMPORT_LIMIT
+                ),
+            },
+            status=400,
+        )
+
+    # One import at a time per user.
+    active = Job.objects.filter(
+        user=request.user,
+        kind=tasks.OBF_IMPORT,
+        status__in=[Job.QUEUED, Job.RUNNING],
+    ).first()
+    if active:
+        return JsonResponse(
+            {
+                'success': False,
+                'error': 'An import is already in progress.',
+                'job': active.as_dict(),
+            },
+            status=409,
+        )
+
+    job = enqueue(
+        tasks.OBF_IMPORT,
+        {'categories': categories, 'limit': limit, 'overwrite': overwrite},
+        user=request.user,
+    )
+    return JsonResponse(
+        {
+            'success': True,
+            'job': job.as_dict(),
+            'status_url': reverse('jobs:status', args=[job.pk]),
+        },
+        status=202,
+    )
 
 
 @login_required
-def quick_add_product(request):
+async def quick_add_product(request):
     """AJAX endpoint for quick product add during routine creation."""
     if request.method != 'POST':
         return JsonResponse(
@@ -360,11 +470,12 @@ def quick_add_product(request):
                 status=400,
             )
 
-        product = Product.objects.create(
-            user=request.user,
+        product = await Product.objects.acreate(
+            user=await request.auser(),
             name=name,
             brand=brand,
             product_type=product_type,
+            catalog_product=await sync_to_async(catalog.find)(brand, name),
         )
 
         return JsonResponse(
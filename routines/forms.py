@@ -1,8 +1,71 @@
 from django import forms
+from django.forms.models import ModelChoiceIterator
 from .models import Routine, RoutineStep
 from products.models import Product
 
 
+class CachedProductChoiceIterator(ModelChoiceIterator):
+    """Yield choices from products the form already fetched."""
+
+    def __iter__(self):
+        if self.field.cached_products is None:
+            yield from super().__iter__()
+            return
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        for obj in self.field.cached_products:
+            yield self.choice(obj)
+
+    def __len__(self):
+        if self.field.cached_products is None:
+            return super().__len__()
+        extra = 1 if self.field.empty_label is not None else 0
+        return len(self.field.cached_products) + extra
+
+    def __bool__(self):
+        if self.field.cached_products is None:
+            return super().__bool__()
+        return (
+            self.field.empty_label is not None
+            or bool(self.field.cached_products)
+        )
+
+
+class ProductChoiceField(forms.ModelChoiceField):
+    """ModelChoiceField that can share one product list across fields.
+
+    Once ``use_products()`` is called, rendering and validation work off
+    that list instead of querying ``queryset`` for every field.
+    """
+
+    iterator = CachedProductChoiceIterator
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cached_products = None
+        self.products_by_pk = None
+
+    def use_products(self, products, products_by_pk):
+        self.cached_products = products
+        self.products_by_pk = products_by_pk
+
+    def to_python(self, value):
+        if self.products_by_pk is None:
+            return super().to_python(value)
+        if value in self.empty_values:
+            return None
+        if isinstance(value, Product):
+            value = value.pk
+        try:
+            return self.products_by_pk[int(value)]
+        except (KeyError, TypeError, ValueError):
+            raise forms.ValidationError(
+                self.error_messages['invalid_choice'],
+                code='invalid_choice',
+                params={'value': value},
+            )
+
+
 class RoutineCreateForm(forms.Form):
     routine_name = forms.CharField(
         max_length=100,
@@ -17,7 +80,7 @@ class RoutineCreateForm(forms.Form):
     step1 = forms.CharField(
         max_length=200, required=False, label='Step 1'
     )
-    product1 = forms.ModelChoiceField(
+    product1 = ProductChoiceField(
         queryset=Product.objects.none(),
         required=False,
         label='Product (optional)',
@@ -28,7 +91,7 @@ class RoutineCreateForm(forms.Form):
     step2 = forms.CharField(
         max_length=200, required=False, label='Step 2'
     )
-    product2 = forms.ModelChoiceField(
+    product2 = ProductChoiceField(
         queryset=Product.objects.none(),
         required=False,
         label='Product (optional)',
@@ -39,7 +102,7 @@ class RoutineCreateForm(forms.Form):
     step3 = forms.CharField(
         max_length=200, required=False, label='Step 3'
     )
-    product3 = forms.ModelChoiceField(
+    product3 = ProductChoiceField(
         queryset=Product.objects.none(),
         required=False,
         label='Product (optional)',
@@ -50,7 +113,7 @@ class RoutineCreateForm(forms.Form):
     step4 = forms.CharField(
         max_length=200, required=False, label='Step 4'
     )
-    product4 = forms.ModelChoiceField(
+    product4 = ProductChoiceField(
         queryset=Product.objects.none(),
         required=False,
         label='Product (optional)',
@@ -61,7 +124,7 @@ class RoutineCreateForm(forms.Form):
     step5 = forms.CharField(
         max_length=200, required=False, label='Step 5'
     )
-    product5 = forms.ModelChoiceField(
+    product5 = ProductChoiceField(
         queryset=Product.objects.none(),
         required=False,
         label='Product (optional)',
@@ -73,7 +136,7 @@ class RoutineCreateForm(forms.Form):
     step6 = forms.CharField(
         max_length=200, required=False, label='Step 6'
     )
-    product6 = forms.ModelChoiceField(
+    product6 = ProductChoiceField(
         queryset=Product.objects.none(),
         required=False,
         label='Product (optional)',
@@ -84,7 +147,7 @@ class RoutineCreateForm(forms.Form):
     step7 = forms.CharField(
         max_length=200, required=False, label='Step 7'
     )
-    product7 = forms.ModelChoiceField(
+    product7 = ProductChoiceField(
         queryset=Product.objects.none(),
         required=False,
         label='Product (optional)',
@@ -95,7 +158,7 @@ class RoutineCreateForm(forms.Form):
     step8 = forms.CharField(
         max_length=200, required=False, label='Step 8'
     )
-    product8 = forms.ModelChoiceField(
+    product8 = ProductChoiceField(
         queryset=Product.objects.none(),
         required=False,
         label='Product (optional)',
@@ -106,7 +169,7 @@ class RoutineCreateForm(forms.Form):
     step9 = forms.CharField(
         max_length=200, required=False, label='Step 9'
     )
-    product9 = forms.ModelChoiceField(
+    product9 = ProductChoiceField(
         queryset=Product.objects.none(),
         required=False,
         label='Product (optional)',
@@ -117,7 +180,7 @@ class RoutineCreateForm(forms.Form):
     step10 = forms.CharField(
         max_length=200, required=False, label='Step 10'
     )
-    product10 = forms.ModelChoiceField(
+    product10 = ProductChoiceField(
         queryset=Product.objects.none(),
         required=False,
         label='Product (optional)',
@@ -129,13 +192,17 @@ class RoutineCreateForm(forms.Form):
         user = kwargs.pop('user', None)
         super().__init__(*args, **kwargs)
 
-        # Show only the user's products
+        # Show only the user's products. Fetch them once and share the
+        # list across every step's field, so rendering and validating cost
+        # one query however many steps the form has.
         if user:
             user_products = Product.objects.filter(user=user)
-            for i in range(1, 11):
-                field = self.fields.get(f'product{i}')
-                if field is not None:
+            products = list(user_products)
+            products_by_pk = {p.pk: p for p in products}
+            for field in self.fields.values():
+                if isinstance(field, ProductChoiceField):
                     field.queryset = user_products
+                    field.use_products(products, products_by_pk)
 
     def clean(self):
         cleaned = super().clean()
@@ -0,0 +1,140 @@
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from routines.models import Routine, RoutineStep
+
+
+class Command(BaseCommand):
+    help = (
+        'Start gunicorn in WSGI (sync workers) and ASGI (uvicorn workers) '
+        'mode and compare how each handles many concurrent connections to '
+        'a JSON endpoint. Creates a temporary user and deletes it afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            nargs='+',
+            default=[10, 50, 200],
+            help='Simultaneous connections to test (default: 10 50 200)'
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=1000,
+            help='Requests per concurrency level (default: 1000)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=2,
+            help='Gunicorn worker processes in both modes (default: 2)'
+        )
+        parser.add_argument(
+            '--modes',
+            nargs='+',
+            choices=['wsgi', 'asgi'],
+            default=['wsgi', 'asgi'],
+            help='Server modes to compare (default: wsgi asgi)'
+        )
+
+    def handle(self, *args, **options):
+        user = User.objects.create_user(username='benchmark-server-modes')
+        try:
+            routine = Routine.objects.create(
+                user=user, name='Benchmark', routine_type='morning'
+            )
+            RoutineStep.objects.bulk_create(
+                RoutineStep(routine=routine, step_name=f'Step {i}', order=i)
+                for i in range(1, 6)
+            )
+            client = Client()
+            client.force_login(user)
+            cookies = {
+                settings.SESSION_COOKIE_NAME:
+                    client.cookies[settings.SESSION_COOKIE_NAME].value,
+            }
+            path = f'/routines/get-routine-data/{routine.pk}/'
+
+            for mode in options['modes']:
+                self.run_mode(mode, path, cookies, options)
+        finally:
+            user.delete()
+
+    def run_mode(self, mode, path, cookies, options):
+        port = self.free_port()
+        env = dict(os.environ, SERVER_MODE=mode)
+        server = subprocess.Popen(
+            [
+                sys.executable, '-m', 'gunicorn',
+                '--bind', f'127.0.0.1:{port}',
+                '--workers', str(options['workers']),
+                '--log-level', 'warning',
+            ],
+            cwd=settings.BASE_DIR,
+            env=env,
+        )
+        url = f'http://127.0.0.1:{port}{path}'
+        try:
+            self.wait_until_up(url, cookies)
+            for concurrency in options['concurrency']:
+                self.load(mode, url, cookies, concurrency, options['requests'])
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+    def load(self, mode, url, cookies, concurrency, total):
+        def fetch(_):
+            start = time.perf_counter()
+            try:
+                response = requests.get(url, cookies=cookies, timeout=60)
+                ok = response.status_code == 200
+            except requests.exceptions.RequestException:
+                ok = False
+            return ok, (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(fetch, range(total)))
+        elapsed = time.perf_counter() - start
+
+        timings = sorted(ms for ok, ms in results if ok)
+        errors = sum(1 for ok, _ in results if not ok)
+        if not timings:
+            self.stdout.write(f'{mode}  c={concurrency:<4}  all requests failed')
+            return
+        p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+        self.stdout.write(
+            f'{mode}  c={concurrency:<4}  {len(timings) / elapsed:8.1f} req/s  '
+            f'p50 {statistics.median(timings):8.1f} ms  p95 {p95:8.1f} ms  '
+            f'{errors} errors'
+        )
+
+    @staticmethod
+    def wait_until_up(url, cookies, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                requests.get(url, cookies=cookies, timeout=5)
+                return
+            except requests.exceptions.ConnectionError:
+                time.sleep(0.2)
+        raise CommandError(f'Server did not start: {url}')
+
+    @staticmethod
+    def free_port():
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            return sock.getsockname()[1]
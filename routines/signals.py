@@ -0,0 +1,29 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from config import http_cache
+
+from .models import DailyCompletion, Routine, RoutineStep
+
+
+@receiver(post_save, sender=Routine)
+@receiver(post_delete, sender=Routine)
+@receiver(post_save, sender=DailyCompletion)
+@receiver(post_delete, sender=DailyCompletion)
+def bump_http_version(sender, instance, **kwargs):
+    http_cache.bump_user_version(instance.user_id)
+
+
+@receiver(post_save, sender=RoutineStep)
+@receiver(post_delete, sender=RoutineStep)
+def bump_http_version_for_step(sender, instance, **kwargs):
+    # Steps loaded through routine.steps already have their routine.
+    if RoutineStep.routine.is_cached(instance):
+        user_id = instance.routine.user_id
+    else:
+        user_id = (
+            Routine.objects.filter(pk=instance.routine_id)
+            .values_list('user_id', flat=True)
+            .first()
+        )
+    http_cache.bump_user_version(user_id)
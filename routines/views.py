@@ -2,42 +2,68 @@ from datetime import date, timedelta
 import calendar
 import json
 
+from django.conf import settings
 from django.contrib import messages
 from django.db import models
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
-from django.shortcuts import get_object_or_404, redirect, render
+from django.shortcuts import (
+    aget_object_or_404,
+    get_object_or_404,
+    redirect,
+    render,
+)
 from django.urls import reverse
 from django.utils import timezone
 from django.views.decorators.http import require_http_methods
 
 from .forms import RoutineCreateForm
 from .models import DailyCompletion, Routine, RoutineStep
+from config import http_cache
+from products import expiry
 from products.models import Product
 from users.models import UserProfile
 
 
+def _dashboard_validators(request):
+    """The dashboard only changes with the user's data, the day and the
+    release (its asset URLs); pages with a flash message are never reused.
+    """
+    version = http_cache.user_version(request.user.pk)
+    if version is None or len(messages.get_messages(request)):
+        return None
+    return (
+        request.user.pk,
+        version,
+        date.today(),
+        request.GET.urlencode(),
+        # Keeps the page's CSRF token valid after it rotates on login
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME),
+        settings.CACHE_KEY_PREFIX,
+    ), None
+
+
+def _routine_data_validators(request, pk):
+    version = http_cache.user_version(request.user.pk)
+    if version is None:
+        return None
+    return (request.user.pk, version, pk), None
+
+
 @login_required
+@http_cache.conditional_response(_dashboard_validators)
 def dashboard(request):
     """Dashboard: routines, progress, calendar and products."""
-    weekly_routine = Routine.objects.filter(
-        user=request.user, routine_type="weekly"
-    ).first()
-    monthly_routine = Routine.objects.filter(
-        user=request.user, routine_type="monthly"
-    ).first()
-    hair_routine = Routine.objects.filter(
-        user=request.user, routine_type="hair"
-    ).first()
-    body_routine = Routine.objects.filter(
-        user=request.user, routine_type="body"
-    ).first()
-    special_routine = Routine.objects.filter(
-        user=request.user, routine_type="special"
-    ).first()
-    seasonal_routine = Routine.objects.filter(
-        user=request.user, routine_type="seasonal"
-    ).first()
+    # The first routine of each type, from one query instead of eight
+    routines_by_type = {}
+    for routine in Routine.objects.filter(user=request.user).order_by("pk"):
+        routines_by_type.setdefault(routine.routine_type, routine)
+    weekly_routine = routines_by_type.get("weekly")
+    monthly_routine = routines_by_type.get("monthly")
+    hair_routine = routines_by_type.get("hair")
+    body_routine = routines_by_type.get("body")
+    special_routine = routines_by_type.get("special")
+    seasonal_routine = routines_by_type.get("seasonal")
 
     today = date.today()
     year = today.year
@@ -48,12 +74,8 @@ def dashboard(request):
     end_date = date(year, month, last_day)
 
     try:
-        morning_routine = Routine.objects.filter(
-            user=request.user, routine_type="morning"
-        ).first()
-        evening_routine = Routine.objects.filter(
-            user=request.user, routine_type="evening"
-        ).first()
+        morning_routine = routines_by_type.get("morning")
+        evening_routine = routines_by_type.get("evening")
         completions = DailyCompletion.objects.filter(
             user=request.user, date__gte=start_date, date__lte=end_date
         )
@@ -300,36 +322,8 @@ def dashboard(request):
         user=request.user, is_favorite=True
     )[:5]
 
-    # === Product expiry events ===
-    expiry_threshold = today + timedelta(days=90)
-    expiring_products = Product.objects.filter(
-        user=request.user,
-        expiry_date__lte=expiry_threshold,
-        expiry_date__gte=today,
-    ).order_by("expiry_date")
-
-    expiry_events = []
-    for product in expiring_products:
-        days_until_expiry = (product.expiry_date - today).days
-        if days_until_expiry < 0:
-            status = "expired"
-        elif days_until_expiry <= 30:
-            status = "warning"
-        else:
-            status = "info"
-
-        expiry_events.append(
-            {
-                "date": product.expiry_date.strftime("%Y-%m-%d"),
-                "title": f"{product.name} expires",
-                "type": "expiry",
-                "status": status,
-                "product_name": product.name,
-                "brand": product.brand,
-                "days_until": days_until_expiry,
-                "expiry_date": product.expiry_date.strftime("%Y-%m-%d"),
-            }
-        )
+    # === Product expiry events (cached per user per day) ===
+    expiry_summary = expiry.dashboard_summary(request.user, today)
 
     # Mark if favorites were used on days (simplified)
     for event in routine_events:
@@ -366,8 +360,8 @@ def dashboard(request):
             "user_skin_type": user_skin_type,
             "skin_type_products": skin_type_products,
             "favorite_products": favorite_products,
-            "expiring_products": expiring_products,
-            "expiry_events_json": json.dumps(expiry_events),
+            "expiring_products": expiry_summary["products"],
+            "expiry_events_json": json.dumps(expiry_summary["events"]),
         },
     )
 
@@ -418,8 +412,9 @@ def add_routine(request):
                     }
                 )
 
-            request.session["last_added_routine_name"] = routine.name
-            return redirect(reverse("routines:add"))
+            # Passed in the URL rather than the session so that adding a
+            # routine doesn't cost a session write (and a second to pop it).
+            return redirect(f'{reverse("routines:add")}?created={routine.pk}')
         else:
             if (
                 request.headers.get("x-requested-with") == "XMLHttpRequest"
@@ -451,7 +446,14 @@ def add_routine(request):
         initial["routine_type"] = pre_type
 
     form = RoutineCreateForm(initial=initial, user=request.user)
-    just_created_name = request.session.pop("last_added_routine_name", None)
+    just_created_name = None
+    created = request.GET.get("created", "")
+    if created.isdigit():
+        just_created_name = (
+            Routine.objects.filter(user=request.user, pk=created)
+            .values_list("name", flat=True)
+            .first()
+        )
     context = {
         "form": form,
         "is_editing": False,
@@ -543,8 +545,8 @@ def edit_routine(request, pk):
         }
         for i, step in enumerate(existing_steps, 1):
             initial_data[f"step{i}"] = step.step_name
-            if step.product:
-                initial_data[f"product{i}"] = step.product.id
+            if step.product_id:
+                initial_data[f"product{i}"] = step.product_id
 
         form = RoutineCreateForm(initial=initial_data, user=request.user)
         context = {
@@ -558,7 +560,7 @@ def edit_routine(request, pk):
 
 @login_required
 @require_http_methods(["POST"])
-def mark_routine_complete(request):
+async def mark_routine_complete(request):
     """AJAX: mark all steps in a routine complete for today."""
     try:
         data = json.loads(request.body)
@@ -570,13 +572,14 @@ def mark_routine_complete(request):
                 {"success": False, "error": "Routine ID is required"}
             )
 
-        routine = get_object_or_404(Routine, id=routine_id, user=request.user)
+        user = await request.auser()
+        routine = await aget_object_or_404(Routine, id=routine_id, user=user)
         today = date.today()
         completed_count = 0
 
-        for step in routine.steps.all():
-            completion, created = DailyCompletion.objects.get_or_create(
-                user=request.user,
+        async for step in routine.steps.all():
+            completion, created = await DailyCompletion.objects.aget_or_create(
+                user=user,
                 routine_step=step,
                 date=today,
                 defaults={"completed": True, "completed_at": timezone.now()},
@@ -584,7 +587,7 @@ def mark_routine_complete(request):
             if not created and not completion.completed:
                 completion.completed = True
                 completion.completed_at = timezone.now()
-                completion.save()
+                await completion.asave()
             completed_count += 1
 
         return JsonResponse(
@@ -608,7 +611,7 @@ def mark_routine_complete(request):
 
 @login_required
 @require_http_methods(["POST"])
-def toggle_step_completion(request):
+async def toggle_step_completion(request):
     """AJAX: toggle a single step completion for today."""
     try:
         data = json.loads(request.body)
@@ -618,9 +621,10 @@ def toggle_step_completion(request):
                 {"success": False, "error": "Step ID is required"}
             )
 
+        user = await request.auser()
         try:
-            step = RoutineStep.objects.get(
-                id=step_id, routine__user=request.user
+            step = await RoutineStep.objects.aget(
+                id=step_id, routine__user=user
             )
         except RoutineStep.DoesNotExist:
             return JsonResponse(
@@ -628,8 +632,8 @@ def toggle_step_completion(request):
             )
 
         today = date.today()
-        completion, created = DailyCompletion.objects.get_or_create(
-            user=request.user, routine_step=step, date=today,
+        completion, created = await DailyCompletion.objects.aget_or_create(
+            user=user, routine_step=step, date=today,
             defaults={"completed": False}
         )
 
@@ -637,7 +641,7 @@ def toggle_step_completion(request):
         completion.completed_at = (
             timezone.now() if completion.completed else None
         )
-        completion.save()
+        await completion.asave()
 
         return JsonResponse(
             {
@@ -660,19 +664,20 @@ def toggle_step_completion(request):
 
 
 @login_required
-def get_routine_data(request, pk):
+@http_cache.conditional_response(_routine_data_validators)
+async def get_routine_data(request, pk):
     """Return routine data for modal editing (JSON)."""
     try:
-        routine = get_object_or_404(Routine, pk=pk, user=request.user)
-        steps_data = []
-        for step in routine.steps.all().order_by("order"):
-            steps_data.append(
-                {
-                    "step_name": step.step_name,
-                    "product_id": step.product.id if step.product else None,
-                    "order": step.order,
-                }
-            )
+        user = await request.auser()
+        routine = await aget_object_or_404(Routine, pk=pk, user=user)
+        steps_data = [
+            {
+                "step_name": step.step_name,
+                "product_id": step.product_id,
+                "order": step.order,
+            }
+            async for step in routine.steps.all().order_by("order")
+        ]
 
         return JsonResponse(
             {
@@ -688,7 +693,7 @@ def get_routine_data(request, pk):
 
 @login_required
 @require_http_methods(["POST"])
-def add_step(request):
+async def add_step(request):
     """Add a new step to an existing routine.
 
     Accepts form-encoded or JSON body with:
@@ -715,12 +720,13 @@ def add_step(request):
         if not step_name:
             return JsonResponse({"success": False, "error": "step_name is required"}, status=400)
 
-        routine = get_object_or_404(Routine, id=routine_id, user=request.user)
+        user = await request.auser()
+        routine = await aget_object_or_404(Routine, id=routine_id, user=user)
 
         product = None
         if product_id:
             try:
-                product = Product.objects.get(id=product_id, user=request.user)
+                product = await Product.objects.aget(id=product_id, user=user)
             except Product.DoesNotExist:
                 return JsonResponse({"success": False, "error": "Product not found"}, status=404)
 
@@ -732,11 +738,11 @@ def add_step(request):
             order_val = int(order)
         except (TypeError, ValueError):
             order_val = 0
-        max_order = routine.steps.aggregate(models.Max("order")).get("order__max") or 0
+        max_order = (await routine.steps.aaggregate(models.Max("order"))).get("order__max") or 0
         if order_val <= 0 or order_val > (max_order + 1):
             order_val = max_order + 1
 
-        step = RoutineStep.objects.create(
+        step = await RoutineStep.objects.acreate(
             routine=routine,
             step_name=step_name,
             order=order_val,
@@ -752,7 +758,7 @@ def add_step(request):
                     "id": step.id,
                     "name": step.step_name,
                     "order": step.order,
-                    "product_id": step.product.id if step.product else None,
+                    "product_id": step.product_id,
                 },
                 "routine": {"id": routine.id, "name": routine.name, "type": routine.routine_type},
             }
@@ -0,0 +1,47 @@
+let toastQueue=[];let activeToast=null;let toastContainer=null;let productsInitialized=false;let routinesHandlersBound=false;const cssVarCache={};function getCssVar(name){if(cssVarCache[name]!==undefined)return cssVarCache[name];try{const val=getComputedStyle(document.documentElement).getPropertyValue(name);cssVarCache[name]=val?val.trim().replace(/^"|"$/g,''):null;return cssVarCache[name];}catch(e){cssVarCache[name]=null;return null;}}
+function initToastContainer(){if(toastContainer)return;toastContainer=document.createElement('div');toastContainer.className='toast-container';toastContainer.style.cssText=`
+    position: fixed;
+    top: 20px;
+    right: 20px;
+    z-index: 1001;
+  `;document.body.appendChild(toastContainer);}
+function processToastQueue(){if(activeToast||toastQueue.length===0)return;const{message,type}=toastQueue.shift();activeToast=document.createElement('div');activeToast.className=`toast ${type}`;activeToast.textContent=message;activeToast.style.cssText=`
+    background: ${type === 'success' ? '#28a745' : '#dc3545'};
+    color: white;
+    padding: 1rem;
+    border-radius: 4px;
+    opacity: 0;
+    transition: opacity 0.3s ease;
+  `;toastContainer.appendChild(activeToast);requestAnimationFrame(()=>{void activeToast.getBoundingClientRect();activeToast.style.opacity='1';});setTimeout(()=>{activeToast.style.opacity='0';setTimeout(()=>{toastContainer.removeChild(activeToast);activeToast=null;processToastQueue();},300);},3000);}
+function showSuccessMessage(message){initToastContainer();toastQueue.push({message,type:'success'});if(!activeToast)processToastQueue();}
+function showErrorMessage(message){const toast=document.createElement('div');toast.className='toast error';toast.textContent=message;toast.style.cssText=`
+    position: fixed;
+    top: 20px;
+    right: 20px;
+    background: #dc3545;
+    color: white;
+    padding: 1rem;
+    border-radius: 4px;
+    z-index: 1001;
+    opacity: 0;
+    transition: opacity 0.3s ease;
+  `;document.body.appendChild(toast);setTimeout(()=>toast.style.opacity='1',10);setTimeout(()=>{toast.style.opacity='0';setTimeout(()=>document.body.removeChild(toast),300);},5000);}
+function getCsrfToken(){const name='csrftoken';let cookieValue=null;if(document.cookie&&document.cookie!==''){const cookies=document.cookie.split(';');for(let i=0;i<cookies.length;i++){const cookie=cookies[i].trim();if(cookie.substring(0,name.length+1)===(name+'=')){cookieValue=decodeURIComponent(cookie.substring(name.length+1));break;}}}
+return cookieValue;}
+function debounce(func,wait){let timeout;return function(...args){const context=this;clearTimeout(timeout);timeout=setTimeout(()=>func.apply(context,args),wait);};}
+function escapeHtml(text){const div=document.createElement('div');div.textContent=String(text);return div.innerHTML;}
+const autocompleteCache=new Map();function fetchProductAutocomplete(query,limit=8){const empty={products:[],catalog:[],brands:[]};const q=(query||'').trim();if(q.length<2)return Promise.resolve(empty);const key=limit+':'+q.toLowerCase();if(autocompleteCache.has(key))return autocompleteCache.get(key);const params=new URLSearchParams({q:q,limit:String(limit)});const request=fetch('/api/products/autocomplete/?'+params.toString(),{credentials:'same-origin',headers:{'Accept':'application/json'}}).then(response=>{if(!response.ok)throw new Error('Autocomplete failed: '+response.status);return response.json();}).then(data=>({products:data.products||[],catalog:data.catalog||[],brands:data.brands||[]})).catch(error=>{console.debug('Autocomplete unavailable:',error);autocompleteCache.delete(key);return empty;});autocompleteCache.set(key,request);return request;}
+function productLabel(product){const brand=(product.brand||'').trim();const name=(product.name||'').trim();return`${brand}${brand && name ? ' — ' : ''}${name}`||'Untitled Product';}
+document.addEventListener('DOMContentLoaded',function(){initTheme();initNavigation();initPageSpecificFunctions();setupCommonElements();const progressBar=document.querySelector('.progress-fill');if(progressBar){const progress=parseInt(progressBar.getAttribute('data-progress')||'0',10);if(!Number.isNaN(progress)){progressBar.style.width=progress+'%';}}
+if(typeof initProductSelectsForProfile==='function'){initProductSelectsForProfile();}});function initTheme(){const themeToggle=document.getElementById('theme-toggle');const body=document.body;if(!themeToggle){return;}
+let currentTheme='light';try{const saved=localStorage.getItem('theme');if(saved){currentTheme=saved;}else if(window.matchMedia&&window.matchMedia('(prefers-color-scheme: dark)').matches){currentTheme='dark';}}catch(e){}
+const isDark=(currentTheme==='dark');body.classList.toggle('dark-theme',isDark);themeToggle.textContent=isDark?'☀️':'🌙';themeToggle.setAttribute('aria-pressed',String(isDark));themeToggle.setAttribute('aria-label',isDark?'Switch to light theme':'Switch to dark theme');themeToggle.removeEventListener('click',themeToggle._handler||(()=>{}));themeToggle._handler=function(){const nowDark=!body.classList.contains('dark-theme');body.classList.toggle('dark-theme',nowDark);themeToggle.textContent=nowDark?'☀️':'🌙';themeToggle.setAttribute('aria-pressed',String(nowDark));themeToggle.setAttribute('aria-label',nowDark?'Switch to light theme':'Switch to dark theme');try{localStorage.setItem('theme',nowDark?'dark':'light');}catch(e){}};themeToggle.addEventListener('click',themeToggle._handler);}
+function initNavigation(){const hamburgerMenu=document.getElementById('hamburger-menu');const navLinks=document.getElementById('nav-links');if(!(hamburgerMenu&&navLinks))return;const onHamburgerClick=function(){const willOpen=!navLinks.classList.contains('active');hamburgerMenu.classList.toggle('active',willOpen);navLinks.classList.toggle('active',willOpen);hamburgerMenu.setAttribute('aria-expanded',String(willOpen));navLinks.setAttribute('aria-hidden',String(!willOpen));document.body.style.overflow=willOpen?'hidden':'';};hamburgerMenu.removeEventListener('click',hamburgerMenu._handler||(()=>{}));hamburgerMenu._handler=onHamburgerClick;hamburgerMenu.addEventListener('click',onHamburgerClick);const navLinkItems=navLinks.querySelectorAll('a');navLinkItems.forEach(link=>{link.removeEventListener('click',link._closeHandler||(()=>{}));link._closeHandler=function(){hamburgerMenu.classList.remove('active');navLinks.classList.remove('active');hamburgerMenu.setAttribute('aria-expanded','false');navLinks.setAttribute('aria-hidden','true');document.body.style.overflow='';};link.addEventListener('click',link._closeHandler);});const onDocClick=function(event){const isClickInsideNav=navLinks.contains(event.target)||hamburgerMenu.contains(event.target);if(!isClickInsideNav&&navLinks.classList.contains('active')){hamburgerMenu.classList.remove('active');navLinks.classList.remove('active');hamburgerMenu.setAttribute('aria-expanded','false');navLinks.setAttribute('aria-hidden','true');document.body.style.overflow='';}};document.removeEventListener('click',document._navOutsideHandler||(()=>{}));document._navOutsideHandler=onDocClick;document.addEventListener('click',onDocClick);const onResize=function(){if(window.innerWidth>768&&navLinks.classList.contains('active')){hamburgerMenu.classList.remove('active');navLinks.classList.remove('active');hamburgerMenu.setAttribute('aria-expanded','false');navLinks.setAttribute('aria-hidden','true');document.body.style.overflow='';}};window.removeEventListener('resize',window._navResizeHandler||(()=>{}));window._navResizeHandler=onResize;window.addEventListener('resize',onResize);}
+function initPageSpecificFunctions(){const hasRoutines=typeof initRoutines==='function';const hasProducts=typeof initProducts==='function';if(document.querySelector('.dashboard-page')){if(hasRoutines)initRoutines();}
+if(document.querySelector('.products-page')&&hasProducts){initProducts();}
+if(document.querySelector('.routines-products-page')){if(hasRoutines)initRoutines();if(hasProducts)initProducts();}
+if(hasProducts&&(document.getElementById('product-form')||document.getElementById('category-browse'))){initProducts();}
+if(document.querySelector('.add-routine-page')&&typeof initRoutineNameSuggestions==='function'){initRoutineNameSuggestions();}}
+function setupCommonElements(){try{const tooltipTriggerList=[].slice.call(document.querySelectorAll('[data-bs-toggle="tooltip"]'));if(window.bootstrap&&typeof window.bootstrap.Tooltip==='function'){tooltipTriggerList.forEach(el=>new window.bootstrap.Tooltip(el));}}catch(e){console.debug('Tooltips unavailable:',e);}
+try{const popoverTriggerList=[].slice.call(document.querySelectorAll('[data-bs-toggle="popover"]'));if(window.bootstrap&&typeof window.bootstrap.Popover==='function'){popoverTriggerList.forEach(el=>new window.bootstrap.Popover(el));}}catch(e){console.debug('Popovers unavailable:',e);}
+if(typeof setupRoutineStepDropdowns==='function'){setupRoutineStepDropdowns();}}
\ No newline at end of file
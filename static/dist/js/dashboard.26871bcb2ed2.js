@@ -0,0 +1,83 @@
+let toastQueue=[];let activeToast=null;let toastContainer=null;let productsInitialized=false;let routinesHandlersBound=false;const cssVarCache={};function getCssVar(name){if(cssVarCache[name]!==undefined)return cssVarCache[name];try{const val=getComputedStyle(document.documentElement).getPropertyValue(name);cssVarCache[name]=val?val.trim().replace(/^"|"$/g,''):null;return cssVarCache[name];}catch(e){cssVarCache[name]=null;return null;}}
+function initToastContainer(){if(toastContainer)return;toastContainer=document.createElement('div');toastContainer.className='toast-container';toastContainer.style.cssText=`
+    position: fixed;
+    top: 20px;
+    right: 20px;
+    z-index: 1001;
+  `;document.body.appendChild(toastContainer);}
+function processToastQueue(){if(activeToast||toastQueue.length===0)return;const{message,type}=toastQueue.shift();activeToast=document.createElement('div');activeToast.className=`toast ${type}`;activeToast.textContent=message;activeToast.style.cssText=`
+    background: ${type === 'success' ? '#28a745' : '#dc3545'};
+    color: white;
+    padding: 1rem;
+    border-radius: 4px;
+    opacity: 0;
+    transition: opacity 0.3s ease;
+  `;toastContainer.appendChild(activeToast);requestAnimationFrame(()=>{void activeToast.getBoundingClientRect();activeToast.style.opacity='1';});setTimeout(()=>{activeToast.style.opacity='0';setTimeout(()=>{toastContainer.removeChild(activeToast);activeToast=null;processToastQueue();},300);},3000);}
+function showSuccessMessage(message){initToastContainer();toastQueue.push({message,type:'success'});if(!activeToast)processToastQueue();}
+function showErrorMessage(message){const toast=document.createElement('div');toast.className='toast error';toast.textContent=message;toast.style.cssText=`
+    position: fixed;
+    top: 20px;
+    right: 20px;
+    background: #dc3545;
+    color: white;
+    padding: 1rem;
+    border-radius: 4px;
+    z-index: 1001;
+    opacity: 0;
+    transition: opacity 0.3s ease;
+  `;document.body.appendChild(toast);setTimeout(()=>toast.style.opacity='1',10);setTimeout(()=>{toast.style.opacity='0';setTimeout(()=>document.body.removeChild(toast),300);},5000);}
+function getCsrfToken(){const name='csrftoken';let cookieValue=null;if(document.cookie&&document.cookie!==''){const cookies=document.cookie.split(';');for(let i=0;i<cookies.length;i++){const cookie=cookies[i].trim();if(cookie.substring(0,name.length+1)===(name+'=')){cookieValue=decodeURIComponent(cookie.substring(name.length+1));break;}}}
+return cookieValue;}
+function debounce(func,wait){let timeout;return function(...args){const context=this;clearTimeout(timeout);timeout=setTimeout(()=>func.apply(context,args),wait);};}
+function escapeHtml(text){const div=document.createElement('div');div.textContent=String(text);return div.innerHTML;}
+const autocompleteCache=new Map();function fetchProductAutocomplete(query,limit=8){const empty={products:[],catalog:[],brands:[]};const q=(query||'').trim();if(q.length<2)return Promise.resolve(empty);const key=limit+':'+q.toLowerCase();if(autocompleteCache.has(key))return autocompleteCache.get(key);const params=new URLSearchParams({q:q,limit:String(limit)});const request=fetch('/api/products/autocomplete/?'+params.toString(),{credentials:'same-origin',headers:{'Accept':'application/json'}}).then(response=>{if(!response.ok)throw new Error('Autocomplete failed: '+response.status);return response.json();}).then(data=>({products:data.products||[],catalog:data.catalog||[],brands:data.brands||[]})).catch(error=>{console.debug('Autocomplete unavailable:',error);autocompleteCache.delete(key);return empty;});autocompleteCache.set(key,request);return request;}
+function productLabel(product){const brand=(product.brand||'').trim();const name=(product.name||'').trim();return`${brand}${brand && name ? ' — ' : ''}${name}`||'Untitled Product';}
+document.addEventListener('DOMContentLoaded',function(){initTheme();initNavigation();initPageSpecificFunctions();setupCommonElements();const progressBar=document.querySelector('.progress-fill');if(progressBar){const progress=parseInt(progressBar.getAttribute('data-progress')||'0',10);if(!Number.isNaN(progress)){progressBar.style.width=progress+'%';}}
+if(typeof initProductSelectsForProfile==='function'){initProductSelectsForProfile();}});function initTheme(){const themeToggle=document.getElementById('theme-toggle');const body=document.body;if(!themeToggle){return;}
+let currentTheme='light';try{const saved=localStorage.getItem('theme');if(saved){currentTheme=saved;}else if(window.matchMedia&&window.matchMedia('(prefers-color-scheme: dark)').matches){currentTheme='dark';}}catch(e){}
+const isDark=(currentTheme==='dark');body.classList.toggle('dark-theme',isDark);themeToggle.textContent=isDark?'☀️':'🌙';themeToggle.setAttribute('aria-pressed',String(isDark));themeToggle.setAttribute('aria-label',isDark?'Switch to light theme':'Switch to dark theme');themeToggle.removeEventListener('click',themeToggle._handler||(()=>{}));themeToggle._handler=function(){const nowDark=!body.classList.contains('dark-theme');body.classList.toggle('dark-theme',nowDark);themeToggle.textContent=nowDark?'☀️':'🌙';themeToggle.setAttribute('aria-pressed',String(nowDark));themeToggle.setAttribute('aria-label',nowDark?'Switch to light theme':'Switch to dark theme');try{localStorage.setItem('theme',nowDark?'dark':'light');}catch(e){}};themeToggle.addEventListener('click',themeToggle._handler);}
+function initNavigation(){const hamburgerMenu=document.getElementById('hamburger-menu');const navLinks=document.getElementById('nav-links');if(!(hamburgerMenu&&navLinks))return;const onHamburgerClick=function(){const willOpen=!navLinks.classList.contains('active');hamburgerMenu.classList.toggle('active',willOpen);navLinks.classList.toggle('active',willOpen);hamburgerMenu.setAttribute('aria-expanded',String(willOpen));navLinks.setAttribute('aria-hidden',String(!willOpen));document.body.style.overflow=willOpen?'hidden':'';};hamburgerMenu.removeEventListener('click',hamburgerMenu._handler||(()=>{}));hamburgerMenu._handler=onHamburgerClick;hamburgerMenu.addEventListener('click',onHamburgerClick);const navLinkItems=navLinks.querySelectorAll('a');navLinkItems.forEach(link=>{link.removeEventListener('click',link._closeHandler||(()=>{}));link._closeHandler=function(){hamburgerMenu.classList.remove('active');navLinks.classList.remove('active');hamburgerMenu.setAttribute('aria-expanded','false');navLinks.setAttribute('aria-hidden','true');document.body.style.overflow='';};link.addEventListener('click',link._closeHandler);});const onDocClick=function(event){const isClickInsideNav=navLinks.contains(event.target)||hamburgerMenu.contains(event.target);if(!isClickInsideNav&&navLinks.classList.contains('active')){hamburgerMenu.classList.remove('active');navLinks.classList.remove('active');hamburgerMenu.setAttribute('aria-expanded','false');navLinks.setAttribute('aria-hidden','true');document.body.style.overflow='';}};document.removeEventListener('click',document._navOutsideHandler||(()=>{}));document._navOutsideHandler=onDocClick;document.addEventListener('click',onDocClick);const onResize=function(){if(window.innerWidth>768&&navLinks.classList.contains('active')){hamburgerMenu.classList.remove('active');navLinks.classList.remove('active');hamburgerMenu.setAttribute('aria-expanded','false');navLinks.setAttribute('aria-hidden','true');document.body.style.overflow='';}};window.removeEventListener('resize',window._navResizeHandler||(()=>{}));window._navResizeHandler=onResize;window.addEventListener('resize',onResize);}
+function initPageSpecificFunctions(){const hasRoutines=typeof initRoutines==='function';const hasProducts=typeof initProducts==='function';if(document.querySelector('.dashboard-page')){if(hasRoutines)initRoutines();}
+if(document.querySelector('.products-page')&&hasProducts){initProducts();}
+if(document.querySelector('.routines-products-page')){if(hasRoutines)initRoutines();if(hasProducts)initProducts();}
+if(hasProducts&&(document.getElementById('product-form')||document.getElementById('category-browse'))){initProducts();}
+if(document.querySelector('.add-routine-page')&&typeof initRoutineNameSuggestions==='function'){initRoutineNameSuggestions();}}
+function setupCommonElements(){try{const tooltipTriggerList=[].slice.call(document.querySelectorAll('[data-bs-toggle="tooltip"]'));if(window.bootstrap&&typeof window.bootstrap.Tooltip==='function'){tooltipTriggerList.forEach(el=>new window.bootstrap.Tooltip(el));}}catch(e){console.debug('Tooltips unavailable:',e);}
+try{const popoverTriggerList=[].slice.call(document.querySelectorAll('[data-bs-toggle="popover"]'));if(window.bootstrap&&typeof window.bootstrap.Popover==='function'){popoverTriggerList.forEach(el=>new window.bootstrap.Popover(el));}}catch(e){console.debug('Popovers unavailable:',e);}
+if(typeof setupRoutineStepDropdowns==='function'){setupRoutineStepDropdowns();}}
+(function(){const root=document.querySelector('#calendar');if(!root)return;let events=[];let expiryEvents=[];let weeklyDueDates=[];let monthlyDueDates=[];try{const routineTag=document.getElementById('routine-events');if(routineTag&&routineTag.textContent){const parsed=JSON.parse(routineTag.textContent);if(Array.isArray(parsed))events=parsed;}
+const expiryTag=document.getElementById('expiry-events');if(expiryTag&&expiryTag.textContent){const parsedExpiry=JSON.parse(expiryTag.textContent);if(Array.isArray(parsedExpiry))expiryEvents=parsedExpiry;}
+const weeklyTag=document.getElementById('weekly-due-dates');if(weeklyTag&&weeklyTag.textContent){const parsedWeekly=JSON.parse(weeklyTag.textContent);if(Array.isArray(parsedWeekly))weeklyDueDates=parsedWeekly;}
+const monthlyTag=document.getElementById('monthly-due-dates');if(monthlyTag&&monthlyTag.textContent){const parsedMonthly=JSON.parse(monthlyTag.textContent);if(Array.isArray(parsedMonthly))monthlyDueDates=parsedMonthly;}}catch(e){}
+if(!events.length&&window.ROUTINE_EVENTS&&Array.isArray(window.ROUTINE_EVENTS)){events=window.ROUTINE_EVENTS;}
+if(!expiryEvents.length&&window.EXPIRY_EVENTS&&Array.isArray(window.EXPIRY_EVENTS)){expiryEvents=window.EXPIRY_EVENTS;}
+const eventsByDate={};const expiryByDate={};events.forEach(function(ev){if(!ev||!ev.date)return;eventsByDate[ev.date]=ev;});expiryEvents.forEach(function(ex){if(!ex||!ex.date)return;if(!expiryByDate[ex.date])expiryByDate[ex.date]=[];expiryByDate[ex.date].push(ex);});const state={year:(new Date()).getFullYear(),month:(new Date()).getMonth()};function render(){root.innerHTML='';const header=document.createElement('div');header.className='sc-header';const prevBtn=document.createElement('button');prevBtn.textContent='<';prevBtn.addEventListener('click',function(){changeMonth(-1);});const nextBtn=document.createElement('button');nextBtn.textContent='>';nextBtn.addEventListener('click',function(){changeMonth(1);});const title=document.createElement('div');title.className='sc-title';title.textContent=new Date(state.year,state.month).toLocaleString(undefined,{month:'long',year:'numeric'});header.appendChild(prevBtn);header.appendChild(title);header.appendChild(nextBtn);root.appendChild(header);const dow=['Sun','Mon','Tue','Wed','Thu','Fri','Sat'];const dowRow=document.createElement('div');dowRow.className='sc-dow';dow.forEach(function(d){const cell=document.createElement('div');cell.className='sc-dow-cell';cell.textContent=d;dowRow.appendChild(cell);});root.appendChild(dowRow);const grid=document.createElement('div');grid.className='sc-grid';const first=new Date(state.year,state.month,1);const startWeekday=first.getDay();const daysInMonth=new Date(state.year,state.month+1,0).getDate();for(let i=0;i<startWeekday;i++){const blank=document.createElement('div');blank.className='sc-cell sc-other';grid.appendChild(blank);}
+const today=new Date();today.setHours(0,0,0,0);for(let day=1;day<=daysInMonth;day++){const dateKey=toDateKey(state.year,state.month,day);const cell=document.createElement('div');cell.className='sc-cell sc-day';cell.dataset.date=dateKey;cell.id='calendar-day-'+dateKey;const num=document.createElement('div');num.className='sc-day-num';num.textContent=day;cell.appendChild(num);const icon=document.createElement('div');icon.className='sc-day-icon';const ev=eventsByDate[dateKey];const cellDate=new Date(state.year,state.month,day);const isFutureDay=cellDate>today;const isToday=cellDate.getTime()===today.getTime();if(isToday){cell.classList.add('sc-today');}
+let statusText='No events';if(ev){if(ev.status==='completed'){icon.textContent='✨';statusText='Completed';}else if(ev.status==='not_done'){if(isFutureDay){icon.textContent='';statusText='Upcoming';}else{icon.textContent='×';const errorColor=getCssVar('--error-color');if(errorColor)icon.style.color=errorColor;icon.style.fontSize='2rem';statusText='Missed';}}else if(ev.status==='morning'){icon.textContent='☀️';statusText='Morning routine';}else if(ev.status==='evening'){icon.textContent='🌙';statusText='Evening routine';}}else if(isFutureDay){statusText='Upcoming';}
+cell.appendChild(icon);const parts=dateKey.split('-');const readableDate=parts[2]+'-'+parts[1]+'-'+parts[0];let tooltip=readableDate+' — '+statusText+(isToday?' • Today':'');const expiries=expiryByDate[dateKey]||[];if(expiries.length){const badge=document.createElement('div');badge.className='sc-expiry-badge';badge.textContent='⚠️';cell.appendChild(badge);const maxList=2;const items=expiries.slice(0,maxList).map(function(ex){const nameBrand=(ex.product_name||ex.title||'Product')+(ex.brand?(' — '+ex.brand):'');return nameBrand;});const moreCount=expiries.length-items.length;const expiryLine='Expiring: '+items.join(' || ')+(moreCount>0?(' and '+moreCount+' more'):'');tooltip+=' • '+expiryLine;}
+cell.title=tooltip;cell.setAttribute('aria-label',tooltip);grid.appendChild(cell);}
+const weeklyList=Array.isArray(weeklyDueDates)&&weeklyDueDates.length?weeklyDueDates:(Array.isArray(window.weeklyDueDates)?window.weeklyDueDates:[]);weeklyList.forEach(function(item){const dayElem=document.getElementById('calendar-day-'+item.date);if(dayElem){const weeklyRgb=getCssVar('--accent-color-bg-lighter-rgb');const weeklyBorder=weeklyRgb?('rgb('+weeklyRgb+')'):getCssVar('--accent-step-weekly');if(weeklyBorder)dayElem.style.border='2px solid '+weeklyBorder;const weeklyText='Weekly step: '+item.step_name+' ('+item.routine_type+')';dayElem.title=dayElem.title?(dayElem.title+' • '+weeklyText):weeklyText;dayElem.setAttribute('aria-label',dayElem.title);}});const monthlyList=Array.isArray(monthlyDueDates)&&monthlyDueDates.length?monthlyDueDates:(Array.isArray(window.monthlyDueDates)?window.monthlyDueDates:[]);monthlyList.forEach(function(item){const dayElem=document.getElementById('calendar-day-'+item.date);if(dayElem){const monthlyBorder=getCssVar('--accent-step-monthly');if(monthlyBorder)dayElem.style.border='2px solid '+monthlyBorder;const monthlyText='Monthly step: '+item.step_name+' ('+item.routine_type+')';dayElem.title=dayElem.title?(dayElem.title+' • '+monthlyText):monthlyText;dayElem.setAttribute('aria-label',dayElem.title);}});const totalCells=startWeekday+daysInMonth;const trailing=(7-(totalCells%7))%7;for(let t=0;t<trailing;t++){const blank2=document.createElement('div');blank2.className='sc-cell sc-other';grid.appendChild(blank2);}
+root.appendChild(grid);}
+function toDateKey(y,m,d){const mm=(m+1).toString().padStart(2,'0');const dd=d.toString().padStart(2,'0');return y+'-'+mm+'-'+dd;}
+function changeMonth(delta){state.month+=delta;if(state.month<0){state.month=11;state.year-=1;}
+if(state.month>11){state.month=0;state.year+=1;}
+render();}
+render();})();function initRoutines(){const routineForms=document.querySelectorAll('.routine-form');routineForms.forEach(form=>{if(form.dataset.boundSubmit==='true')return;form.addEventListener('submit',handleRoutineFormSubmit);form.dataset.boundSubmit='true';});if(!routinesHandlersBound){document.addEventListener('change',onRoutineChange);document.addEventListener('click',onRoutineClick);routinesHandlersBound=true;}}
+function onRoutineChange(event){const target=event.target;if(target&&target.classList&&target.classList.contains('step-checkbox')){const stepId=target.getAttribute('data-step-id');if(stepId){toggleStepCompletion(stepId,target);}else{handleRoutineStepUpdate(target);}}}
+function onRoutineClick(event){const btn=event.target.closest&&event.target.closest('.complete-btn');if(!btn)return;event.preventDefault();const routineId=btn.getAttribute('data-routine-id');const routineType=btn.getAttribute('data-routine-type');if(routineId&&routineType){markRoutineComplete(routineId,routineType);}}
+function handleRoutineStepUpdate(checkbox){const stepId=checkbox&&checkbox.dataset?checkbox.dataset.stepId:null;const isChecked=!!(checkbox&&checkbox.checked);const stepItem=checkbox.closest('.routine-step');if(!stepId){console.warn('Step ID missing on checkbox');return;}
+fetch('/routines/toggle-step/',{method:'POST',headers:{'Content-Type':'application/json','X-CSRFToken':getCsrfToken(),},body:JSON.stringify({step_id:stepId})}).then(response=>response.json()).then(data=>{if(data&&data.success){if(stepItem)stepItem.classList.toggle('completed',isChecked);showSuccessMessage(data.message||'Routine step updated');updateProgressDisplay();document.dispatchEvent(new CustomEvent('routineStepUpdated',{detail:{stepId,completed:isChecked}}));}else{showErrorMessage((data&&(data.error||data.message))||'Could not update routine step');checkbox.checked=!isChecked;}}).catch(error=>{console.error('Error updating routine step:',error);showErrorMessage('Failed to update routine step');checkbox.checked=!isChecked;});}
+function toggleStepCompletion(stepId,checkbox){const csrf=getCsrfToken();if(!csrf){console.error('CSRF token not found');if(checkbox)checkbox.checked=!checkbox.checked;return;}
+fetch('/routines/toggle-step/',{method:'POST',headers:{'Content-Type':'application/json','X-CSRFToken':csrf},body:JSON.stringify({step_id:stepId})}).then(function(response){if(!response.ok){return fallbackToggleStep(stepId,csrf);}
+return response.json();}).then(function(data){if(data&&data.success){updateProgressDisplay();}else if(data&&data.success===false){console.error('Failed to update step',data.error||data.message);if(checkbox)checkbox.checked=!checkbox.checked;}}).catch(function(error){console.error('Network error while toggling step:',error);if(checkbox)checkbox.checked=!checkbox.checked;});}
+function fallbackToggleStep(stepId,csrfToken){const checkbox=document.querySelector(`[data-step-id="${stepId}"]`);const isCompleted=checkbox?checkbox.checked:false;return fetch('/routines/toggle-step-completion/',{method:'POST',headers:{'Content-Type':'application/x-www-form-urlencoded','X-CSRFToken':csrfToken,},body:`step_id=${encodeURIComponent(stepId)}&completed=${isCompleted ? '1' : '0'}`}).then(r=>r.json()).then(d=>{if(d&&d.success){updateProgressDisplay();}else if(checkbox){checkbox.checked=!isCompleted;}
+return d||{success:false};});}
+function markRoutineComplete(routineId,routineType){const csrf=getCsrfToken();if(!csrf){console.error('CSRF token not found');return;}
+fetch('/routines/mark-complete/',{method:'POST',headers:{'Content-Type':'application/json','X-CSRFToken':csrf},body:JSON.stringify({routine_id:routineId,routine_type:routineType})}).then(resp=>{if(!resp.ok)throw new Error('Network error');return resp.json();}).then(data=>{if(data&&data.success){window.location.reload();}else{showErrorMessage(data&&(data.error||data.message)||'Failed to mark routine complete');}}).catch(err=>{console.error('Error marking routine complete:',err);showErrorMessage('Could not connect to server');});}
+function updateProgressDisplay(){const totalCheckboxes=document.querySelectorAll('.step-checkbox').length;const completedCheckboxes=document.querySelectorAll('.step-checkbox:checked').length;const progressPercent=totalCheckboxes>0?Math.round((completedCheckboxes/totalCheckboxes)*100):0;const progressBar=document.querySelector('.progress-fill');if(progressBar)progressBar.style.width=progressPercent+'%';const progressText=document.querySelector('.progress-text');if(progressText)progressText.textContent=`${completedCheckboxes} of ${totalCheckboxes} steps completed`;}
+function handleRoutineFormSubmit(event){const form=event.target;if(form&&(form.dataset.noAjax==='true'||form.getAttribute('data-no-ajax')==='true')){return;}
+event.preventDefault();const formData=new FormData(form);fetch(form.action,{method:form.method,body:formData,headers:{'X-Requested-With':'XMLHttpRequest'}}).then(response=>response.json()).then(data=>{if(data&&(data.success===true||data.status==='success')){try{const container=document.querySelector('.form-container.add-routine-page');if(container){let banner=container.querySelector('.inline-success');if(!banner){banner=document.createElement('div');banner.className='inline-success';banner.setAttribute('role','status');banner.setAttribute('aria-live','polite');banner.style.marginBottom='1rem';container.insertBefore(banner,container.querySelector('.form-card'));}
+const routineName=(data.name||'').trim();const detailUrl=data.detail_url||data.redirect_url||'/routines/dashboard/';banner.innerHTML='<div class="d-flex" style="align-items:center; gap:.75rem; justify-content:space-between; flex-wrap:wrap;">'+'<div>'+
+(routineName?('<strong>'+escapeHtml(routineName)+'</strong> — Added. '):'Routine — Added. ')+'<span class="muted">You can view it on your dashboard.</span>'+'</div>'+'<div class="actions">'+'<a class="btn btn-primary" href="'+detailUrl+'">View on Dashboard</a>'+'</div>'+'</div>';}}catch(_){}
+try{const formEl=form;for(let i=1;i<=10;i++){const step=formEl.querySelector('[name="step'+i+'"]');const prod=formEl.querySelector('[name="product'+i+'"]');if(step)step.value='';if(prod)prod.value='';}}catch(_){}
+if(data.html){const container=document.querySelector('#routines-container');if(container){container.innerHTML=data.html;initRoutines();}}}else{const msg=(data&&(data.error||data.message))||'Error saving routine';showErrorMessage(msg);}}).catch(error=>{console.error('Error:',error);showErrorMessage('An error occurred while processing your request');});}
\ No newline at end of file
@@ -0,0 +1,64 @@
+let toastQueue=[];let activeToast=null;let toastContainer=null;let productsInitialized=false;let routinesHandlersBound=false;const cssVarCache={};function getCssVar(name){if(cssVarCache[name]!==undefined)return cssVarCache[name];try{const val=getComputedStyle(document.documentElement).getPropertyValue(name);cssVarCache[name]=val?val.trim().replace(/^"|"$/g,''):null;return cssVarCache[name];}catch(e){cssVarCache[name]=null;return null;}}
+function initToastContainer(){if(toastContainer)return;toastContainer=document.createElement('div');toastContainer.className='toast-container';toastContainer.style.cssText=`
+    position: fixed;
+    top: 20px;
+    right: 20px;
+    z-index: 1001;
+  `;document.body.appendChild(toastContainer);}
+function processToastQueue(){if(activeToast||toastQueue.length===0)return;const{message,type}=toastQueue.shift();activeToast=document.createElement('div');activeToast.className=`toast ${type}`;activeToast.textContent=message;activeToast.style.cssText=`
+    background: ${type === 'success' ? '#28a745' : '#dc3545'};
+    color: white;
+    padding: 1rem;
+    border-radius: 4px;
+    opacity: 0;
+    transition: opacity 0.3s ease;
+  `;toastContainer.appendChild(activeToast);requestAnimationFrame(()=>{void activeToast.getBoundingClientRect();activeToast.style.opacity='1';});setTimeout(()=>{activeToast.style.opacity='0';setTimeout(()=>{toastContainer.removeChild(activeToast);activeToast=null;processToastQueue();},300);},3000);}
+function showSuccessMessage(message){initToastContainer();toastQueue.push({message,type:'success'});if(!activeToast)processToastQueue();}
+function showErrorMessage(message){const toast=document.createElement('div');toast.className='toast error';toast.textContent=message;toast.style.cssText=`
+    position: fixed;
+    top: 20px;
+    right: 20px;
+    background: #dc3545;
+    color: white;
+    padding: 1rem;
+    border-radius: 4px;
+    z-index: 1001;
+    opacity: 0;
+    transition: opacity 0.3s ease;
+  `;document.body.appendChild(toast);setTimeout(()=>toast.style.opacity='1',10);setTimeout(()=>{toast.style.opacity='0';setTimeout(()=>document.body.removeChild(toast),300);},5000);}
+function getCsrfToken(){const name='csrftoken';let cookieValue=null;if(document.cookie&&document.cookie!==''){const cookies=document.cookie.split(';');for(let i=0;i<cookies.length;i++){const cookie=cookies[i].trim();if(cookie.substring(0,name.length+1)===(name+'=')){cookieValue=decodeURIComponent(cookie.substring(name.length+1));break;}}}
+return cookieValue;}
+function debounce(func,wait){let timeout;return function(...args){const context=this;clearTimeout(timeout);timeout=setTimeout(()=>func.apply(context,args),wait);};}
+function escapeHtml(text){const div=document.createElement('div');div.textContent=String(text);return div.innerHTML;}
+const autocompleteCache=new Map();function fetchProductAutocomplete(query,limit=8){const empty={products:[],catalog:[],brands:[]};const q=(query||'').trim();if(q.length<2)return Promise.resolve(empty);const key=limit+':'+q.toLowerCase();if(autocompleteCache.has(key))return autocompleteCache.get(key);const params=new URLSearchParams({q:q,limit:String(limit)});const request=fetch('/api/products/autocomplete/?'+params.toString(),{credentials:'same-origin',headers:{'Accept':'application/json'}}).then(response=>{if(!response.ok)throw new Error('Autocomplete failed: '+response.status);return response.json();}).then(data=>({products:data.products||[],catalog:data.catalog||[],brands:data.brands||[]})).catch(error=>{console.debug('Autocomplete unavailable:',error);autocompleteCache.delete(key);return empty;});autocompleteCache.set(key,request);return request;}
+function productLabel(product){const brand=(product.brand||'').trim();const name=(product.name||'').trim();return`${brand}${brand && name ? ' — ' : ''}${name}`||'Untitled Product';}
+document.addEventListener('DOMContentLoaded',function(){initTheme();initNavigation();initPageSpecificFunctions();setupCommonElements();const progressBar=document.querySelector('.progress-fill');if(progressBar){const progress=parseInt(progressBar.getAttribute('data-progress')||'0',10);if(!Number.isNaN(progress)){progressBar.style.width=progress+'%';}}
+if(typeof initProductSelectsForProfile==='function'){initProductSelectsForProfile();}});function initTheme(){const themeToggle=document.getElementById('theme-toggle');const body=document.body;if(!themeToggle){return;}
+let currentTheme='light';try{const saved=localStorage.getItem('theme');if(saved){currentTheme=saved;}else if(window.matchMedia&&window.matchMedia('(prefers-color-scheme: dark)').matches){currentTheme='dark';}}catch(e){}
+const isDark=(currentTheme==='dark');body.classList.toggle('dark-theme',isDark);themeToggle.textContent=isDark?'☀️':'🌙';themeToggle.setAttribute('aria-pressed',String(isDark));themeToggle.setAttribute('aria-label',isDark?'Switch to light theme':'Switch to dark theme');themeToggle.removeEventListener('click',themeToggle._handler||(()=>{}));themeToggle._handler=function(){const nowDark=!body.classList.contains('dark-theme');body.classList.toggle('dark-theme',nowDark);themeToggle.textContent=nowDark?'☀️':'🌙';themeToggle.setAttribute('aria-pressed',String(nowDark));themeToggle.setAttribute('aria-label',nowDark?'Switch to light theme':'Switch to dark theme');try{localStorage.setItem('theme',nowDark?'dark':'light');}catch(e){}};themeToggle.addEventListener('click',themeToggle._handler);}
+function initNavigation(){const hamburgerMenu=document.getElementById('hamburger-menu');const navLinks=document.getElementById('nav-links');if(!(hamburgerMenu&&navLinks))return;const onHamburgerClick=function(){const willOpen=!navLinks.classList.contains('active');hamburgerMenu.classList.toggle('active',willOpen);navLinks.classList.toggle('active',willOpen);hamburgerMenu.setAttribute('aria-expanded',String(willOpen));navLinks.setAttribute('aria-hidden',String(!willOpen));document.body.style.overflow=willOpen?'hidden':'';};hamburgerMenu.removeEventListener('click',hamburgerMenu._handler||(()=>{}));hamburgerMenu._handler=onHamburgerClick;hamburgerMenu.addEventListener('click',onHamburgerClick);const navLinkItems=navLinks.querySelectorAll('a');navLinkItems.forEach(link=>{link.removeEventListener('click',link._closeHandler||(()=>{}));link._closeHandler=function(){hamburgerMenu.classList.remove('active');navLinks.classList.remove('active');hamburgerMenu.setAttribute('aria-expanded','false');navLinks.setAttribute('aria-hidden','true');document.body.style.overflow='';};link.addEventListener('click',link._closeHandler);});const onDocClick=function(event){const isClickInsideNav=navLinks.contains(event.target)||hamburgerMenu.contains(event.target);if(!isClickInsideNav&&navLinks.classList.contains('active')){hamburgerMenu.classList.remove('active');navLinks.classList.remove('active');hamburgerMenu.setAttribute('aria-expanded','false');navLinks.setAttribute('aria-hidden','true');document.body.style.overflow='';}};document.removeEventListener('click',document._navOutsideHandler||(()=>{}));document._navOutsideHandler=onDocClick;document.addEventListener('click',onDocClick);const onResize=function(){if(window.innerWidth>768&&navLinks.classList.contains('active')){hamburgerMenu.classList.remove('active');navLinks.classList.remove('active');hamburgerMenu.setAttribute('aria-expanded','false');navLinks.setAttribute('aria-hidden','true');document.body.style.overflow='';}};window.removeEventListener('resize',window._navResizeHandler||(()=>{}));window._navResizeHandler=onResize;window.addEventListener('resize',onResize);}
+function initPageSpecificFunctions(){const hasRoutines=typeof initRoutines==='function';const hasProducts=typeof initProducts==='function';if(document.querySelector('.dashboard-page')){if(hasRoutines)initRoutines();}
+if(document.querySelector('.products-page')&&hasProducts){initProducts();}
+if(document.querySelector('.routines-products-page')){if(hasRoutines)initRoutines();if(hasProducts)initProducts();}
+if(hasProducts&&(document.getElementById('product-form')||document.getElementById('category-browse'))){initProducts();}
+if(document.querySelector('.add-routine-page')&&typeof initRoutineNameSuggestions==='function'){initRoutineNameSuggestions();}}
+function setupCommonElements(){try{const tooltipTriggerList=[].slice.call(document.querySelectorAll('[data-bs-toggle="tooltip"]'));if(window.bootstrap&&typeof window.bootstrap.Tooltip==='function'){tooltipTriggerList.forEach(el=>new window.bootstrap.Tooltip(el));}}catch(e){console.debug('Tooltips unavailable:',e);}
+try{const popoverTriggerList=[].slice.call(document.querySelectorAll('[data-bs-toggle="popover"]'));if(window.bootstrap&&typeof window.bootstrap.Popover==='function'){popoverTriggerList.forEach(el=>new window.bootstrap.Popover(el));}}catch(e){console.debug('Popovers unavailable:',e);}
+if(typeof setupRoutineStepDropdowns==='function'){setupRoutineStepDropdowns();}}
+function initProducts(){if(productsInitialized)return;productsInitialized=true;initProductForms();initProductSearch();initProductSuggestions();initProductAutocomplete();}
+function initProductForms(){const productForms=document.querySelectorAll('.product-form');productForms.forEach(form=>{form.addEventListener('submit',handleProductFormSubmit);});}
+function handleProductFormSubmit(event){event.preventDefault();const form=event.target;const formData=new FormData(form);const submitButton=form.querySelector('button[type="submit"]');const originalText=submitButton.textContent;submitButton.textContent='Saving...';submitButton.disabled=true;fetch(form.action,{method:form.method,body:formData,headers:{'X-Requested-With':'XMLHttpRequest'}}).then(response=>response.json()).then(data=>{if(data.status==='success'){showSuccessMessage(data.message||'Product saved successfully');if(data.redirect_url){window.location.href=data.redirect_url;}}else{showErrorMessage(data.message||'Error saving product');if(data.errors){Object.entries(data.errors).forEach(([field,errors])=>{const fieldElement=form.querySelector(`[name="${field}"]`);if(fieldElement){fieldElement.classList.add('is-invalid');let errorElement=form.querySelector(`#${field}-error`);if(!errorElement){errorElement=document.createElement('div');errorElement.id=`${field}-error`;errorElement.className='invalid-feedback';fieldElement.parentNode.appendChild(errorElement);}
+errorElement.textContent=errors.join(' ');}});}}}).catch(error=>{console.error('Error:',error);showErrorMessage('An error occurred while processing your request');}).finally(()=>{submitButton.textContent=originalText;submitButton.disabled=false;});}
+function initProductSearch(){const searchInput=document.querySelector('#product-search');if(!searchInput)return;searchInput.addEventListener('input',debounce(function(){const searchTerm=this.value.trim();const productsContainer=document.querySelector('#products-list');if(!productsContainer)return;if(searchTerm.length<2){document.querySelectorAll('.product-card').forEach(card=>{card.style.display='';});return;}
+document.querySelectorAll('.product-card').forEach(card=>{const productName=card.querySelector('.product-name').textContent.toLowerCase();const productBrand=card.querySelector('.product-brand')?.textContent.toLowerCase()||'';if(productName.includes(searchTerm.toLowerCase())||productBrand.includes(searchTerm.toLowerCase())){card.style.display='';}else{card.style.display='none';}});},300));}
+function initProductAutocomplete(){const productForm=document.getElementById('product-form');if(!productForm)return;const nameInput=productForm.querySelector('[name="name"]');const brandInput=productForm.querySelector('[name="brand"]');const typeInput=productForm.querySelector('[name="product_type"]');if(!nameInput||!brandInput)return;function attachDatalist(input,id){const datalist=document.createElement('datalist');datalist.id=id;input.setAttribute('list',id);input.setAttribute('autocomplete','off');input.parentNode.appendChild(datalist);return datalist;}
+function fillOptions(datalist,entries){datalist.innerHTML='';entries.forEach(([value,label])=>{const opt=document.createElement('option');opt.value=value;if(label)opt.label=label;datalist.appendChild(opt);});}
+const nameList=attachDatalist(nameInput,'product-name-suggestions');const brandList=attachDatalist(brandInput,'product-brand-suggestions');let nameMatches=new Map();const lookupNames=debounce(async function(){const query=nameInput.value;const results=await fetchProductAutocomplete(query);if(nameInput.value!==query)return;nameMatches=new Map();results.catalog.concat(results.products).forEach(p=>{if(p.name&&!nameMatches.has(p.name))nameMatches.set(p.name,p);});fillOptions(nameList,Array.from(nameMatches.values()).map(p=>[p.name,p.brand]));},200);nameInput.addEventListener('input',function(){const match=nameMatches.get(nameInput.value);if(!match){lookupNames();return;}
+if(!brandInput.value.trim()&&match.brand)brandInput.value=match.brand;if(typeInput&&!typeInput.value&&match.product_type){const hasType=Array.from(typeInput.options||[]).some(opt=>opt.value===match.product_type);if(hasType||typeInput.tagName!=='SELECT')typeInput.value=match.product_type;}});brandInput.addEventListener('input',debounce(async function(){const query=brandInput.value;const results=await fetchProductAutocomplete(query);if(brandInput.value!==query)return;fillOptions(brandList,results.brands.map(brand=>[brand,'']));},200));}
+function initProductSuggestions(){const categorySelect=document.getElementById('category-browse');const loadingDiv=document.getElementById('suggestions-loading');const suggestionsDiv=document.getElementById('product-suggestions');const suggestionsGrid=document.getElementById('suggestions-grid');const productForm=document.getElementById('product-form');if(!categorySelect||!productForm||!suggestionsGrid||!suggestionsDiv||!loadingDiv)return;categorySelect.addEventListener('change',function(){const category=this.value;if(!category){suggestionsDiv.style.display='none';suggestionsDiv.setAttribute('aria-hidden','true');return;}
+loadingDiv.style.display='block';loadingDiv.setAttribute('aria-hidden','false');suggestionsDiv.style.display='none';suggestionsDiv.setAttribute('aria-hidden','true');suggestionsGrid.innerHTML='';fetch('/api/products/browse/'+encodeURIComponent(category)+'/').then(function(response){if(!response.ok)throw new Error('Network response was not ok');return response.json();}).then(function(products){loadingDiv.style.display='none';loadingDiv.setAttribute('aria-hidden','true');if(!products||products.length===0){suggestionsGrid.innerHTML='<p class="muted-message">No products found for this category. Try importing some first!</p>';}else{products.forEach(function(product){const card=createSuggestionCard(product,productForm);suggestionsGrid.appendChild(card);});}
+suggestionsDiv.style.display='block';suggestionsDiv.setAttribute('aria-hidden','false');}).catch(function(error){console.error('Error fetching products:',error);loadingDiv.style.display='none';loadingDiv.setAttribute('aria-hidden','true');suggestionsGrid.innerHTML='<p class="error-message">Error loading suggestions. Please try again.</p>';suggestionsDiv.style.display='block';suggestionsDiv.setAttribute('aria-hidden','false');});});function createSuggestionCard(product,formEl){const card=document.createElement('div');card.className='suggestion-card';card.style.cursor='pointer';const productTypeDisplay=product.product_type_display||product.product_type||'';card.innerHTML='<h5>'+escapeHtml(product.name||'')+'</h5>'+'<p><strong>Brand:</strong> '+escapeHtml(product.brand||'')+'</p>'+
+(product.ingredients?'<p><strong>Key ingredients:</strong> '+escapeHtml(product.ingredients.substring(0,100))+
+(product.ingredients.length>100?'...':'')+'</p>':'')+'<div class="product-type">'+escapeHtml(productTypeDisplay)+'</div>';card.addEventListener('click',function(){fillProductForm(formEl,product);formEl.scrollIntoView({behavior:'smooth',block:'center'});const highlightColor=getCssVar('--accent-color-bg-lighter');if(highlightColor){const original=formEl.style.backgroundColor;formEl.style.backgroundColor=highlightColor;setTimeout(function(){formEl.style.backgroundColor=original;},2000);}});return card;}
+function fillProductForm(formEl,product){setFormField(formEl,'name',product.name||'');setFormField(formEl,'brand',product.brand||'');setFormField(formEl,'product_type',product.product_type||'');if(product.ingredients)setFormField(formEl,'ingredients',product.ingredients);if(product.description)setFormField(formEl,'description',product.description);categorySelect.value='';const suggestionsDiv=document.getElementById('product-suggestions');if(suggestionsDiv){suggestionsDiv.style.display='none';suggestionsDiv.setAttribute('aria-hidden','true');}}
+function setFormField(formEl,fieldName,value){const field=formEl.querySelector('[name="'+fieldName+'"]');if(field){field.value=value;const event=new Event('change',{bubbles:true});field.dispatchEvent(event);}}}
\ No newline at end of file
@@ -0,0 +1,302 @@
+/* calendar.js - Dashboard calendar (routine, expiry and due-date events). */
+
+/* ==========================================================================
+   CALENDAR FUNCTIONALITY
+   ========================================================================== */
+
+(function() {
+  const root = document.querySelector('#calendar');
+  if (!root) return;
+
+  // Parse JSON script tags for events
+  let events = [];
+  let expiryEvents = [];
+  let weeklyDueDates = [];
+  let monthlyDueDates = [];
+  try {
+    const routineTag = document.getElementById('routine-events');
+    if (routineTag && routineTag.textContent) {
+      const parsed = JSON.parse(routineTag.textContent);
+      if (Array.isArray(parsed)) events = parsed;
+    }
+    const expiryTag = document.getElementById('expiry-events');
+    if (expiryTag && expiryTag.textContent) {
+      const parsedExpiry = JSON.parse(expiryTag.textContent);
+      if (Array.isArray(parsedExpiry)) expiryEvents = parsedExpiry;
+    }
+    const weeklyTag = document.getElementById('weekly-due-dates');
+    if (weeklyTag && weeklyTag.textContent) {
+      const parsedWeekly = JSON.parse(weeklyTag.textContent);
+      if (Array.isArray(parsedWeekly)) weeklyDueDates = parsedWeekly;
+    }
+    const monthlyTag = document.getElementById('monthly-due-dates');
+    if (monthlyTag && monthlyTag.textContent) {
+      const parsedMonthly = JSON.parse(monthlyTag.textContent);
+      if (Array.isArray(parsedMonthly)) monthlyDueDates = parsedMonthly;
+    }
+  } catch (e) {
+    // fallback below
+  }
+  if (!events.length && window.ROUTINE_EVENTS && Array.isArray(window.ROUTINE_EVENTS)) {
+    events = window.ROUTINE_EVENTS;
+  }
+  if (!expiryEvents.length && window.EXPIRY_EVENTS && Array.isArray(window.EXPIRY_EVENTS)) {
+    expiryEvents = window.EXPIRY_EVENTS;
+  }
+  const eventsByDate = {};
+  const expiryByDate = {};
+  
+  events.forEach(function(ev) {
+    if (!ev || !ev.date) return;
+    eventsByDate[ev.date] = ev;
+  });
+
+  expiryEvents.forEach(function(ex) {
+    if (!ex || !ex.date) return;
+    if (!expiryByDate[ex.date]) expiryByDate[ex.date] = [];
+    expiryByDate[ex.date].push(ex);
+  });
+
+  const state = {
+    year: (new Date()).getFullYear(),
+    month: (new Date()).getMonth() // 0-indexed
+  };
+
+  /**
+   * Renders the calendar interface
+   */
+  function render() {
+    root.innerHTML = '';
+
+    // Create header with navigation
+    const header = document.createElement('div');
+    header.className = 'sc-header';
+    
+    const prevBtn = document.createElement('button');
+    prevBtn.textContent = '<';
+    prevBtn.addEventListener('click', function() { changeMonth(-1); });
+    
+    const nextBtn = document.createElement('button');
+    nextBtn.textContent = '>';
+    nextBtn.addEventListener('click', function() { changeMonth(1); });
+    
+    const title = document.createElement('div');
+    title.className = 'sc-title';
+    title.textContent = new Date(state.year, state.month).toLocaleString(undefined, { 
+      month: 'long', 
+      year: 'numeric' 
+    });
+
+    header.appendChild(prevBtn);
+    header.appendChild(title);
+    header.appendChild(nextBtn);
+    root.appendChild(header);
+
+    // Create days of week header
+    const dow = ['Sun', 'Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat'];
+    const dowRow = document.createElement('div');
+    dowRow.className = 'sc-dow';
+    
+    dow.forEach(function(d) {
+      const cell = document.createElement('div');
+      cell.className = 'sc-dow-cell';
+      cell.textContent = d;
+      dowRow.appendChild(cell);
+    });
+    root.appendChild(dowRow);
+
+    // Create calendar grid
+    const grid = document.createElement('div');
+    grid.className = 'sc-grid';
+
+    const first = new Date(state.year, state.month, 1);
+    const startWeekday = first.getDay();
+    const daysInMonth = new Date(state.year, state.month + 1, 0).getDate();
+
+    // Add empty cells for days before month start
+    for (let i = 0; i < startWeekday; i++) {
+      const blank = document.createElement('div');
+      blank.className = 'sc-cell sc-other';
+      grid.appendChild(blank);
+    }
+
+    // Add cells for each day of the month
+    // Cache today's date at midnight for comparisons
+    const today = new Date();
+    today.setHours(0, 0, 0, 0);
+
+    for (let day = 1; day <= daysInMonth; day++) {
+      const dateKey = toDateKey(state.year, state.month, day);
+      const cell = document.createElement('div');
+      cell.className = 'sc-cell sc-day';
+      cell.dataset.date = dateKey;
+      cell.id = 'calendar-day-' + dateKey;
+
+      const num = document.createElement('div');
+      num.className = 'sc-day-num';
+      num.textContent = day;
+      cell.appendChild(num);
+
+      // Add status icon
+      const icon = document.createElement('div');
+      icon.className = 'sc-day-icon';
+      
+      const ev = eventsByDate[dateKey];
+      
+      // Check if the date is in the future and/or is today
+      const cellDate = new Date(state.year, state.month, day);
+      const isFutureDay = cellDate > today;
+      const isToday = cellDate.getTime() === today.getTime();
+      if (isToday) {
+        cell.classList.add('sc-today');
+      }
+      
+      // Set status indicators based on event data 
+      let statusText = 'No events';
+      if (ev) {
+        if (ev.status === 'completed') {
+          icon.textContent = '✨';
+          statusText = 'Completed';
+        } else if (ev.status === 'not_done') {
+          if (isFutureDay) {
+            // Future days - leave empty icon
+            icon.textContent = '';
+            statusText = 'Upcoming';
+          } else {
+            // Past missed days - red cross
+            icon.textContent = '×';
+            const errorColor = getCssVar('--error-color');
+            if (errorColor) icon.style.color = errorColor;
+            icon.style.fontSize = '2rem';
+            statusText = 'Missed';
+          }
+        } else if (ev.status === 'morning') {
+          icon.textContent = '☀️';
+          statusText = 'Morning routine';
+        } else if (ev.status === 'evening') {
+          icon.textContent = '🌙';
+          statusText = 'Evening routine';
+        }
+      } else if (isFutureDay) {
+        // Future days with no events
+        statusText = 'Upcoming';
+      }
+      
+      cell.appendChild(icon);
+
+    // Build tooltip text including expiry info if present (hover-only)
+      const parts = dateKey.split('-');
+      const readableDate = parts[2] + '-' + parts[1] + '-' + parts[0];
+    let tooltip = readableDate + ' — ' + statusText + (isToday ? ' • Today' : '');
+
+      const expiries = expiryByDate[dateKey] || [];
+      if (expiries.length) {
+        // Add a small badge to the cell for at-a-glance awareness
+        const badge = document.createElement('div');
+        badge.className = 'sc-expiry-badge';
+        badge.textContent = '⚠️';
+        cell.appendChild(badge);
+
+        // Tooltip details for expiry items (concise: name — brand)
+        const maxList = 2;
+        const items = expiries.slice(0, maxList).map(function(ex) {
+          const nameBrand = (ex.product_name || ex.title || 'Product') + (ex.brand ? (' — ' + ex.brand) : '');
+          return nameBrand;
+        });
+        const moreCount = expiries.length - items.length;
+        const expiryLine = 'Expiring: ' + items.join(' || ') + (moreCount > 0 ? (' and ' + moreCount + ' more') : '');
+        tooltip += ' • ' + expiryLine;
+      }
+
+      // Accessibility: add title and aria-label for screen readers/tooltips
+      cell.title = tooltip;
+      cell.setAttribute('aria-label', tooltip);
+
+      grid.appendChild(cell);
+    }
+
+
+    // Highlight weekly step reminders
+    const weeklyList = Array.isArray(weeklyDueDates) && weeklyDueDates.length ? weeklyDueDates : (Array.isArray(window.weeklyDueDates) ? window.weeklyDueDates : []);
+    weeklyList.forEach(function(item) {
+      const dayElem = document.getElementById('calendar-day-' + item.date);
+      if (dayElem) {
+        const weeklyRgb = getCssVar('--accent-color-bg-lighter-rgb');
+        const weeklyBorder = weeklyRgb ? ('rgb(' + weeklyRgb + ')') : getCssVar('--accent-step-weekly');
+        if (weeklyBorder) dayElem.style.border = '2px solid ' + weeklyBorder;
+        const weeklyText = 'Weekly step: ' + item.step_name + ' (' + item.routine_type + ')';
+        dayElem.title = dayElem.title ? (dayElem.title + ' • ' + weeklyText) : weeklyText;
+        dayElem.setAttribute('aria-label', dayElem.title);
+      }
+    });
+
+    // Highlight monthly step reminders
+    const monthlyList = Array.isArray(monthlyDueDates) && monthlyDueDates.length ? monthlyDueDates : (Array.isArray(window.monthlyDueDates) ? window.monthlyDueDates : []);
+    monthlyList.forEach(function(item) {
+      const dayElem = document.getElementById('calendar-day-' + item.date);
+      if (dayElem) {
+        const monthlyBorder = getCssVar('--accent-step-monthly');
+        if (monthlyBorder) dayElem.style.border = '2px solid ' + monthlyBorder;
+        const monthlyText = 'Monthly step: ' + item.step_name + ' (' + item.routine_type + ')';
+        dayElem.title = dayElem.title ? (dayElem.title + ' • ' + monthlyText) : monthlyText;
+        dayElem.setAttribute('aria-label', dayElem.title);
+      }
+    });
+
+    // Add trailing empty cells to complete the grid
+    const totalCells = startWeekday + daysInMonth;
+    const trailing = (7 - (totalCells % 7)) % 7;
+    for (let t = 0; t < trailing; t++) {
+      const blank2 = document.createElement('div');
+      blank2.className = 'sc-cell sc-other';
+      grid.appendChild(blank2);
+    }
+
+    root.appendChild(grid);
+
+  // Removed clickable details panel to keep calendar hover-only
+
+    // Today highlight uses default styling (no user-configurable options)
+  }
+
+  /**
+   * Shows event details for a specific date
+   * @param {string} dateKey - Date in YYYY-MM-DD format
+   */
+  // Removed showDetails() and related UI to avoid pop-ups; hover tooltips only
+
+  /**
+   * Converts year, month, day to date key string
+   * @param {number} y - Year
+   * @param {number} m - Month (0-indexed)
+   * @param {number} d - Day
+   * @returns {string} Date in YYYY-MM-DD format
+   */
+  function toDateKey(y, m, d) {
+    const mm = (m + 1).toString().padStart(2, '0');
+    const dd = d.toString().padStart(2, '0');
+    return y + '-' + mm + '-' + dd;
+  }
+
+  /**
+   * Changes the displayed month
+   * @param {number} delta - Number of months to change (+1 or -1)
+   */
+  function changeMonth(delta) {
+    state.month += delta;
+    if (state.month < 0) { 
+      state.month = 11; 
+      state.year -= 1; 
+    }
+    if (state.month > 11) { 
+      state.month = 0; 
+      state.year += 1; 
+    }
+    render();
+  }
+
+  // Initialize calendar
+  render();
+
+  // No calendar UI controls or persisted preferences for today highlight
+})();
@@ -0,0 +1,461 @@
+/* core.js - Shared by every page: toasts, CSRF/CSS helpers, theme, navigation
+   and the page dispatcher. Page modules are only present in the bundles
+   that need them, so the dispatcher checks before calling into them. */
+
+/* ==========================================================================
+   UTILITY FUNCTIONS - Optimized for performance
+   ========================================================================== */
+
+// Use a single toast element for all notifications to reduce DOM manipulation
+let toastQueue = [];
+let activeToast = null;
+let toastContainer = null;
+// Idempotent init flags to avoid duplicate bindings
+let productsInitialized = false;
+let routinesHandlersBound = false;
+
+/**
+ * Helper to read CSS custom properties from the document root - with caching
+ * @param {string} name - The name of the CSS variable (including --prefix)
+ * @returns {string|null} The value of the CSS variable, or null if not found
+ */
+const cssVarCache = {};
+function getCssVar(name) {
+  if (cssVarCache[name] !== undefined) return cssVarCache[name];
+  
+  try {
+    const val = getComputedStyle(document.documentElement).getPropertyValue(name);
+    cssVarCache[name] = val ? val.trim().replace(/^"|"$/g, '') : null;
+    return cssVarCache[name];
+  } catch (e) {
+    cssVarCache[name] = null;
+    return null;
+  }
+}
+
+/**
+ * Initialize toast container once on page load
+ */
+function initToastContainer() {
+  if (toastContainer) return;
+  
+  toastContainer = document.createElement('div');
+  toastContainer.className = 'toast-container';
+  toastContainer.style.cssText = `
+    position: fixed;
+    top: 20px;
+    right: 20px;
+    z-index: 1001;
+  `;
+  document.body.appendChild(toastContainer);
+}
+
+/**
+ * Process toast queue - shows next toast if available
+ */
+function processToastQueue() {
+  if (activeToast || toastQueue.length === 0) return;
+  
+  const { message, type } = toastQueue.shift();
+  
+  activeToast = document.createElement('div');
+  activeToast.className = `toast ${type}`;
+  activeToast.textContent = message;
+  activeToast.style.cssText = `
+    background: ${type === 'success' ? '#28a745' : '#dc3545'};
+    color: white;
+    padding: 1rem;
+    border-radius: 4px;
+    opacity: 0;
+    transition: opacity 0.3s ease;
+  `;
+  
+  toastContainer.appendChild(activeToast);
+  
+  // Use requestAnimationFrame for smoother animations
+  requestAnimationFrame(() => {
+    // Force reflow
+    // Use an explicit read that linters recognize as purposeful
+    void activeToast.getBoundingClientRect();
+    activeToast.style.opacity = '1';
+  });
+  
+  // Remove after 3 seconds with cleanup
+  setTimeout(() => {
+    activeToast.style.opacity = '0';
+    setTimeout(() => {
+      toastContainer.removeChild(activeToast);
+      activeToast = null;
+      processToastQueue();  // Process next toast if any
+    }, 300);
+  }, 3000);
+}
+
+/**
+ * Shows a success message toast notification - optimized version
+ * @param {string} message - The message to display
+ */
+function showSuccessMessage(message) {
+  initToastContainer();
+  toastQueue.push({ message, type: 'success' });
+  if (!activeToast) processToastQueue();
+}
+
+/**
+ * Shows an error message toast notification
+ * @param {string} message - The message to display
+ */
+function showErrorMessage(message) {
+  // Create a simple toast notification
+  const toast = document.createElement('div');
+  toast.className = 'toast error';
+  toast.textContent = message;
+  toast.style.cssText = `
+    position: fixed;
+    top: 20px;
+    right: 20px;
+    background: #dc3545;
+    color: white;
+    padding: 1rem;
+    border-radius: 4px;
+    z-index: 1001;
+    opacity: 0;
+    transition: opacity 0.3s ease;
+  `;
+  
+  document.body.appendChild(toast);
+  
+  // Fade in
+  setTimeout(() => toast.style.opacity = '1', 10);
+  
+  // Remove after 5 seconds
+  setTimeout(() => {
+    toast.style.opacity = '0';
+    setTimeout(() => document.body.removeChild(toast), 300);
+  }, 5000);
+}
+
+/**
+ * Gets the CSRF token from cookies
+ * @returns {string} The CSRF token
+ */
+function getCsrfToken() {
+  const name = 'csrftoken';
+  let cookieValue = null;
+  if (document.cookie && document.cookie !== '') {
+    const cookies = document.cookie.split(';');
+    for (let i = 0; i < cookies.length; i++) {
+      const cookie = cookies[i].trim();
+      if (cookie.substring(0, name.length + 1) === (name + '=')) {
+        cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+        break;
+      }
+    }
+  }
+  return cookieValue;
+}
+
+/**
+ * Simple debounce function
+ * @param {Function} func - The function to debounce
+ * @param {number} wait - The debounce delay in milliseconds
+ * @returns {Function} - The debounced function
+ */
+function debounce(func, wait) {
+  let timeout;
+  return function(...args) {
+    const context = this;
+    clearTimeout(timeout);
+    timeout = setTimeout(() => func.apply(context, args), wait);
+  };
+}
+
+/**
+ * Escape HTML for safe interpolation into innerHTML
+ * @param {any} text
+ * @returns {string}
+ */
+function escapeHtml(text) {
+  const div = document.createElement('div');
+  div.textContent = String(text);
+  return div.innerHTML;
+}
+
+// Autocomplete responses by "limit:query", so retyping a prefix is instant
+const autocompleteCache = new Map();
+
+/**
+ * Fetch product/brand suggestions for a typed prefix
+ * @param {string} query - What the user typed so far
+ * @param {number} limit - Maximum suggestions per group
+ * @returns {Promise<Object>} - {products, catalog, brands}; empty on error
+ */
+function fetchProductAutocomplete(query, limit = 8) {
+  const empty = { products: [], catalog: [], brands: [] };
+  const q = (query || '').trim();
+  if (q.length < 2) return Promise.resolve(empty);
+  const key = limit + ':' + q.toLowerCase();
+  if (autocompleteCache.has(key)) return autocompleteCache.get(key);
+
+  const params = new URLSearchParams({ q: q, limit: String(limit) });
+  const request = fetch('/api/products/autocomplete/?' + params.toString(), {
+    credentials: 'same-origin',
+    headers: { 'Accept': 'application/json' }
+  })
+    .then(response => {
+      if (!response.ok) throw new Error('Autocomplete failed: ' + response.status);
+      return response.json();
+    })
+    .then(data => ({
+      products: data.products || [],
+      catalog: data.catalog || [],
+      brands: data.brands || []
+    }))
+    .catch(error => {
+      console.debug('Autocomplete unavailable:', error);
+      autocompleteCache.delete(key); // retry on the next keystroke
+      return empty;
+    });
+  autocompleteCache.set(key, request);
+  return request;
+}
+
+/**
+ * Label used for a product in suggestion lists: "Brand — Name"
+ * @param {Object} product - Object with brand and name
+ * @returns {string}
+ */
+function productLabel(product) {
+  const brand = (product.brand || '').trim();
+  const name = (product.name || '').trim();
+  return `${brand}${brand && name ? ' — ' : ''}${name}` || 'Untitled Product';
+}
+
+/* ==========================================================================
+   INITIALIZATION
+   Main initialization that runs when DOM is loaded
+   ========================================================================== */
+document.addEventListener('DOMContentLoaded', function() {
+  // Initialize theme functionality
+  initTheme();
+  
+  // Initialize navigation
+  initNavigation();
+  
+  // Initialize page-specific functionality
+  initPageSpecificFunctions();
+  
+  // Setup common UI elements
+  setupCommonElements();
+
+  // Initialize progress bar width from data-progress (if present)
+  const progressBar = document.querySelector('.progress-fill');
+  if (progressBar) {
+    const progress = parseInt(progressBar.getAttribute('data-progress') || '0', 10);
+    if (!Number.isNaN(progress)) {
+      progressBar.style.width = progress + '%';
+    }
+  }
+
+  // Populate product selects on profile routine builder if present
+  if (typeof initProductSelectsForProfile === 'function') {
+    initProductSelectsForProfile();
+  }
+});
+
+/* ==========================================================================
+   THEME FUNCTIONALITY
+   Handles dark/light theme switching with localStorage persistence
+   ========================================================================== */
+
+/**
+ * Initialize theme functionality
+ */
+function initTheme() {
+  const themeToggle = document.getElementById('theme-toggle');
+  const body = document.body;
+
+  if (!themeToggle) {
+    // Not every page has a theme toggle
+    return;
+  }
+
+  // Check for saved theme preference or default to system preference
+  let currentTheme = 'light';
+  try {
+    const saved = localStorage.getItem('theme');
+    if (saved) {
+      currentTheme = saved;
+    } else if (window.matchMedia && window.matchMedia('(prefers-color-scheme: dark)').matches) {
+      currentTheme = 'dark';
+    }
+  } catch (e) {
+    // localStorage may be blocked; stay with default and continue
+  }
+
+  const isDark = (currentTheme === 'dark');
+  body.classList.toggle('dark-theme', isDark);
+  // Use literal emoji characters to avoid escaping issues in UI
+  themeToggle.textContent = isDark ? '☀️' : '🌙';
+  themeToggle.setAttribute('aria-pressed', String(isDark));
+  themeToggle.setAttribute('aria-label', isDark ? 'Switch to light theme' : 'Switch to dark theme');
+
+  // Avoid duplicate handlers if initTheme is called more than once
+  themeToggle.removeEventListener('click', themeToggle._handler || (()=>{}));
+  themeToggle._handler = function() {
+    const nowDark = !body.classList.contains('dark-theme');
+    body.classList.toggle('dark-theme', nowDark);
+    themeToggle.textContent = nowDark ? '☀️' : '🌙';
+    themeToggle.setAttribute('aria-pressed', String(nowDark));
+    themeToggle.setAttribute('aria-label', nowDark ? 'Switch to light theme' : 'Switch to dark theme');
+    try { localStorage.setItem('theme', nowDark ? 'dark' : 'light'); } catch (e) {}
+  };
+  themeToggle.addEventListener('click', themeToggle._handler);
+}
+
+/* ==========================================================================
+   NAVIGATION
+   Handles mobile navigation menu functionality
+   ========================================================================== */
+
+/**
+ * Mobile Hamburger Menu Functionality
+ * Handles responsive navigation menu toggle
+ */
+function initNavigation() {
+  const hamburgerMenu = document.getElementById('hamburger-menu');
+  const navLinks = document.getElementById('nav-links');
+
+  if (!(hamburgerMenu && navLinks)) return;
+
+  // Click handler for toggling menu
+  const onHamburgerClick = function() {
+    const willOpen = !navLinks.classList.contains('active');
+    hamburgerMenu.classList.toggle('active', willOpen);
+    navLinks.classList.toggle('active', willOpen);
+    // ARIA state
+    hamburgerMenu.setAttribute('aria-expanded', String(willOpen));
+    navLinks.setAttribute('aria-hidden', String(!willOpen));
+    // Body scroll lock
+    document.body.style.overflow = willOpen ? 'hidden' : '';
+  };
+
+  // Remove previous bindings (if any) to avoid duplicates
+  hamburgerMenu.removeEventListener('click', hamburgerMenu._handler || (()=>{}));
+  hamburgerMenu._handler = onHamburgerClick;
+  hamburgerMenu.addEventListener('click', onHamburgerClick);
+
+  // Close on nav link click
+  const navLinkItems = navLinks.querySelectorAll('a');
+  navLinkItems.forEach(link => {
+    link.removeEventListener('click', link._closeHandler || (()=>{}));
+    link._closeHandler = function() {
+      hamburgerMenu.classList.remove('active');
+      navLinks.classList.remove('active');
+      hamburgerMenu.setAttribute('aria-expanded', 'false');
+      navLinks.setAttribute('aria-hidden', 'true');
+      document.body.style.overflow = '';
+    };
+    link.addEventListener('click', link._closeHandler);
+  });
+
+  // Close when clicking outside
+  const onDocClick = function(event) {
+    const isClickInsideNav = navLinks.contains(event.target) || hamburgerMenu.contains(event.target);
+    if (!isClickInsideNav && navLinks.classList.contains('active')) {
+      hamburgerMenu.classList.remove('active');
+      navLinks.classList.remove('active');
+      hamburgerMenu.setAttribute('aria-expanded', 'false');
+      navLinks.setAttribute('aria-hidden', 'true');
+      document.body.style.overflow = '';
+    }
+  };
+  document.removeEventListener('click', document._navOutsideHandler || (()=>{}));
+  document._navOutsideHandler = onDocClick;
+  document.addEventListener('click', onDocClick);
+
+  // Close on resize
+  const onResize = function() {
+    if (window.innerWidth > 768 && navLinks.classList.contains('active')) {
+      hamburgerMenu.classList.remove('active');
+      navLinks.classList.remove('active');
+      hamburgerMenu.setAttribute('aria-expanded', 'false');
+      navLinks.setAttribute('aria-hidden', 'true');
+      document.body.style.overflow = '';
+    }
+  };
+  window.removeEventListener('resize', window._navResizeHandler || (()=>{}));
+  window._navResizeHandler = onResize;
+  window.addEventListener('resize', onResize);
+}
+
+/* ==========================================================================
+   COMMON UI FUNCTIONALITY
+   Shared UI elements and functionality
+   ========================================================================== */
+
+/**
+ * Initialize page-specific functions based on the current page
+ */
+function initPageSpecificFunctions() {
+  // Each page bundle only includes the modules it needs (see asset_bundles.py)
+  const hasRoutines = typeof initRoutines === 'function';
+  const hasProducts = typeof initProducts === 'function';
+
+  // Dashboard page initialization
+  if (document.querySelector('.dashboard-page')) {
+    // Calendar self-initializes via IIFE; no explicit global init call required
+    if (hasRoutines) initRoutines();
+  }
+  
+  // Product page initialization
+  if (document.querySelector('.products-page') && hasProducts) {
+    initProducts();
+  }
+
+  // Combined pages that need both routines and products
+  if (document.querySelector('.routines-products-page')) {
+    if (hasRoutines) initRoutines();
+    if (hasProducts) initProducts();
+  }
+
+  // Auto-detect product form pages even without marker class
+  if (hasProducts && (document.getElementById('product-form') || document.getElementById('category-browse'))) {
+    initProducts();
+  }
+
+  // Initialize add routine page enhancements (datalist name suggestions)
+  if (document.querySelector('.add-routine-page') && typeof initRoutineNameSuggestions === 'function') {
+    initRoutineNameSuggestions();
+  }
+}
+
+/**
+ * Setup common UI elements used across the application
+ */
+function setupCommonElements() {
+  // Setup any tooltips
+  try {
+    const tooltipTriggerList = [].slice.call(document.querySelectorAll('[data-bs-toggle="tooltip"]'));
+    if (window.bootstrap && typeof window.bootstrap.Tooltip === 'function') {
+      tooltipTriggerList.forEach(el => new window.bootstrap.Tooltip(el));
+    }
+  } catch (e) {
+    console.debug('Tooltips unavailable:', e);
+  }
+
+  // Setup popovers if any
+  try {
+    const popoverTriggerList = [].slice.call(document.querySelectorAll('[data-bs-toggle="popover"]'));
+    if (window.bootstrap && typeof window.bootstrap.Popover === 'function') {
+      popoverTriggerList.forEach(el => new window.bootstrap.Popover(el));
+    }
+  } catch (e) {
+    console.debug('Popovers unavailable:', e);
+  }
+  
+  // Setup routine step dropdowns for profile page
+  if (typeof setupRoutineStepDropdowns === 'function') {
+    setupRoutineStepDropdowns();
+  }
+}
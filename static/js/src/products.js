@@ -0,0 +1,317 @@
+/* products.js - Product list and product form pages. */
+
+/* ==========================================================================
+   PRODUCTS FUNCTIONALITY
+   Handles product management
+   ========================================================================== */
+
+/**
+ * Initialize products functionality
+ */
+function initProducts() {
+  if (productsInitialized) return;
+  productsInitialized = true;
+  initProductForms();
+  initProductSearch();
+  initProductSuggestions();
+  initProductAutocomplete();
+}
+
+/**
+ * Initializes product form submissions
+ */
+function initProductForms() {
+  const productForms = document.querySelectorAll('.product-form');
+  productForms.forEach(form => {
+    form.addEventListener('submit', handleProductFormSubmit);
+  });
+}
+
+/**
+ * Handles product form submission
+ * @param {Event} event - The form submission event
+ */
+function handleProductFormSubmit(event) {
+  event.preventDefault();
+  const form = event.target;
+  const formData = new FormData(form);
+  
+  // Show loading state
+  const submitButton = form.querySelector('button[type="submit"]');
+  const originalText = submitButton.textContent;
+  submitButton.textContent = 'Saving...';
+  submitButton.disabled = true;
+  
+  fetch(form.action, {
+    method: form.method,
+    body: formData,
+    headers: {
+      'X-Requested-With': 'XMLHttpRequest'
+    }
+  })
+  .then(response => response.json())
+  .then(data => {
+    if (data.status === 'success') {
+      showSuccessMessage(data.message || 'Product saved successfully');
+      
+      // If redirect URL provided, navigate to it
+      if (data.redirect_url) {
+        window.location.href = data.redirect_url;
+      }
+    } else {
+      showErrorMessage(data.message || 'Error saving product');
+      
+      // If form errors were returned, update the form to show them
+      if (data.errors) {
+        Object.entries(data.errors).forEach(([field, errors]) => {
+          const fieldElement = form.querySelector(`[name="${field}"]`);
+          if (fieldElement) {
+            fieldElement.classList.add('is-invalid');
+            
+            // Create or update error message
+            let errorElement = form.querySelector(`#${field}-error`);
+            if (!errorElement) {
+              errorElement = document.createElement('div');
+              errorElement.id = `${field}-error`;
+              errorElement.className = 'invalid-feedback';
+              fieldElement.parentNode.appendChild(errorElement);
+            }
+            errorElement.textContent = errors.join(' ');
+          }
+        });
+      }
+    }
+  })
+  .catch(error => {
+    console.error('Error:', error);
+    showErrorMessage('An error occurred while processing your request');
+  })
+  .finally(() => {
+    // Restore button state
+    submitButton.textContent = originalText;
+    submitButton.disabled = false;
+  });
+}
+
+/**
+ * Initializes product search functionality
+ */
+function initProductSearch() {
+  const searchInput = document.querySelector('#product-search');
+  if (!searchInput) return;
+  
+  searchInput.addEventListener('input', debounce(function() {
+    const searchTerm = this.value.trim();
+    const productsContainer = document.querySelector('#products-list');
+    
+    if (!productsContainer) return;
+    
+    if (searchTerm.length < 2) {
+      // Show all products if search term is too short
+      document.querySelectorAll('.product-card').forEach(card => {
+        card.style.display = '';
+      });
+      return;
+    }
+    
+    // Filter products based on search term
+    document.querySelectorAll('.product-card').forEach(card => {
+      const productName = card.querySelector('.product-name').textContent.toLowerCase();
+      const productBrand = card.querySelector('.product-brand')?.textContent.toLowerCase() || '';
+      
+      if (productName.includes(searchTerm.toLowerCase()) || productBrand.includes(searchTerm.toLowerCase())) {
+        card.style.display = '';
+      } else {
+        card.style.display = 'none';
+      }
+    });
+  }, 300));
+}
+
+/**
+ * Type-ahead for the product form's name and brand fields, backed by
+ * /api/products/autocomplete/. Picking a catalog product fills in its
+ * brand and type.
+ */
+function initProductAutocomplete() {
+  const productForm = document.getElementById('product-form');
+  if (!productForm) return;
+  const nameInput = productForm.querySelector('[name="name"]');
+  const brandInput = productForm.querySelector('[name="brand"]');
+  const typeInput = productForm.querySelector('[name="product_type"]');
+  if (!nameInput || !brandInput) return;
+
+  function attachDatalist(input, id) {
+    const datalist = document.createElement('datalist');
+    datalist.id = id;
+    input.setAttribute('list', id);
+    input.setAttribute('autocomplete', 'off');
+    input.parentNode.appendChild(datalist);
+    return datalist;
+  }
+
+  function fillOptions(datalist, entries) {
+    datalist.innerHTML = '';
+    entries.forEach(([value, label]) => {
+      const opt = document.createElement('option');
+      opt.value = value;
+      if (label) opt.label = label;
+      datalist.appendChild(opt);
+    });
+  }
+
+  const nameList = attachDatalist(nameInput, 'product-name-suggestions');
+  const brandList = attachDatalist(brandInput, 'product-brand-suggestions');
+  // Suggested name -> catalog/user product, for filling the other fields
+  let nameMatches = new Map();
+
+  const lookupNames = debounce(async function() {
+    const query = nameInput.value;
+    const results = await fetchProductAutocomplete(query);
+    if (nameInput.value !== query) return; // a newer keystroke is in flight
+    nameMatches = new Map();
+    // Catalog entries carry the shared details; own products come second
+    results.catalog.concat(results.products).forEach(p => {
+      if (p.name && !nameMatches.has(p.name)) nameMatches.set(p.name, p);
+    });
+    fillOptions(nameList, Array.from(nameMatches.values()).map(p => [p.name, p.brand]));
+  }, 200);
+
+  nameInput.addEventListener('input', function() {
+    const match = nameMatches.get(nameInput.value);
+    if (!match) {
+      lookupNames();
+      return;
+    }
+    // Chosen from the list: complete the fields the user hasn't filled
+    if (!brandInput.value.trim() && match.brand) brandInput.value = match.brand;
+    if (typeInput && !typeInput.value && match.product_type) {
+      const hasType = Array.from(typeInput.options || []).some(opt => opt.value === match.product_type);
+      if (hasType || typeInput.tagName !== 'SELECT') typeInput.value = match.product_type;
+    }
+  });
+
+  brandInput.addEventListener('input', debounce(async function() {
+    const query = brandInput.value;
+    const results = await fetchProductAutocomplete(query);
+    if (brandInput.value !== query) return;
+    fillOptions(brandList, results.brands.map(brand => [brand, '']));
+  }, 200));
+}
+
+// Removed unused AJAX delete code to align with confirmation-page delete flow
+
+/**
+ * Initializes product suggestions on the product form page
+ */
+function initProductSuggestions() {
+  const categorySelect = document.getElementById('category-browse');
+  const loadingDiv = document.getElementById('suggestions-loading');
+  const suggestionsDiv = document.getElementById('product-suggestions');
+  const suggestionsGrid = document.getElementById('suggestions-grid');
+  const productForm = document.getElementById('product-form');
+
+  // Only run where the product form and browse select exist
+  if (!categorySelect || !productForm || !suggestionsGrid || !suggestionsDiv || !loadingDiv) return;
+
+  categorySelect.addEventListener('change', function() {
+    const category = this.value;
+    if (!category) {
+      suggestionsDiv.style.display = 'none';
+      suggestionsDiv.setAttribute('aria-hidden', 'true');
+      return;
+    }
+
+    // Show loading state
+    loadingDiv.style.display = 'block';
+    loadingDiv.setAttribute('aria-hidden', 'false');
+    suggestionsDiv.style.display = 'none';
+    suggestionsDiv.setAttribute('aria-hidden', 'true');
+    suggestionsGrid.innerHTML = '';
+
+    fetch('/api/products/browse/' + encodeURIComponent(category) + '/')
+      .then(function(response) {
+        if (!response.ok) throw new Error('Network response was not ok');
+        return response.json();
+      })
+      .then(function(products) {
+        loadingDiv.style.display = 'none';
+        loadingDiv.setAttribute('aria-hidden', 'true');
+
+        if (!products || products.length === 0) {
+          suggestionsGrid.innerHTML = '<p class="muted-message">No products found for this category. Try importing some first!</p>';
+        } else {
+          products.forEach(function(product) {
+            const card = createSuggestionCard(product, productForm);
+            suggestionsGrid.appendChild(card);
+          });
+        }
+
+        suggestionsDiv.style.display = 'block';
+        suggestionsDiv.setAttribute('aria-hidden', 'false');
+      })
+      .catch(function(error) {
+        console.error('Error fetching products:', error);
+        loadingDiv.style.display = 'none';
+        loadingDiv.setAttribute('aria-hidden', 'true');
+        suggestionsGrid.innerHTML = '<p class="error-message">Error loading suggestions. Please try again.</p>';
+        suggestionsDiv.style.display = 'block';
+        suggestionsDiv.setAttribute('aria-hidden', 'false');
+      });
+  });
+
+  function createSuggestionCard(product, formEl) {
+    const card = document.createElement('div');
+    card.className = 'suggestion-card';
+    card.style.cursor = 'pointer';
+
+    const productTypeDisplay = product.product_type_display || product.product_type || '';
+
+    card.innerHTML =
+      '<h5>' + escapeHtml(product.name || '') + '</h5>' +
+      '<p><strong>Brand:</strong> ' + escapeHtml(product.brand || '') + '</p>' +
+      (product.ingredients ?
+        '<p><strong>Key ingredients:</strong> ' + escapeHtml(product.ingredients.substring(0, 100)) +
+        (product.ingredients.length > 100 ? '...' : '') + '</p>' : '') +
+      '<div class="product-type">' + escapeHtml(productTypeDisplay) + '</div>';
+
+    card.addEventListener('click', function() {
+      fillProductForm(formEl, product);
+      // Scroll and highlight
+      formEl.scrollIntoView({ behavior: 'smooth', block: 'center' });
+      const highlightColor = getCssVar('--accent-color-bg-lighter');
+      if (highlightColor) {
+        const original = formEl.style.backgroundColor;
+        formEl.style.backgroundColor = highlightColor;
+        setTimeout(function() { formEl.style.backgroundColor = original; }, 2000);
+      }
+    });
+
+    return card;
+  }
+
+  function fillProductForm(formEl, product) {
+    setFormField(formEl, 'name', product.name || '');
+    setFormField(formEl, 'brand', product.brand || '');
+    setFormField(formEl, 'product_type', product.product_type || '');
+    if (product.ingredients) setFormField(formEl, 'ingredients', product.ingredients);
+    if (product.description) setFormField(formEl, 'description', product.description);
+
+    // Reset dropdown and hide suggestions area
+    categorySelect.value = '';
+    const suggestionsDiv = document.getElementById('product-suggestions');
+    if (suggestionsDiv) {
+      suggestionsDiv.style.display = 'none';
+      suggestionsDiv.setAttribute('aria-hidden', 'true');
+    }
+  }
+
+  function setFormField(formEl, fieldName, value) {
+    const field = formEl.querySelector('[name="' + fieldName + '"]');
+    if (field) {
+      field.value = value;
+      const event = new Event('change', { bubbles: true });
+      field.dispatchEvent(event);
+    }
+  }
+}
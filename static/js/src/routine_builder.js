@@ -0,0 +1,731 @@
+/* routine_builder.js - Add-routine page: name suggestions, step rows and product selects. */
+
+/**
+ * Initialize routine name suggestions on add routine page
+ * Supports datalist dropdown and clickable chips, adapts to routine type
+ */
+function initRoutineNameSuggestions() {
+  const nameInput = document.getElementById('routine_name');
+  const typeSelect = document.getElementById('routine_type');
+  const datalist = document.getElementById('routine-name-suggestions');
+  if (!(nameInput && typeSelect && datalist)) return;
+
+  // Original custom phrases you mentioned
+  const custom = {
+    morning: [
+      'Busy Morning',
+      'Coming Morning',
+      'Routine Morning for Work',
+      'Going Morning to Work',
+      'Morning for Work',
+      'Morning Before Work',
+      'Early AM Reset',
+      'Sunrise Routine'
+    ],
+    evening: [
+      'Night Shift',
+      'Post Night Shift Morning',
+      'Late Night Reset',
+      'Evening Wind Down',
+      'Post-Shift Night Care'
+    ],
+    weekly: ['Weekly Treatment', 'Sunday Reset', 'Weekly Exfoliation'],
+    monthly: ['Monthly Refresh', 'Monthly Mask', 'Monthly Reset'],
+    hair: ['Hair Care', 'Scalp Soothe', 'Glossy Hair Routine'],
+    body: ['Body Care', 'Body Glow', 'Self-care Body Routine'],
+    special: ['Special Care', 'Event Prep', 'SOS Routine'],
+    seasonal: ['Seasonal Routine', 'Winter Care', 'Summer Skin']
+  };
+
+  function getSuggestions() {
+    const type = (typeSelect.value || '').toLowerCase();
+    const list = custom[type];
+    // Fallback baseline list
+    return Array.isArray(list) && list.length
+      ? list
+      : ['Morning Routine', 'Evening Reset', 'Weekly Treatment', 'Monthly Refresh'];
+  }
+
+  function renderDatalist() {
+    if (!datalist) return;
+    const items = getSuggestions();
+    datalist.innerHTML = '';
+    items.forEach(text => {
+      const opt = document.createElement('option');
+      opt.value = text;
+      datalist.appendChild(opt);
+    });
+  }
+
+  // Initial render and on-change wiring
+  renderDatalist();
+  typeSelect.addEventListener('change', function() {
+    renderDatalist();
+  });
+}
+
+/**
+ * Setup routine step dropdowns
+ */
+function setupRoutineStepDropdowns() {
+  const stepSelects = document.querySelectorAll('.routine-step-select');
+  if (!stepSelects.length) return;
+
+  stepSelects.forEach(select => {
+    select.addEventListener('change', function() {
+      const selectedOption = this.options[this.selectedIndex];
+      const productField = document.querySelector('#product-for-' + this.dataset.stepId);
+      
+      if (productField) {
+        productField.value = selectedOption.dataset.productId || '';
+      }
+    });
+  })
+};
+
+/**
+ * Populate .product-select dropdowns from #user-products-data JSON
+ * and keep them in sync for dynamic add/remove of steps
+ */
+function initProductSelectsForProfile() {
+  const stepsContainer = document.getElementById('steps-container');
+  if (!stepsContainer) return;
+  const jsonTag = document.getElementById('user-products-data');
+  let products = [];
+  // Cache suggestions by category to avoid repeated requests
+  const suggestionCache = {};
+  try {
+    if (jsonTag && jsonTag.textContent) {
+      const parsed = JSON.parse(jsonTag.textContent);
+      if (Array.isArray(parsed)) products = parsed; // [[id, brand, name], ...]
+    }
+  } catch (_) {}
+
+  // Fallback: if no JSON-provided products, try to infer from existing select options
+  if (!products.length) {
+    const firstSel = stepsContainer.querySelector('select.product-select, select[id^="product"]');
+    if (firstSel && firstSel.options && firstSel.options.length > 1) {
+      const arr = [];
+      for (const opt of firstSel.options) {
+        if (!opt.value) continue; // skip placeholder
+        const label = (opt.textContent || '').trim();
+        // Expect format "Brand - Name" from Product.__str__
+        let brand = '';
+        let name = label;
+        const idx = label.indexOf(' - ');
+        if (idx > -1) {
+          brand = label.slice(0, idx).trim();
+          name = label.slice(idx + 3).trim();
+        }
+        arr.push([opt.value, brand, name]);
+      }
+      if (arr.length) products = arr;
+    }
+  }
+
+  function buildOptionsHtml(selectedVal) {
+    const hasSelection = !!selectedVal;
+    let html = `<option value="" disabled${hasSelection ? '' : ' selected'}>Add product</option>`;
+    if (products.length) {
+      html += '<optgroup label="My products">';
+      for (const item of products) {
+        const [id, brand, name] = item;
+        const label = `${brand || ''}${brand && name ? ' — ' : ''}${name || ''}`.trim() || 'Untitled Product';
+        const sel = String(selectedVal || '') === String(id) ? ' selected' : '';
+        html += `<option value="${id}"${sel}>${label}</option>`;
+      }
+      html += '</optgroup>';
+    } else {
+      html += '<option value="" disabled>No products yet</option>';
+    }
+    return html;
+  }
+
+  function buildOptionsWithSuggestions(selectedVal, suggestions) {
+    const hasSelection = !!selectedVal;
+    let html = `<option value="" disabled${hasSelection ? '' : ' selected'}>Add product</option>`;
+    // My products
+    if (products.length) {
+      html += '<optgroup label="My products">';
+      for (const item of products) {
+        const [id, brand, name] = item;
+        const label = `${brand || ''}${brand && name ? ' — ' : ''}${name || ''}`.trim() || 'Untitled Product';
+        const sel = String(selectedVal || '') === String(id) ? ' selected' : '';
+        html += `<option value="${id}"${sel}>${label}</option>`;
+      }
+      html += '</optgroup>';
+    }
+    // Suggestions
+    html += '<optgroup label="Suggestions">';
+    if (Array.isArray(suggestions) && suggestions.length) {
+      suggestions.forEach((sug, idx) => {
+        const label = `${(sug.brand || '').trim()}${sug.brand && sug.name ? ' — ' : ''}${(sug.name || '').trim()}` || 'Suggested Product';
+        const val = `suggestion::${idx}`;
+        html += `<option value="${val}" data-sug-name="${(sug.name||'').replace(/"/g,'&quot;')}" data-sug-brand="${(sug.brand||'').replace(/"/g,'&quot;')}" data-sug-type="${(sug.product_type||'').replace(/"/g,'&quot;')}">${label}</option>`;
+      });
+    } else {
+      // Explicit placeholder to show suggestions are supported even if none are available for now
+      html += '<option value="" disabled>No suggestions for this step yet</option>';
+    }
+    html += '</optgroup>';
+    return html;
+  }
+
+  function populateAll() {
+    const selects = stepsContainer.querySelectorAll('select.product-select');
+    selects.forEach(sel => {
+      // If the select already has multiple options (server-rendered), don't wipe them
+      const existingOptions = sel.options ? sel.options.length : 0;
+      if (!products.length || existingOptions > 1) return;
+      const pre = sel.getAttribute('data-selected') || sel.value || '';
+      sel.innerHTML = buildOptionsHtml(pre);
+      if (pre) sel.value = pre; // re-apply selected if any
+    });
+  }
+
+  // Initial population (only if we have explicit product list and empty selects)
+  populateAll();
+
+  // No toggle logic needed; select is always visible and compact
+
+  // When steps are added dynamically, ensure new product select is populated
+  const addBtn = document.getElementById('add-step-btn');
+  const removeBtn = document.getElementById('remove-step-btn');
+  if (addBtn) {
+    addBtn.addEventListener('click', function() {
+      // Defer to allow the step DOM to be appended by existing code
+      setTimeout(() => {
+        // Find last step item and see if it has a product-select without options
+        const items = stepsContainer.querySelectorAll('.step-item');
+        const last = items[items.length - 1];
+        if (!last) return;
+        let psel = last.querySelector('select.product-select');
+        if (!psel) {
+          // Create and append if not present
+          const stepNum = last.getAttribute('data-step') || items.length;
+          psel = document.createElement('select');
+          psel.id = 'product' + stepNum;
+          psel.name = 'product' + stepNum;
+          psel.className = 'product-select';
+          last.appendChild(psel);
+        }
+        // Populate
+        const pre = psel.getAttribute('data-selected') || psel.value || '';
+        psel.innerHTML = buildOptionsHtml(pre);
+        if (pre) psel.value = pre;
+        // Wire suggestion behavior for this new row
+        wireSuggestionsForItem(last);
+        wireAutocompleteForItem(last);
+      }, 0);
+    });
+  }
+  if (removeBtn) {
+    removeBtn.addEventListener('click', function() {
+     // Defer to allow the step DOM to be removed by existing code
+    });
+  }
+
+  // Map a step label to a product category understood by the API
+  function mapStepToCategory(label) {
+    const v = (label || '').toLowerCase().trim();
+    if (!v) return null;
+
+    // Deterministic mapping for known options
+    const exactMap = {
+      // Face routines
+      'gentle cleanse': 'cleanser',
+      'double cleanse': 'cleanser',
+      'deep cleanse': 'cleanser',
+      'cleanser': 'cleanser',
+      'face wash': 'cleanser',
+      'toner': 'toner',
+      'essence': 'essence',
+      'vitamin c serum': 'vitamin_c',
+      'treatment serum': 'serum',
+      'intensive serum': 'serum',
+      'light moisturizer': 'moisturizer',
+      'moisturizer': 'moisturizer',
+      'spf / sunscreen': 'sunscreen',
+      'retinol / acid treatment': 'retinol',
+      'active': 'serum',
+      'actives': 'serum',
+      'spot treatment': 'spot_treatment',
+      'eye cream': 'eye_cream',
+      'face oil': 'oil',
+      'lip treatment': 'lip_treatment',
+
+      // Weekly treatments
+      'exfoliation': 'exfoliant',
+      'clay mask': 'mask',
+      'hydrating mask': 'mask',
+      'intensive treatment': 'treatment',
+
+      // Monthly/specialized
+      'professional treatment': 'professional_treatment',
+      'deep repair mask': 'mask',
+      'barrier repair': 'barrier_repair',
+      'reset treatment': 'reset_treatment',
+
+      // Body
+      'body wash': 'body_wash',
+      'body scrub': 'body_scrub',
+      'body lotion': 'body_lotion',
+      'body oil': 'body_oil',
+      'deodorant': 'deodorant',
+      'hand cream': 'hand_cream',
+      'foot treatment': 'foot_treatment',
+
+      // Hair
+      'clarifying shampoo': 'clarifying_shampoo',
+      'shampoo': 'shampoo',
+      'conditioner': 'conditioner',
+      'hair mask': 'hair_mask',
+      'deep hair mask': 'deep_hair_mask',
+      'leave-in treatment': 'leave_in_treatment',
+      'hair oil': 'hair_oil',
+      'scalp treatment': 'scalp_treatment',
+      'heat protectant': 'heat_protectant',
+
+      // Special
+      'prep treatment': 'primer',
+      'priming serum': 'primer',
+      'glow treatment': 'glow_treatment',
+      'hydration boost': 'hydration_boost',
+      'setting treatment': 'setting_treatment',
+
+      // Seasonal
+      'season prep': 'season_prep',
+      'climate adjustment': 'climate_adjustment',
+      'humidity control': 'humidity_control',
+      'weather protection': 'weather_protection',
+      'transition treatment': 'transition_treatment',
+    };
+    if (exactMap[v]) return exactMap[v];
+
+    // Fallback heuristics for custom steps
+  if (v.includes('cleanse') || v.includes('wash')) return 'cleanser';
+    if (v.includes('toner')) return 'toner';
+    if (v.includes('essence')) return 'essence';
+  if (v.includes('vitamin c') || v.includes('ascorbic')) return 'vitamin_c';
+  if (v.includes('serum') || v.includes('active') || v.includes('niacinamide') || v.includes('hyaluronic') || v.includes('azelaic') || v.includes('tranexamic')) return 'serum';
+  if (v.includes('moistur')) return 'moisturizer';
+    if (v.includes('spf') || v.includes('sunscreen')) return 'sunscreen';
+  if (v.includes('retinol') || v.includes('retinoid')) return 'retinol';
+  if (v.includes('acid') || v.includes('exfol') || v.includes('aha') || v.includes('bha') || v.includes('salicylic') || v.includes('glycolic') || v.includes('lactic')) return 'exfoliant';
+    if (v.includes('mask')) return 'mask';
+    if (v.includes('eye')) return 'eye_cream';
+  if (v.includes('lip')) return 'lip_treatment';
+  if (v.includes('oil') || v.includes('squalane')) return 'oil';
+  if (v.includes('spot') || v.includes('benzoyl')) return 'spot_treatment';
+    if (v.includes('body') && v.includes('wash')) return 'body_wash';
+    if (v.includes('body') && v.includes('scrub')) return 'body_scrub';
+    if (v.includes('body') && (v.includes('lotion') || v.includes('cream'))) return 'body_lotion';
+    if (v.includes('shampoo')) return 'shampoo';
+    if (v.includes('conditioner')) return 'conditioner';
+    if (v.includes('scalp')) return 'scalp_treatment';
+    if (v.includes('heat') && v.includes('protect')) return 'heat_protectant';
+    if (v.includes('deodor')) return 'deodorant';
+    if (v.includes('hand')) return 'hand_cream';
+    if (v.includes('foot')) return 'foot_treatment';
+    return null;
+  }
+
+  async function fetchSuggestions(category) {
+    // If no category inferred, provide a small default set so the user always sees something
+    if (!category) {
+      return [
+        { name: 'Gentle Skin Cleanser', brand: 'Cetaphil', product_type: 'cleanser' },
+        { name: 'Niacinamide 10% + Zinc 1%', brand: 'The Ordinary', product_type: 'serum' },
+        { name: 'Daily Facial Moisturizing Lotion', brand: 'CeraVe', product_type: 'moisturizer' },
+        { name: 'UV Clear Broad-Spectrum SPF 46', brand: 'EltaMD', product_type: 'sunscreen' }
+      ];
+    }
+    if (suggestionCache[category]) return suggestionCache[category];
+    try {
+      const resp = await fetch(`/api/products/browse/${encodeURIComponent(category)}/`, {
+        credentials: 'same-origin',
+        headers: { 'Accept': 'application/json' }
+      });
+      if (!resp.ok) {
+        console.debug('Suggestion fetch failed:', category, resp.status);
+        return [];
+      }
+      // Ensure JSON; if server returned HTML (e.g., redirect), guard it
+      const ct = resp.headers.get('content-type') || '';
+      if (!ct.includes('application/json')) {
+        console.debug('Suggestion response not JSON for category:', category, ct);
+        return [];
+      }
+      const data = await resp.json();
+      suggestionCache[category] = Array.isArray(data) ? data : [];
+      return suggestionCache[category];
+    } catch (_) {
+      console.debug('Suggestion fetch error for category:', category);
+      // On network/API error, offer a safe baseline set
+      return [
+        { name: 'Gentle Skin Cleanser', brand: 'Cetaphil', product_type: 'cleanser' },
+        { name: 'Niacinamide 10% + Zinc 1%', brand: 'The Ordinary', product_type: 'serum' },
+        { name: 'Daily Facial Moisturizing Lotion', brand: 'CeraVe', product_type: 'moisturizer' },
+        { name: 'UV Clear Broad-Spectrum SPF 46', brand: 'EltaMD', product_type: 'sunscreen' }
+      ];
+    }
+  }
+
+  function getStepAndProductSelectsFromItem(item) {
+    // Support both select-based step pickers and plain text inputs
+    let stepField = item.querySelector('select[id^="step"]');
+    if (!stepField) {
+      // Django default IDs are like id_step1
+      stepField = item.querySelector('input[id^="id_step"], input[name^="step"]');
+    }
+    let productSel = item.querySelector('select.product-select, select[id^="product"]');
+    return { stepField, productSel };
+  }
+
+  function setProductSelectOptions(productSel, selectedVal, suggestions) {
+    productSel.innerHTML = buildOptionsWithSuggestions(selectedVal, suggestions);
+    if (selectedVal) productSel.value = String(selectedVal);
+  }
+
+  function handleSuggestionSelection(productSel) {
+    productSel.addEventListener('change', function() {
+      const val = productSel.value;
+      if (!val || !val.startsWith('suggestion::')) return;
+      // Extract suggestion payload
+      const opt = productSel.options[productSel.selectedIndex];
+      quickAddProduct(productSel, {
+        name: opt.getAttribute('data-sug-name'),
+        brand: opt.getAttribute('data-sug-brand'),
+        product_type: opt.getAttribute('data-sug-type')
+      });
+    });
+  }
+
+  // Save a suggested/catalog product to the user's list and select it
+  async function quickAddProduct(productSel, suggestion) {
+    const name = (suggestion.name || '').trim();
+    const brand = (suggestion.brand || '').trim();
+    const rawType = (suggestion.product_type || '').trim() || 'other';
+    // Normalize product type to match backend allowed choices and length
+    const allowedTypesMap = {
+      cleanser: true,
+      toner: true,
+      serum: true,
+      moisturizer: true,
+      sunscreen: true,
+      exfoliant: true,
+      mask: true,
+      eye_cream: true,
+      oil: true,
+      essence: true,
+      spot_treatment: true,
+      retinol: true,
+      vitamin_c: true,
+      other: true
+    };
+    let product_type = rawType;
+    if (!allowedTypesMap[product_type] || product_type.length > 20) {
+      // Heuristics: map common families to closest core type
+      if (product_type.includes('vitamin')) product_type = 'vitamin_c';
+      else if (product_type.includes('retinol')) product_type = 'retinol';
+      else if (product_type.includes('mask')) product_type = 'mask';
+      else if (product_type.includes('exfol')) product_type = 'exfoliant';
+      else if (product_type.includes('toner')) product_type = 'toner';
+      else if (product_type.includes('essence')) product_type = 'essence';
+      else if (product_type.includes('serum') || product_type.includes('treatment')) product_type = 'serum';
+      else product_type = 'other';
+    }
+    if (!name || !brand) return;
+    // Persist via quick-add, then select the new product id
+    try {
+      const form = new FormData();
+      form.append('name', name);
+      form.append('brand', brand);
+      form.append('product_type', product_type);
+      const resp = await fetch('/api/products/quick-add/', {
+        method: 'POST',
+        headers: { 'X-CSRFToken': getCsrfToken() },
+        body: form,
+        credentials: 'same-origin'
+      });
+      if (!resp.ok) throw new Error('quick-add failed');
+      const data = await resp.json();
+      if (data && data.success && data.product && data.product.id) {
+        // Add to in-memory list and rebuild with selection
+        products.push([data.product.id, data.product.brand || '', data.product.name || '']);
+        setProductSelectOptions(productSel, data.product.id, []);
+      }
+    } catch (e) {
+      showErrorMessage('Could not add suggested product.');
+      setProductSelectOptions(productSel, '', []);
+    }
+  }
+
+  // Type-ahead search above a product select, backed by /api/products/autocomplete/
+  function wireAutocompleteForItem(item) {
+    const { productSel } = getStepAndProductSelectsFromItem(item);
+    if (!productSel || productSel.dataset.autocomplete) return;
+    productSel.dataset.autocomplete = 'on';
+
+    const listId = (productSel.id || 'product' + (item.getAttribute('data-step') || '')) + '-search-list';
+    const search = document.createElement('input');
+    search.type = 'search';
+    search.className = 'product-search';
+    search.placeholder = 'Search your products or the catalog';
+    search.autocomplete = 'off';
+    search.setAttribute('list', listId);
+    search.setAttribute('aria-label', 'Search products');
+    const datalist = document.createElement('datalist');
+    datalist.id = listId;
+    productSel.parentNode.insertBefore(search, productSel);
+    productSel.parentNode.insertBefore(datalist, productSel);
+
+    // Option label -> {owned, item} for the suggestions currently listed
+    let matches = new Map();
+
+    const lookup = debounce(async function() {
+      const query = search.value;
+      const results = await fetchProductAutocomplete(query);
+      if (search.value !== query) return; // a newer keystroke is in flight
+      matches = new Map();
+      results.products.forEach(p => matches.set(productLabel(p), { owned: true, item: p }));
+      results.catalog.forEach(p => {
+        const label = productLabel(p);
+        if (!matches.has(label)) matches.set(label, { owned: false, item: p });
+      });
+      datalist.innerHTML = '';
+      matches.forEach((match, label) => {
+        const opt = document.createElement('option');
+        opt.value = label;
+        if (!match.owned) opt.label = 'Catalog';
+        datalist.appendChild(opt);
+      });
+    }, 200);
+
+    function pick(match) {
+      search.value = '';
+      datalist.innerHTML = '';
+      matches = new Map();
+      if (!match.owned) {
+        quickAddProduct(productSel, match.item);
+        return;
+      }
+      const id = match.item.id;
+      if (!products.some(([pid]) => String(pid) === String(id))) {
+        products.push([id, match.item.brand || '', match.item.name || '']);
+      }
+      if (!Array.from(productSel.options).some(opt => opt.value === String(id))) {
+        setProductSelectOptions(productSel, id, []);
+      }
+      productSel.value = String(id);
+      productSel.dispatchEvent(new Event('change', { bubbles: true }));
+    }
+
+    // Choosing a datalist option fills the input with its label
+    search.addEventListener('input', function() {
+      const match = matches.get(search.value);
+      if (match) pick(match);
+      else lookup();
+    });
+  }
+
+  function wireSuggestionsForItem(item) {
+    const { stepField, productSel } = getStepAndProductSelectsFromItem(item);
+    if (!productSel) return;
+    // Determine current category from step text/value
+    const stepValue = stepField ? (stepField.value || '') : '';
+    const currentCat = mapStepToCategory(stepValue);
+    const currentVal = productSel.getAttribute('data-selected') || productSel.value || '';
+    if (currentCat) {
+      fetchSuggestions(currentCat).then(sugs => setProductSelectOptions(productSel, currentVal, sugs));
+    } else {
+      setProductSelectOptions(productSel, currentVal, []);
+    }
+    // Wire selection handler (quick-add on suggestion)
+    handleSuggestionSelection(productSel);
+    // On step change or input, refresh suggestions
+    if (stepField) {
+      const handler = async function() {
+        const cat = mapStepToCategory(stepField.value);
+        const selVal = productSel.value || '';
+        const sugs = await fetchSuggestions(cat);
+        setProductSelectOptions(productSel, selVal, sugs);
+      };
+      const evt = stepField.tagName === 'SELECT' ? 'change' : 'input';
+      stepField.addEventListener(evt, handler);
+    }
+
+    // Fallback: on first focus of product select, fetch suggestions for current step
+    let fetchedOnFocus = false;
+    productSel.addEventListener('focus', async function() {
+      if (fetchedOnFocus) return;
+      const text = stepField ? (stepField.value || '') : '';
+      const cat = mapStepToCategory(text);
+      if (!cat) return; // no category derived
+      const sugs = await fetchSuggestions(cat);
+      if (sugs && sugs.length) {
+        const selVal = productSel.value || '';
+        setProductSelectOptions(productSel, selVal, sugs);
+        fetchedOnFocus = true;
+      }
+    }, { once: false });
+  }
+
+  // Wire all existing step rows to enrich selects with suggestions without removing existing options
+  stepsContainer.querySelectorAll('.step-item').forEach(item => {
+    wireSuggestionsForItem(item);
+    wireAutocompleteForItem(item);
+  });
+}
+
+/* ==========================================================================
+   PROFILE PAGE: ROUTINE STEP BUILDER
+   Populates step selects, supports custom option, and add/remove steps
+   ========================================================================== */
+
+function initProfileRoutineBuilder() {
+  const stepsContainer = document.getElementById('steps-container');
+  const routineTypeEl = document.getElementById('routine_type');
+  const addBtn = document.getElementById('add-step-btn');
+  const removeBtn = document.getElementById('remove-step-btn');
+  const stepCountEl = document.querySelector('.step-count');
+
+  if (!stepsContainer || !routineTypeEl) return; // Not on profile add/edit form
+
+  const stepOptionsByType = {
+    morning: [
+      'Gentle Cleanse', 'Toner', 'Essence', 'Vitamin C Serum', 'Light Moisturizer', 'Eye Cream', 'SPF / Sunscreen'
+    ],
+    evening: [
+      'Double Cleanse', 'Toner', 'Essence', 'Treatment Serum', 'Retinol / Acid Treatment', 'Eye Cream', 'Moisturizer', 'Face Oil', 'Spot Treatment', 'Lip Treatment'
+    ],
+    weekly: [
+      'Deep Cleanse', 'Exfoliation', 'Clay Mask', 'Hydrating Mask', 'Hair Mask', 'Body Scrub', 'Intensive Treatment'
+    ],
+    monthly: [
+      'Professional Treatment', 'Deep Repair Mask', 'Intensive Serum', 'Barrier Repair', 'Reset Treatment'
+    ],
+    hair: [
+      'Clarifying Shampoo', 'Shampoo', 'Conditioner', 'Deep Hair Mask', 'Leave-in Treatment', 'Hair Oil', 'Scalp Treatment', 'Heat Protectant'
+    ],
+    body: [
+      'Body Wash', 'Body Scrub', 'Body Lotion', 'Body Oil', 'Deodorant', 'Hand Cream', 'Foot Treatment'
+    ],
+    special: [
+      'Prep Treatment', 'Priming Serum', 'Glow Treatment', 'Hydration Boost', 'Setting Treatment', 'Special Occasion Mask'
+    ],
+    seasonal: [
+      'Season Prep', 'Climate Adjustment', 'Barrier Repair', 'Humidity Control', 'Weather Protection', 'Transition Treatment'
+    ]
+  };
+
+  const minSteps = 1;
+  const maxSteps = 10;
+
+  function updateStepCount() {
+    const count = stepsContainer.querySelectorAll('.step-item').length;
+    if (stepCountEl) stepCountEl.textContent = `${count} step${count !== 1 ? 's' : ''}`;
+    if (addBtn) addBtn.disabled = count >= maxSteps;
+    if (removeBtn) removeBtn.disabled = count <= minSteps;
+  }
+
+  function buildOptions(routineType) {
+    const options = stepOptionsByType[routineType] || stepOptionsByType.morning;
+    let html = '<option value="">Select step</option>';
+    html += options.map(opt => `<option value="${opt}">${opt}</option>`).join('');
+    html += '<option value="custom">✏️ Custom Step...</option>';
+    return html;
+  }
+
+  function attachSelectBehavior(selectEl) {
+    // Remove previous handler if present
+    selectEl.removeEventListener('change', selectEl._handler || (()=>{}));
+    selectEl._handler = function() {
+      const stepNumber = this.id.replace('step', '');
+      let customInput = document.getElementById(`custom-step${stepNumber}`);
+      if (this.value === 'custom') {
+        if (!customInput) {
+          customInput = document.createElement('input');
+          customInput.type = 'text';
+          customInput.id = `custom-step${stepNumber}`;
+          customInput.name = `step${stepNumber}`;
+          customInput.className = 'form-control custom-step-input';
+          customInput.placeholder = 'Enter custom step name...';
+          customInput.style.marginTop = '5px';
+          this.parentNode.insertBefore(customInput, this.nextSibling);
+        }
+        this.style.display = 'none';
+        customInput.style.display = 'block';
+        customInput.focus();
+        customInput.addEventListener('blur', function onBlur() {
+          if (!this.value.trim()) {
+            selectEl.style.display = 'block';
+            this.style.display = 'none';
+            selectEl.value = '';
+          }
+          customInput.removeEventListener('blur', onBlur);
+        });
+      } else if (customInput) {
+        customInput.style.display = 'none';
+        customInput.value = '';
+        this.style.display = 'block';
+      }
+    };
+    selectEl.addEventListener('change', selectEl._handler);
+  }
+
+  function populateAllSelects() {
+    const selects = stepsContainer.querySelectorAll('.step-item select[id^="step"]');
+    const rt = routineTypeEl.value || 'morning';
+    const optionsHtml = buildOptions(rt);
+    selects.forEach(sel => {
+      sel.innerHTML = optionsHtml;
+      attachSelectBehavior(sel);
+    });
+  }
+
+  function createStepItem(stepNumber) {
+    const wrapper = document.createElement('div');
+    wrapper.className = 'step-item';
+    wrapper.setAttribute('data-step', String(stepNumber));
+    wrapper.innerHTML = `<select id="step${stepNumber}" name="step${stepNumber}" class="step-select"></select>`;
+    return wrapper;
+  }
+
+  function addStep() {
+    const count = stepsContainer.querySelectorAll('.step-item').length;
+    if (count >= maxSteps) return;
+    const next = count + 1;
+    const item = createStepItem(next);
+    stepsContainer.appendChild(item);
+    // Populate and attach behavior for the new select
+    const rt = routineTypeEl.value || 'morning';
+    const sel = item.querySelector('select');
+    sel.innerHTML = buildOptions(rt);
+    attachSelectBehavior(sel);
+    updateStepCount();
+  }
+
+  function removeStep() {
+    const items = stepsContainer.querySelectorAll('.step-item');
+    if (items.length <= minSteps) return;
+    const last = items[items.length - 1];
+    last.remove();
+    updateStepCount();
+  }
+
+  // Initial population and wiring
+  populateAllSelects();
+  updateStepCount();
+  routineTypeEl.addEventListener('change', populateAllSelects);
+  if (addBtn) addBtn.addEventListener('click', addStep);
+  if (removeBtn) removeBtn.addEventListener('click', removeStep);
+}
+
+// Auto-init profile builder when present
+document.addEventListener('DOMContentLoaded', function() {
+  const hasProfileRoutineBuilder = document.getElementById('steps-container') && document.getElementById('routine_type');
+  if (hasProfileRoutineBuilder) {
+    initProfileRoutineBuilder();
+  }
+});
@@ -0,0 +1,294 @@
+/* routines.js - Dashboard routine cards: step toggles and completion. */
+
+/* ==========================================================================
+   ROUTINES FUNCTIONALITY
+   Handles routine steps management
+   ========================================================================== */
+
+/**
+ * Initialize routines functionality
+ */
+function initRoutines() {
+  // Setup routine step form listeners
+  const routineForms = document.querySelectorAll('.routine-form');
+  routineForms.forEach(form => {
+    if (form.dataset.boundSubmit === 'true') return;
+    form.addEventListener('submit', handleRoutineFormSubmit);
+    form.dataset.boundSubmit = 'true';
+  });
+  
+  // Listen for checkbox changes (delegated)
+  if (!routinesHandlersBound) {
+    document.addEventListener('change', onRoutineChange);
+    // Delegated handler for routine completion buttons
+    document.addEventListener('click', onRoutineClick);
+    routinesHandlersBound = true;
+  }
+}
+
+// Document-level delegated handlers for routines (defined once)
+function onRoutineChange(event) {
+  const target = event.target;
+  if (target && target.classList && target.classList.contains('step-checkbox')) {
+    // Use unified toggle flow to match previous behavior
+    const stepId = target.getAttribute('data-step-id');
+    if (stepId) {
+      toggleStepCompletion(stepId, target);
+    } else {
+      handleRoutineStepUpdate(target);
+    }
+  }
+}
+
+function onRoutineClick(event) {
+  const btn = event.target.closest && event.target.closest('.complete-btn');
+  if (!btn) return;
+  event.preventDefault();
+  const routineId = btn.getAttribute('data-routine-id');
+  const routineType = btn.getAttribute('data-routine-type');
+  if (routineId && routineType) {
+    markRoutineComplete(routineId, routineType);
+  }
+}
+
+/**
+ * Handles routine step updates (completion status)
+ * @param {HTMLInputElement} checkbox - The routine step checkbox element
+ */
+function handleRoutineStepUpdate(checkbox) {
+  const stepId = checkbox && checkbox.dataset ? checkbox.dataset.stepId : null;
+  const isChecked = !!(checkbox && checkbox.checked);
+  const stepItem = checkbox.closest('.routine-step');
+  
+  if (!stepId) {
+    console.warn('Step ID missing on checkbox');
+    return;
+  }
+  
+  // Make AJAX request to toggle step completion (matches backend URL)
+  fetch('/routines/toggle-step/', {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+      'X-CSRFToken': getCsrfToken(),
+    },
+    body: JSON.stringify({ step_id: stepId })
+  })
+  .then(response => response.json())
+  .then(data => {
+    if (data && data.success) {
+      if (stepItem) stepItem.classList.toggle('completed', isChecked);
+      showSuccessMessage(data.message || 'Routine step updated');
+      updateProgressDisplay();
+      // Dispatch event for calendar/dashboard updates
+      document.dispatchEvent(new CustomEvent('routineStepUpdated', { detail: { stepId, completed: isChecked } }));
+    } else {
+      showErrorMessage((data && (data.error || data.message)) || 'Could not update routine step');
+      // Revert UI checkbox state on failure
+      checkbox.checked = !isChecked;
+    }
+  })
+  .catch(error => {
+    console.error('Error updating routine step:', error);
+    showErrorMessage('Failed to update routine step');
+    // Revert UI checkbox state on error
+    checkbox.checked = !isChecked;
+  });
+}
+
+/**
+ * Legacy-compatible toggle function with fallback endpoint
+ * @param {string|number} stepId 
+ * @param {HTMLInputElement=} checkbox Optional checkbox to update/revert
+ */
+function toggleStepCompletion(stepId, checkbox) {
+  const csrf = getCsrfToken();
+  if (!csrf) {
+    console.error('CSRF token not found');
+    if (checkbox) checkbox.checked = !checkbox.checked;
+    return;
+  }
+
+  fetch('/routines/toggle-step/', {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+      'X-CSRFToken': csrf
+    },
+    body: JSON.stringify({ step_id: stepId })
+  })
+  .then(function(response) {
+    if (!response.ok) {
+      // fallback to legacy form-encoded endpoint if present
+      return fallbackToggleStep(stepId, csrf);
+    }
+    return response.json();
+  })
+  .then(function(data) {
+    if (data && data.success) {
+      updateProgressDisplay();
+    } else if (data && data.success === false) {
+      console.error('Failed to update step', data.error || data.message);
+      if (checkbox) checkbox.checked = !checkbox.checked;
+    }
+  })
+  .catch(function(error) {
+    console.error('Network error while toggling step:', error);
+    if (checkbox) checkbox.checked = !checkbox.checked;
+  });
+}
+
+function fallbackToggleStep(stepId, csrfToken) {
+  const checkbox = document.querySelector(`[data-step-id="${stepId}"]`);
+  const isCompleted = checkbox ? checkbox.checked : false;
+  return fetch('/routines/toggle-step-completion/', {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/x-www-form-urlencoded',
+      'X-CSRFToken': csrfToken,
+    },
+    body: `step_id=${encodeURIComponent(stepId)}&completed=${isCompleted ? '1' : '0'}`
+  }).then(r => r.json()).then(d => {
+    if (d && d.success) {
+      updateProgressDisplay();
+    } else if (checkbox) {
+      checkbox.checked = !isCompleted;
+    }
+    return d || { success: false };
+  });
+}
+
+/**
+ * Marks an entire routine as complete (parity with previous file)
+ * @param {string|number} routineId
+ * @param {string} routineType
+ */
+function markRoutineComplete(routineId, routineType) {
+  const csrf = getCsrfToken();
+  if (!csrf) { console.error('CSRF token not found'); return; }
+  fetch('/routines/mark-complete/', {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+      'X-CSRFToken': csrf
+    },
+    body: JSON.stringify({ routine_id: routineId, routine_type: routineType })
+  })
+  .then(resp => {
+    if (!resp.ok) throw new Error('Network error');
+    return resp.json();
+  })
+  .then(data => {
+    if (data && data.success) {
+      window.location.reload();
+    } else {
+      showErrorMessage(data && (data.error || data.message) || 'Failed to mark routine complete');
+    }
+  })
+  .catch(err => {
+    console.error('Error marking routine complete:', err);
+    showErrorMessage('Could not connect to server');
+  });
+}
+
+/**
+ * Updates the progress display without full page reload
+ */
+function updateProgressDisplay() {
+  const totalCheckboxes = document.querySelectorAll('.step-checkbox').length;
+  const completedCheckboxes = document.querySelectorAll('.step-checkbox:checked').length;
+  const progressPercent = totalCheckboxes > 0 ? Math.round((completedCheckboxes / totalCheckboxes) * 100) : 0;
+
+  // Dashboard uses .progress-fill bar and .progress-text span
+  const progressBar = document.querySelector('.progress-fill');
+  if (progressBar) progressBar.style.width = progressPercent + '%';
+
+  const progressText = document.querySelector('.progress-text');
+  if (progressText) progressText.textContent = `${completedCheckboxes} of ${totalCheckboxes} steps completed`;
+}
+
+/**
+ * Handles routine form submission
+ * @param {Event} event - The form submission event
+ */
+function handleRoutineFormSubmit(event) {
+  const form = event.target;
+  // Allow classic browser submit (server redirect) when form opts out of AJAX
+  // Usage: add data-no-ajax="true" attribute on the form element
+  if (form && (form.dataset.noAjax === 'true' || form.getAttribute('data-no-ajax') === 'true')) {
+    return; // do not prevent default; let the form submit normally
+  }
+  event.preventDefault();
+  
+  
+  
+  const formData = new FormData(form);
+  
+  fetch(form.action, {
+    method: form.method,
+    body: formData,
+    headers: {
+      'X-Requested-With': 'XMLHttpRequest'
+    }
+  })
+  .then(response => response.json())
+  .then(data => {
+    // Align with backend: data.success and optional detail_url/redirect_url
+    if (data && (data.success === true || data.status === 'success')) {
+      // On add routine page, show an inline success banner (no global toast, no redirect)
+      try {
+        const container = document.querySelector('.form-container.add-routine-page');
+        if (container) {
+          let banner = container.querySelector('.inline-success');
+          if (!banner) {
+            banner = document.createElement('div');
+            banner.className = 'inline-success';
+            banner.setAttribute('role', 'status');
+            banner.setAttribute('aria-live', 'polite');
+            banner.style.marginBottom = '1rem';
+            container.insertBefore(banner, container.querySelector('.form-card'));
+          }
+          const routineName = (data.name || '').trim();
+          const detailUrl = data.detail_url || data.redirect_url || '/routines/dashboard/';
+          banner.innerHTML =
+            '<div class="d-flex" style="align-items:center; gap:.75rem; justify-content:space-between; flex-wrap:wrap;">' +
+              '<div>' +
+                (routineName ? ('<strong>' + escapeHtml(routineName) + '</strong> — Added. ') : 'Routine — Added. ') +
+                '<span class="muted">You can view it on your dashboard.</span>' +
+              '</div>' +
+              '<div class="actions">' +
+                '<a class="btn btn-primary" href="' + detailUrl + '">View on Dashboard</a>' +
+              '</div>' +
+            '</div>';
+        }
+      } catch (_) { /* non-fatal */ }
+      // Optionally, clear step fields and product selections
+      try {
+        const formEl = form;
+        for (let i = 1; i <= 10; i++) {
+          const step = formEl.querySelector('[name="step' + i + '"]');
+          const prod = formEl.querySelector('[name="product' + i + '"]');
+          if (step) step.value = '';
+          if (prod) prod.value = '';
+        }
+        // Keep routine name/type so the user can add another quickly
+      } catch (_) { /* ignore */ }
+      // If partial HTML was returned (other contexts), update UI
+      if (data.html) {
+        const container = document.querySelector('#routines-container');
+        if (container) {
+          container.innerHTML = data.html;
+          initRoutines();
+        }
+      }
+    } else {
+      // Show inline-validation style feedback via toast only on error
+      const msg = (data && (data.error || data.message)) || 'Error saving routine';
+      showErrorMessage(msg);
+    }
+  })
+  .catch(error => {
+    console.error('Error:', error);
+    showErrorMessage('An error occurred while processing your request');
+  });
+}
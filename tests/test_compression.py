@@ -0,0 +1,92 @@
+import gzip
+import json
+from unittest import mock, skipIf
+
+from django.http import HttpResponse, JsonResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from config import compression
+from config.compression import JSONCompressionMiddleware
+
+MIN_BYTES = 1024
+
+
+@override_settings(JSON_COMPRESSION_MIN_BYTES=MIN_BYTES)
+class JSONCompressionMiddlewareTests(SimpleTestCase):
+    def process(self, response, accept='gzip, deflate, br'):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept)
+        middleware = JSONCompressionMiddleware(lambda request: response)
+        return middleware(request)
+
+    def json_response(self, size):
+        # Repetitive JSON of roughly ``size`` bytes, so it compresses well.
+        response = JsonResponse({'items': ['serum'] * (size // 8)})
+        response['ETag'] = '"abc"'
+        return response
+
+    def test_small_body_is_left_alone(self):
+        original = self.json_response(MIN_BYTES // 2)
+        body = original.content
+        self.assertLess(len(body), MIN_BYTES)
+
+        response = self.process(original)
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, body)
+        self.assertEqual(response['ETag'], '"abc"')
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_large_body_is_gzipped(self):
+        original = self.json_response(MIN_BYTES * 4)
+        body = original.content
+
+        response = self.process(original, accept='gzip, deflate')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), body)
+        self.assertEqual(
+            response['Content-Length'], str(len(response.content))
+        )
+        self.assertEqual(response['ETag'], 'W/"abc"')
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    @skipIf(compression.brotli is None, 'brotli is not installed')
+    def test_large_body_prefers_brotli(self):
+        original = self.json_response(MIN_BYTES * 4)
+        body = original.content
+
+        response = self.process(original)
+
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(compression.brotli.decompress(response.content), body)
+
+    def test_gzip_without_brotli_installed(self):
+        with mock.patch.object(compression, 'brotli', None):
+            response = self.process(self.json_response(MIN_BYTES * 4))
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+    def test_client_without_compression_gets_plain_body(self):
+        original = self.json_response(MIN_BYTES * 4)
+        body = original.content
+
+        response = self.process(original, accept='identity')
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(json.loads(response.content), json.loads(body))
+
+    def test_only_json_is_compressed(self):
+        original = HttpResponse('<p>serum</p>' * 500)
+
+        response = self.process(original)
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertFalse(response.has_header('Vary'))
+
+    def test_threshold_is_configurable(self):
+        original = self.json_response(MIN_BYTES * 4)
+
+        with self.settings(JSON_COMPRESSION_MIN_BYTES=MIN_BYTES * 100):
+            response = self.process(original)
+
+        self.assertFalse(response.has_header('Content-Encoding'))
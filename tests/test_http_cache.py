@@ -0,0 +1,98 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from config import http_cache
+from products.models import Product
+from routines.models import Routine
+
+
+class ProductListConditionalGetTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='etag')
+        self.client.force_login(self.user)
+        self.url = reverse('product-list-create')
+        self.create_product('Cleanser')
+
+    def create_product(self, name):
+        return Product.objects.create(
+            user=self.user, name=name, brand='Brand', product_type='serum'
+        )
+
+    def test_matching_etag_gets_304(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('W/"'))
+        self.assertEqual(response['Cache-Control'], 'private, no-cache')
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+    def test_product_change_gets_200_and_new_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        self.create_product('Toner')
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(len(response.json()), 2)
+
+    def test_etag_depends_on_fields(self):
+        etag = self.client.get(self.url)['ETag']
+
+        response = self.client.get(
+            self.url, {'fields': 'name'}, HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(HTTP_CACHE_USER_VERSIONS=True)
+class UserVersionConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='version')
+        self.client.force_login(self.user)
+        routine = Routine.objects.create(
+            user=self.user, name='Evening', routine_type='evening'
+        )
+        self.url = reverse('routines:get_routine_data', args=[routine.pk])
+
+    def test_matching_etag_gets_304(self):
+        etag = self.client.get(self.url)['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_version_bump_gets_200(self):
+        etag = self.client.get(self.url)['ETag']
+        http_cache.bump_user_version(self.user.pk)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()['routine_name'], 'Evening')
+
+    def test_versions_are_per_user(self):
+        etag = self.client.get(self.url)['ETag']
+        other = User.objects.create_user(username='other')
+        http_cache.bump_user_version(other.pk)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    @override_settings(HTTP_CACHE_USER_VERSIONS=False)
+    def test_no_etag_without_shared_versions(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
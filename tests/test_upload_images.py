@@ -0,0 +1,157 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+from unittest import TestCase, mock
+
+import upload_images
+from upload_images import LocalBackend, file_hash, sync
+
+
+class FlakyBackend(LocalBackend):
+    """LocalBackend whose first ``failures`` uploads raise."""
+
+    def __init__(self, target, failures):
+        super().__init__(target)
+        self.failures = failures
+        self.calls = []
+
+    def upload(self, path, public_id):
+        self.calls.append(public_id)
+        if self.failures:
+            self.failures -= 1
+            raise OSError('connection reset')
+        return super().upload(path, public_id)
+
+
+class SyncTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        self.target = os.path.join(self.root, 'out')
+        self.manifest_path = os.path.join(self.root, 'manifest.json')
+        self.assets = {
+            'skyn/hero_image': self.write('hero.webp', b'hero'),
+            'skyn/feature_image': self.write('features.webp', b'features'),
+        }
+
+    def write(self, name, content):
+        path = os.path.join(self.root, name)
+        with open(path, 'wb') as fh:
+            fh.write(content)
+        return path
+
+    def sync(self, backend, **kwargs):
+        # sync() prints a line per file; keep the test output clean.
+        with contextlib.redirect_stdout(io.StringIO()):
+            return sync(
+                backend, assets=self.assets,
+                manifest_path=self.manifest_path, workers=2, **kwargs
+            )
+
+    def manifest(self):
+        with open(self.manifest_path, encoding='utf-8') as fh:
+            return json.load(fh)['local']
+
+    def test_first_run_uploads_everything(self):
+        done, unchanged, failed = self.sync(LocalBackend(self.target))
+
+        self.assertCountEqual(done, self.assets)
+        self.assertEqual((unchanged, failed), (0, []))
+        dest = os.path.join(self.target, 'skyn', 'hero_image.webp')
+        with open(dest, 'rb') as fh:
+            self.assertEqual(fh.read(), b'hero')
+        manifest = self.manifest()
+        self.assertEqual(
+            manifest['skyn/hero_image']['hash'],
+            file_hash(self.assets['skyn/hero_image']),
+        )
+        self.assertEqual(manifest['skyn/hero_image']['url'], 'file://' + dest)
+
+    def test_unchanged_files_are_skipped(self):
+        self.sync(LocalBackend(self.target))
+
+        backend = FlakyBackend(self.target, failures=0)
+        done, unchanged, failed = self.sync(backend)
+
+        self.assertEqual((done, unchanged, failed), ([], 2, []))
+        self.assertEqual(backend.calls, [])
+
+    def test_changed_file_is_reuploaded(self):
+        self.sync(LocalBackend(self.target))
+        before = self.manifest()
+        self.write('hero.webp', b'new hero')
+
+        backend = FlakyBackend(self.target, failures=0)
+        done, unchanged, failed = self.sync(backend)
+
+        self.assertEqual(done, ['skyn/hero_image'])
+        self.assertEqual((unchanged, failed), (1, []))
+        self.assertEqual(backend.calls, ['skyn/hero_image'])
+        manifest = self.manifest()
+        self.assertEqual(
+            manifest['skyn/hero_image']['hash'],
+            file_hash(self.assets['skyn/hero_image']),
+        )
+        self.assertNotEqual(
+            manifest['skyn/hero_image']['hash'],
+            before['skyn/hero_image']['hash'],
+        )
+        self.assertEqual(
+            manifest['skyn/feature_image'], before['skyn/feature_image']
+        )
+        dest = os.path.join(self.target, 'skyn', 'hero_image.webp')
+        with open(dest, 'rb') as fh:
+            self.assertEqual(fh.read(), b'new hero')
+
+    def test_force_uploads_unchanged_files(self):
+        self.sync(LocalBackend(self.target))
+
+        done, unchanged, failed = self.sync(
+            LocalBackend(self.target), force=True
+        )
+
+        self.assertCountEqual(done, self.assets)
+        self.assertEqual(unchanged, 0)
+
+    def test_dry_run_uploads_nothing(self):
+        done, unchanged, failed = self.sync(
+            LocalBackend(self.target), dry_run=True
+        )
+
+        self.assertEqual((done, unchanged, failed), ([], 0, []))
+        self.assertFalse(os.path.exists(self.manifest_path))
+        self.assertFalse(os.path.exists(self.target))
+
+    @mock.patch.object(upload_images.time, 'sleep')
+    def test_failed_upload_is_retried(self, sleep):
+        del self.assets['skyn/feature_image']
+        backend = FlakyBackend(self.target, failures=2)
+
+        done, unchanged, failed = self.sync(backend, retries=3)
+
+        self.assertEqual((done, failed), (['skyn/hero_image'], []))
+        self.assertEqual(backend.calls, ['skyn/hero_image'] * 3)
+        # Exponential backoff between attempts.
+        self.assertEqual(
+            [c.args[0] for c in sleep.call_args_list],
+            [upload_images.RETRY_DELAY, upload_images.RETRY_DELAY * 2],
+        )
+        self.assertIn('skyn/hero_image', self.manifest())
+
+    @mock.patch.object(upload_images.time, 'sleep')
+    def test_upload_failing_every_attempt_is_not_recorded(self, sleep):
+        del self.assets['skyn/feature_image']
+        backend = FlakyBackend(self.target, failures=3)
+
+        done, unchanged, failed = self.sync(backend, retries=3)
+
+        self.assertEqual((done, failed), ([], ['skyn/hero_image']))
+        self.assertEqual(len(backend.calls), 3)
+        self.assertFalse(os.path.exists(self.manifest_path))
+
+        # The next run tries it again.
+        done, unchanged, failed = self.sync(LocalBackend(self.target))
+        self.assertEqual(done, ['skyn/hero_image'])
@@ -1,78 +1,240 @@
-import cloudinary
-import cloudinary.uploader
-import cloudinary.api
+"""Upload the site's static images to Cloudinary, skipping unchanged ones.
+
+Each file is hashed (SHA-256) and compared with the hash recorded the last
+time it was uploaded (``upload_manifest.json``). Only new or changed
+files are uploaded, in parallel, with retries and exponential backoff.
+
+    python upload_images.py                   # upload changed images
+    python upload_images.py --dry-run         # show what would be uploaded
+    python upload_images.py --force           # upload everything
+    python upload_images.py --backend local --target /tmp/assets
+
+The ``local`` backend copies files into a directory instead of calling
+Cloudinary, for trying the tool out without credentials.
+"""
+import argparse
+import hashlib
+import json
 import os
+import shutil
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# Ask for Cloudinary credentials if not in environment
-cloud_name = os.environ.get('CLOUDINARY_CLOUD_NAME')
-api_key = os.environ.get('CLOUDINARY_API_KEY')
-api_secret = os.environ.get('CLOUDINARY_API_SECRET')
-
-if not cloud_name or not api_key or not api_secret:
-    print("Cloudinary credentials not found in environment variables.")
-    print("Please enter your Cloudinary credentials:")
-    cloud_name = input("Cloud Name: ").strip()
-    api_key = input("API Key: ").strip()
-    api_secret = input("API Secret: ").strip()
-    
-    if not cloud_name or not api_key or not api_secret:
-        print("Error: You must provide all Cloudinary credentials.")
-        sys.exit(1)
-
-# Configure Cloudinary
-cloudinary.config(
-    cloud_name=cloud_name,
-    api_key=api_key,
-    api_secret=api_secret
-)
-
-# Define the path to your hero images
-image_paths = {
-    'hero_image': 'static/images/hero/hero.webp',
-    # Using Cloudinary directly for feature image to avoid iCloud optimization issues
-    'feature_image': 'https://res.cloudinary.com/di5xhvyrz/image/upload/f_auto,q_auto,w_auto/v1760264512/skyn/feature_image.jpg'
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MANIFEST = os.path.join(BASE_DIR, 'upload_manifest.json')
+
+# Cloudinary public ID -> local file
+ASSETS = {
+    'skyn/hero_image': 'static/images/hero/hero.webp',
+    'skyn/feature_image': 'static/images/features/features.webp',
 }
 
-def upload_image_to_cloudinary(image_path, public_id):
-    """Upload an image to Cloudinary with a specific public ID"""
-    print(f"Uploading {image_path} to Cloudinary...")
-    
-    try:
-        # Upload the image to Cloudinary
-        result = cloudinary.uploader.upload(image_path, 
-                                           public_id=public_id,
-                                           overwrite=True)
-        print(f"Successfully uploaded {image_path} to Cloudinary")
-        print(f"Cloudinary URL: {result['url']}")
-        print(f"Secure URL: {result['secure_url']}")
-        return result
-    except Exception as e:
-        print(f"Error uploading {image_path} to Cloudinary: {e}")
-        return None
-
-def main():
-    print("Starting image upload to Cloudinary...")
-    
-    # Upload hero image
-    if os.path.exists(image_paths['hero_image']):
-        hero_result = upload_image_to_cloudinary(
-            image_paths['hero_image'], 
-            'skyn/hero_image'
+DEFAULT_WORKERS = 4
+DEFAULT_RETRIES = 3
+RETRY_DELAY = 1.0
+
+
+def file_hash(path):
+    """Return the SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class CloudinaryBackend:
+    """Uploads to Cloudinary under a fixed public ID."""
+
+    name = 'cloudinary'
+
+    def __init__(self):
+        self.uploader = None
+
+    def prepare(self):
+        """Configure Cloudinary, asking for credentials if they aren't set."""
+        import cloudinary
+        import cloudinary.uploader
+
+        cloud_name = os.environ.get('CLOUDINARY_CLOUD_NAME')
+        api_key = os.environ.get('CLOUDINARY_API_KEY')
+        api_secret = os.environ.get('CLOUDINARY_API_SECRET')
+
+        if not cloud_name or not api_key or not api_secret:
+            print("Cloudinary credentials not found in environment variables.")
+            print("Please enter your Cloudinary credentials:")
+            cloud_name = input("Cloud Name: ").strip()
+            api_key = input("API Key: ").strip()
+            api_secret = input("API Secret: ").strip()
+
+            if not cloud_name or not api_key or not api_secret:
+                print("Error: You must provide all Cloudinary credentials.")
+                sys.exit(1)
+
+        cloudinary.config(
+            cloud_name=cloud_name,
+            api_key=api_key,
+            api_secret=api_secret
         )
-    else:
-        print(f"Hero image not found at {image_paths['hero_image']}")
-    
-    # Upload feature image
-    if os.path.exists(image_paths['feature_image']):
-        feature_result = upload_image_to_cloudinary(
-            image_paths['feature_image'], 
-            'skyn/feature_image'
+        self.uploader = cloudinary.uploader
+
+    def upload(self, path, public_id):
+        result = self.uploader.upload(
+            path, public_id=public_id, overwrite=True
         )
+        return result['secure_url']
+
+
+class LocalBackend:
+    """Copies files into a directory, named after their public ID."""
+
+    name = 'local'
+
+    def __init__(self, target):
+        self.target = os.path.abspath(target)
+
+    def prepare(self):
+        os.makedirs(self.target, exist_ok=True)
+
+    def upload(self, path, public_id):
+        ext = os.path.splitext(path)[1]
+        dest = os.path.join(self.target, public_id + ext)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        shutil.copyfile(path, dest)
+        return 'file://' + dest
+
+
+BACKENDS = {
+    'cloudinary': CloudinaryBackend,
+    'local': LocalBackend,
+}
+
+
+def load_manifest(path):
+    try:
+        with open(path, encoding='utf-8') as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest, path):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+        fh.write('\n')
+    os.replace(tmp_path, path)
+
+
+def changed_assets(assets, uploaded, force=False):
+    """Return ``(pending, unchanged)``.
+
+    ``pending`` lists ``(public_id, path, hash)`` for files that need
+    uploading; ``unchanged`` counts files matching the manifest.
+    ``uploaded`` maps public IDs to their manifest entries for the backend
+    in use. Missing files are reported and skipped.
+    """
+    pending = []
+    unchanged = 0
+    for public_id, rel_path in sorted(assets.items()):
+        path = os.path.join(BASE_DIR, rel_path)
+        if not os.path.isfile(path):
+            print(f"Skipping {public_id}: {rel_path} not found")
+            continue
+        digest = file_hash(path)
+        if force or uploaded.get(public_id, {}).get('hash') != digest:
+            pending.append((public_id, path, digest))
+        else:
+            unchanged += 1
+    return pending, unchanged
+
+
+def upload_with_retries(backend, path, public_id, retries, delay=RETRY_DELAY):
+    """Upload one file, retrying with exponential backoff."""
+    for attempt in range(1, retries + 1):
+        try:
+            return backend.upload(path, public_id)
+        except Exception as e:
+            if attempt == retries:
+                raise
+            wait = delay * 2 ** (attempt - 1)
+            print(f"Upload of {public_id} failed ({e}); retrying in {wait:.0f}s")
+            time.sleep(wait)
+
+
+def sync(backend, assets=ASSETS, manifest_path=DEFAULT_MANIFEST,
+         workers=DEFAULT_WORKERS, retries=DEFAULT_RETRIES, force=False,
+         dry_run=False):
+    """Upload changed assets. Returns ``(uploaded, unchanged, failed)``."""
+    manifest = load_manifest(manifest_path)
+    uploaded = manifest.setdefault(backend.name, {})
+    pending, unchanged = changed_assets(assets, uploaded, force=force)
+
+    if dry_run or not pending:
+        for public_id, path, _ in pending:
+            print(f"Would upload {os.path.relpath(path, BASE_DIR)} as {public_id}")
+        return [], unchanged, []
+
+    backend.prepare()
+
+    done, failed = [], []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(upload_with_retries, backend, path, public_id, retries):
+                (public_id, digest)
+            for public_id, path, digest in pending
+        }
+        for future in as_completed(futures):
+            public_id, digest = futures[future]
+            try:
+                url = future.result()
+            except Exception as e:
+                print(f"Error uploading {public_id}: {e}")
+                failed.append(public_id)
+                continue
+            print(f"Uploaded {public_id}: {url}")
+            uploaded[public_id] = {'hash': digest, 'url': url}
+            # Record progress as we go so a crash doesn't repeat work.
+            save_manifest(manifest, manifest_path)
+            done.append(public_id)
+    return done, unchanged, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='cloudinary')
+    parser.add_argument('--target', help='Directory for the local backend')
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST,
+                        help='Where uploaded hashes are recorded')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help='Parallel uploads (default: %(default)s)')
+    parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES,
+                        help='Attempts per file (default: %(default)s)')
+    parser.add_argument('--force', action='store_true',
+                        help='Upload every file even if unchanged')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='List changed files without uploading')
+    args = parser.parse_args(argv)
+
+    if args.backend == 'local':
+        if not args.target:
+            parser.error('--target is required with --backend local')
+        backend = LocalBackend(args.target)
     else:
-        print(f"Feature image not found at {image_paths['feature_image']}")
-    
-    print("Image upload process completed.")
+        backend = CloudinaryBackend()
+
+    done, unchanged, failed = sync(
+        backend,
+        manifest_path=args.manifest,
+        workers=max(1, args.workers),
+        retries=max(1, args.retries),
+        force=args.force,
+        dry_run=args.dry_run,
+    )
+    print(f"{len(done)} uploaded, {unchanged} unchanged, {len(failed)} failed")
+    return 1 if failed else 0
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""Streaming export of a user's products, routines and completion history.
+
+Everything here is a generator: rows are read with
+``.values().iterator(chunk_size=...)`` and encoded one at a time, so memory
+use stays flat no matter how long a user's history is.
+
+Under ASGI, Django buffers a ``StreamingHttpResponse`` whose content is a
+plain iterator before sending it, which would load the whole export into
+memory; ``async_stream()`` wraps the same generator for that case.
+"""
+import csv
+import zlib
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+
+from products.models import CatalogProduct, Product
+from routines.models import DailyCompletion, Routine, RoutineStep
+
+EXPORT_FORMATS = ('ndjson', 'csv')
+DEFAULT_CHUNK_SIZE = 2000
+
+# section name -> (queryset factory, exported fields)
+EXPORT_SECTIONS = {
+    'products': (
+        lambda user: Product.objects.filter(user=user).order_by('id'),
+        [
+            'id', 'name', 'brand', 'product_type', 'skin_type', 'rating',
+            'expiry_date', 'is_favorite', 'notes', 'ingredients',
+            'description', 'external_id', 'catalog_product_id',
+            'created_at', 'updated_at',
+        ],
+    ),
+    # Shared catalog entries the user's products point at.
+    'catalog': (
+        lambda user: CatalogProduct.objects.filter(
+            user_products__user=user
+        ).distinct().order_by('id'),
+        [
+            'id', 'name', 'brand', 'product_type', 'ingredients',
+            'description', 'external_id',
+        ],
+    ),
+    'routines': (
+        lambda user: Routine.objects.filter(user=user).order_by('id'),
+        ['id', 'name', 'routine_type', 'created_at'],
+    ),
+    'steps': (
+        lambda user: RoutineStep.objects.filter(
+            routine__user=user
+        ).order_by('routine_id', 'order', 'id'),
+        [
+            'id', 'routine_id', 'step_name', 'order', 'frequency',
+            'completed', 'product_id',
+        ],
+    ),
+    'completions': (
+        lambda user: DailyCompletion.objects.filter(
+            user=user
+        ).order_by('date', 'id'),
+        ['id', 'routine_step_id', 'date', 'completed', 'completed_at'],
+    ),
+}
+
+
+class _Echo:
+    """File-like object whose ``write`` returns the value (for csv.writer)."""
+
+    def write(self, value):
+        return value
+
+
+def iter_section(user, section, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield plain dicts for one export section."""
+    queryset_for, fields = EXPORT_SECTIONS[section]
+    return queryset_for(user).values(*fields).iterator(chunk_size=chunk_size)
+
+
+def ndjson_stream(user, sections=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield one JSON line (bytes) per record, tagged with its section."""
+    encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    for section in sections or EXPORT_SECTIONS:
+        for row in iter_section(user, section, chunk_size):
+            record = {'type': section}
+            record.update(row)
+            yield (encoder.encode(record) + '\n').encode('utf-8')
+
+
+def csv_stream(user, section, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield CSV lines (bytes) for a single section, header first."""
+    _, fields = EXPORT_SECTIONS[section]
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields).encode('utf-8')
+    for row in iter_section(user, section, chunk_size):
+        yield writer.writerow(
+            [_csv_value(row[field]) for field in fields]
+        ).encode('utf-8')
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def gzip_stream(chunks, buffer_size=64 * 1024):
+    """Gzip-compress an iterable of bytes, yielding compressed blocks.
+
+    Input is buffered up to ``buffer_size`` so we don't emit a tiny
+    compressed block for every row.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    pending = []
+    pending_size = 0
+    for chunk in chunks:
+        pending.append(chunk)
+        pending_size += len(chunk)
+        if pending_size >= buffer_size:
+            data = compressor.compress(b''.join(pending))
+            pending = []
+            pending_size = 0
+            if data:
+                yield data
+    if pending:
+        data = compressor.compress(b''.join(pending))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_stream(user, fmt, section=None, compress=False,
+                  chunk_size=DEFAULT_CHUNK_SIZE):
+    """Return an iterator of bytes for the requested export.
+
+    NDJSON covers every section (or just ``section`` if given); CSV needs a
+    single section since each one has its own columns.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError('Unknown export format: {}'.format(fmt))
+    if section is not None and section not in EXPORT_SECTIONS:
+        raise ValueError('Unknown export section: {}'.format(section))
+
+    if fmt == 'csv':
+        stream = csv_stream(user, section or 'products', chunk_size)
+    else:
+        stream = ndjson_stream(
+            user, [section] if section else None, chunk_size
+        )
+
+    if compress:
+        stream = gzip_stream(stream)
+    return stream
+
+
+async def async_stream(stream, batch_size=64 * 1024):
+    """Serve a sync byte iterator to an ASGI response without buffering.
+
+    The generator runs in Django's sync thread (it reads the database),
+    a batch of about ``batch_size`` bytes per hop to keep the thread
+    switches few.
+    """
+    def next_batch():
+        parts = []
+        size = 0
+        for chunk in stream:
+            parts.append(chunk)
+            size += len(chunk)
+            if size >= batch_size:
+                return b''.join(parts), False
+        return b''.join(parts), True
+
+    try:
+        done = False
+        while not done:
+            data, done = await sync_to_async(next_batch)()
+            if data:
+                yield data
+    finally:
+        # Client gone (or finished): release the database cursor.
+        if hasattr(stream, 'close'):
+            await sync_to_async(stream.close)()
+
+
+def export_filename(username, fmt, section=None, compress=False):
+    """Build a download filename like ``skyn-alice-products.csv.gz``."""
+    parts = ['skyn', username]
+    if section:
+        parts.append(section)
+    name = '-'.join(parts) + '.' + fmt
+    return name + '.gz' if compress else name
@@ -0,0 +1,94 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+from django.db.backends.signals import connection_created
+from django.test import Client
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure per-request latency with a new database connection per '
+        'request versus the configured connection handling (persistent '
+        'connections or a pool). Creates a temporary user and deletes it '
+        'afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=200,
+            help='Requests per mode (default: 200)'
+        )
+        parser.add_argument(
+            '--path',
+            type=str,
+            default='/api/jobs/',
+            help='Page requested as a signed-in user (default: /api/jobs/)'
+        )
+
+    def handle(self, *args, **options):
+        settings_dict = connection.settings_dict
+        original_age = configured_age = settings_dict['CONN_MAX_AGE']
+        pooled = 'pool' in settings_dict.get('OPTIONS', {})
+        if pooled:
+            configured = 'pooled'
+        elif configured_age:
+            configured = f'persistent ({configured_age}s)'
+        else:
+            configured = 'persistent (600s)'
+            configured_age = 600
+
+        user = get_user_model().objects.create_user(
+            username='benchmark-db-connections'
+        )
+        try:
+            client = Client()
+            client.force_login(user)
+            modes = [(configured, configured_age if not pooled else 0)]
+            if not pooled:
+                modes.insert(0, ('new connection per request', 0))
+            for label, max_age in modes:
+                self.run_mode(client, label, max_age, options)
+        finally:
+            settings_dict['CONN_MAX_AGE'] = original_age
+            connection.close()
+            user.delete()
+
+    def run_mode(self, client, label, max_age, options):
+        connection.settings_dict['CONN_MAX_AGE'] = max_age
+        connection.close()
+        connects = 0
+
+        def count_connect(sender, connection, **kwargs):
+            nonlocal connects
+            connects += 1
+
+        connection_created.connect(count_connect)
+        timings = []
+        try:
+            for _ in range(options['requests']):
+                start = time.perf_counter()
+                # The test client skips the request_started/request_finished
+                # connection handling a WSGI server does, so do it here.
+                close_old_connections()
+                response = client.get(options['path'])
+                close_old_connections()
+                timings.append((time.perf_counter() - start) * 1000)
+        finally:
+            connection_created.disconnect(count_connect)
+
+        if response.status_code != 200:
+            self.stderr.write(
+                f'{options["path"]} returned {response.status_code}'
+            )
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        self.stdout.write(
+            f'{label:<28}  mean {statistics.mean(timings):7.2f} ms  '
+            f'p50 {statistics.median(timings):7.2f} ms  '
+            f'p95 {p95:7.2f} ms  {connects:>5} connections'
+        )
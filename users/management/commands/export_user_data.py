@@ -0,0 +1,71 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from users.exports import (
+    DEFAULT_CHUNK_SIZE,
+    EXPORT_FORMATS,
+    EXPORT_SECTIONS,
+    export_stream,
+)
+
+
+class Command(BaseCommand):
+    help = "Stream a user's products, routines, steps and completions to a file"
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', type=str)
+        parser.add_argument(
+            '--format',
+            choices=EXPORT_FORMATS,
+            default='ndjson',
+            help='Output format (default: ndjson)'
+        )
+        parser.add_argument(
+            '--section',
+            choices=list(EXPORT_SECTIONS),
+            help='Export one section only (CSV defaults to products)'
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            help='File to write to (default: stdout)'
+        )
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Gzip-compress the output'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f'Rows fetched per database round trip (default: {DEFAULT_CHUNK_SIZE})'
+        )
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"User \"{options['username']}\" does not exist.")
+
+        stream = export_stream(
+            user,
+            options['format'],
+            section=options['section'],
+            compress=options['gzip'],
+            chunk_size=options['chunk_size'],
+        )
+
+        if options['output']:
+            with open(options['output'], 'wb') as fh:
+                for chunk in stream:
+                    fh.write(chunk)
+            self.stderr.write(f"Export written to {options['output']}")
+        else:
+            out = sys.stdout.buffer
+            for chunk in stream:
+                out.write(chunk)
+            out.flush()
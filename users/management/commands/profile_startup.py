@@ -0,0 +1,145 @@
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Code run in a fresh interpreter; prints the milliseconds it took.
+TARGETS = {
+    'setup': 'import django; django.setup()',
+    'urls': (
+        'import django; django.setup(); '
+        'from django.urls import get_resolver; get_resolver().url_patterns'
+    ),
+}
+SCRIPT = (
+    'import time; start = time.perf_counter(); {code}; '
+    'print((time.perf_counter() - start) * 1000)'
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure cold start: time django.setup() (or loading the URLconf '
+        'too) in fresh interpreters and list the slowest imports from '
+        '"python -X importtime". With --budget-ms, fail when startup is '
+        'slower than the budget.'
+    )
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--target',
+            choices=list(TARGETS),
+            default='setup',
+            help='What to time: django.setup() alone, or the URLconf too '
+                 '(default: setup)'
+        )
+        parser.add_argument(
+            '--runs',
+            type=int,
+            default=5,
+            help='Fresh interpreters to start; the fastest is reported (default: 5)'
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=15,
+            help='Slowest imports to list (default: 15)'
+        )
+        parser.add_argument(
+            '--budget-ms',
+            type=float,
+            help='Exit with an error if the fastest run takes longer than this'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            best_ms, best_report = time_startup(
+                options['target'], options['runs']
+            )
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+
+        packages, modules = parse_importtime(best_report)
+        top = options['top']
+        self.stdout.write(
+            f"{options['target']}: {best_ms:.1f} ms "
+            f"(fastest of {options['runs']} runs)"
+        )
+        self.stdout.write('\nSlowest top-level imports (cumulative):')
+        for name, us in sorted(packages.items(), key=lambda i: -i[1])[:top]:
+            self.stdout.write(f'  {us / 1000:8.1f} ms  {name}')
+        self.stdout.write('\nSlowest modules (own time):')
+        for name, us in sorted(modules.items(), key=lambda i: -i[1])[:top]:
+            self.stdout.write(f'  {us / 1000:8.1f} ms  {name}')
+
+        budget = options['budget_ms']
+        if budget is not None:
+            if best_ms > budget:
+                raise CommandError(
+                    f'Startup took {best_ms:.1f} ms, over the '
+                    f'{budget:.0f} ms budget'
+                )
+            self.stdout.write(self.style.SUCCESS(
+                f'\nWithin the {budget:.0f} ms budget'
+            ))
+
+
+def time_startup(target='setup', runs=5):
+    """Run ``target`` in ``runs`` fresh interpreters.
+
+    Returns ``(ms, report)`` for the fastest run, where ``report`` is its
+    ``-X importtime`` output. Raises ``RuntimeError`` if a run fails.
+    """
+    script = SCRIPT.format(code=TARGETS[target])
+    env = dict(
+        os.environ,
+        DJANGO_SETTINGS_MODULE=os.environ.get(
+            'DJANGO_SETTINGS_MODULE', 'config.settings'
+        ),
+    )
+
+    best_ms = None
+    best_report = None
+    for _ in range(max(1, runs)):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', script],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+        elapsed = float(result.stdout.strip().splitlines()[-1])
+        if best_ms is None or elapsed < best_ms:
+            best_ms, best_report = elapsed, result.stderr
+    return best_ms, best_report
+
+
+def parse_importtime(report):
+    """Return ``(packages, modules)`` from ``-X importtime`` output.
+
+    ``packages`` maps each top-level package to the cumulative time of its
+    outermost imports; ``modules`` maps each module to its own time. Times
+    are in microseconds.
+    """
+    packages = defaultdict(int)
+    modules = {}
+    for line in report.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        try:
+            own, cumulative, name = line[len('import time:'):].split('|')
+            own, cumulative = int(own), int(cumulative)
+        except ValueError:
+            continue  # the header line
+        module = name.strip()
+        modules[module] = own
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 0:
+            packages[module.split('.')[0]] += cumulative
+    return dict(packages), modules
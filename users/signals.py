@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from config import http_cache
+
+from .models import UserProfile
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def bump_http_version(sender, instance, **kwargs):
+    # The dashboard shows products for the profile's skin type.
+    http_cache.bump_user_version(instance.user_id)
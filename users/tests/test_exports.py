@@ -0,0 +1,90 @@
+import json
+import warnings
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from products.models import Product
+from users.exports import async_stream
+
+
+class ExportViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='exporter')
+        Product.objects.bulk_create(
+            Product(
+                user=self.user, name=f'Serum {i}', brand='Brand',
+                product_type='serum',
+            )
+            for i in range(50)
+        )
+        self.url = reverse('users:export', args=['ndjson'])
+
+    def records(self, content):
+        return [json.loads(line) for line in content.decode().splitlines()]
+
+    def test_wsgi_export_streams_sync_iterator(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(self.url, {'section': 'products'})
+
+        self.assertTrue(response.streaming)
+        self.assertFalse(response.is_async)
+        records = self.records(b''.join(response.streaming_content))
+        self.assertEqual(len(records), 50)
+
+    async def test_asgi_export_streams_without_buffering(self):
+        await self.async_client.aforce_login(self.user)
+
+        # Django warns when it has to buffer a sync iterator under ASGI.
+        with warnings.catch_warnings():
+            warnings.filterwarnings(
+                'error', message='StreamingHttpResponse must consume'
+            )
+            response = await self.async_client.get(
+                self.url, {'section': 'products'}
+            )
+            content = b''.join(
+                [chunk async for chunk in response.streaming_content]
+            )
+
+        self.assertTrue(response.is_async)
+        records = self.records(content)
+        self.assertEqual(len(records), 50)
+        self.assertEqual(records[0]['name'], 'Serum 0')
+
+
+class AsyncStreamTests(TestCase):
+    async def test_batches_chunks_and_closes_the_generator(self):
+        closed = []
+
+        def chunks():
+            try:
+                for i in range(10):
+                    yield b'x' * 10
+            finally:
+                closed.append(True)
+
+        batches = [
+            batch async for batch in async_stream(chunks(), batch_size=25)
+        ]
+
+        self.assertEqual([len(b) for b in batches], [30, 30, 30, 10])
+        self.assertEqual(closed, [True])
+
+    async def test_stopping_early_closes_the_generator(self):
+        closed = []
+
+        def chunks():
+            try:
+                while True:
+                    yield b'x'
+            finally:
+                closed.append(True)
+
+        stream = async_stream(chunks(), batch_size=4)
+        self.assertEqual(await anext(stream), b'xxxx')
+        await stream.aclose()
+
+        self.assertEqual(closed, [True])
@@ -0,0 +1,46 @@
+import os
+
+from django.test import SimpleTestCase
+
+from users.management.commands.profile_startup import (
+    parse_importtime,
+    time_startup,
+)
+
+# django.setup() takes about 250 ms on a developer laptop; the default
+# leaves room for slower CI machines. Override with STARTUP_BUDGET_MS.
+STARTUP_BUDGET_MS = float(os.environ.get('STARTUP_BUDGET_MS', 1000))
+
+# Imported on first use rather than at startup (see the Performance notes).
+DEFERRED_MODULES = (
+    'products.openbeautyfacts',
+    'products.api_views',
+    'rest_framework.generics',
+    'requests',
+)
+
+
+class StartupTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.setup_ms, report = time_startup('setup', runs=3)
+        cls.setup_modules = parse_importtime(report)[1]
+
+    def test_django_setup_within_budget(self):
+        self.assertLessEqual(
+            self.setup_ms, STARTUP_BUDGET_MS,
+            'django.setup() took {:.0f} ms, over the {:.0f} ms budget; '
+            'run "python manage.py profile_startup" to find the slow '
+            'imports'.format(self.setup_ms, STARTUP_BUDGET_MS),
+        )
+
+    def test_heavy_modules_are_not_imported_at_setup(self):
+        for module in DEFERRED_MODULES:
+            with self.subTest(module=module):
+                self.assertNotIn(module, self.setup_modules)
+
+    def test_url_loading_within_budget(self):
+        urls_ms, report = time_startup('urls', runs=3)
+        self.assertLessEqual(urls_ms, STARTUP_BUDGET_MS)
+        self.assertNotIn('products.api_views', parse_importtime(report)[1])
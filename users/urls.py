@@ -9,4 +9,5 @@ urlpatterns = [
     path('profile-questionnaire/', views.profile_questionnaire, name='profile_questionnaire'),
     path('', views.profile_view, name='profile'),
     path('edit/', views.profile_edit, name='profile_edit'),
+    path('export/<str:fmt>/', views.export_data, name='export'),
 ]
\ No newline at end of file
@@ -1,14 +1,24 @@
 from django.shortcuts import render, redirect
-from django.http import HttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
 from django.contrib.auth import login, logout
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from .forms import CustomUserCreationForm
 from .forms import UserUpdateForm, ProfileDetailsForm
 from .models import UserProfile
+from .exports import (
+    EXPORT_FORMATS,
+    EXPORT_SECTIONS,
+    async_stream,
+    export_filename,
+    export_stream,
+)
 from routines.models import RoutineStep, DailyCompletion
+from config.page_cache import cache_anonymous_page
 
 
+@cache_anonymous_page('home')
 def home(request):
     """Home page view with proper template."""
     return render(request, 'home.html')
@@ -191,3 +201,38 @@ def profile_edit(request):
         'profile_form': profile_form,
     }
     return render(request, 'users/profile_edit.html', context)
+
+
+@login_required
+def export_data(request, fmt):
+    """Stream the user's data as NDJSON or CSV.
+
+    Optional query params: ``section`` (products, routines, steps or
+    completions; CSV defaults to products) and ``gzip=1``.
+    """
+    section = request.GET.get('section') or None
+    compress = request.GET.get('gzip') in ('1', 'true', 'yes')
+
+    if fmt not in EXPORT_FORMATS:
+        return HttpResponse('Unknown export format.', status=404)
+    if section is not None and section not in EXPORT_SECTIONS:
+        return HttpResponse('Unknown export section.', status=400)
+    if fmt == 'csv' and section is None:
+        section = 'products'
+
+    content_type = {
+        'ndjson': 'application/x-ndjson',
+        'csv': 'text/csv; charset=utf-8',
+    }[fmt]
+    if compress:
+        content_type = 'application/gzip'
+
+    stream = export_stream(request.user, fmt, section, compress)
+    if isinstance(request, ASGIRequest):
+        # A sync iterator would be read into memory before sending.
+        stream = async_stream(stream)
+    response = StreamingHttpResponse(stream, content_type=content_type)
+    response['Content-Disposition'] = 'attachment; filename="{}"'.format(
+        export_filename(request.user.username, fmt, section, compress)
+    )
+    return response